@@ -6,12 +6,12 @@ fn main() {
 
     // Example 1: Complex key and value replacements
     println!("1. Advanced Pattern Replacements:");
-    let complex_json = r#"{
-        "user_profile_name": "John",
-        "user_profile_email": "john@example.com",
-        "admin_profile_name": "Jane",
-        "admin_profile_role": "super"
-    }"#;
+    // Compact literal: the parser never has to skip indentation, and the
+    // input can be echoed as-is instead of re-stripped for display.
+    let complex_json = concat!(
+        r#"{"user_profile_name": "John", "user_profile_email": "john@example.com", "#,
+        r#""admin_profile_name": "Jane", "admin_profile_role": "super"}"#
+    );
 
     match JSONTools::new()
         .flatten()
@@ -21,10 +21,7 @@ fn main() {
         .execute(complex_json)
     {
         Ok(JsonOutput::Single(result)) => {
-            println!(
-                "   Input:  {}",
-                complex_json.replace('\n', "").replace("        ", "")
-            );
+            println!("   Input:  {}", complex_json);
             println!("   Output: {}", result);
             println!("   ✅ Regex patterns applied to both keys and values\n");
         }
@@ -71,19 +68,10 @@ fn main() {
 
     // Example 4: Comprehensive filtering
     println!("4. Comprehensive Filtering:");
-    let messy_json = r#"{
-        "user": {
-            "name": "John",
-            "bio": "",
-            "age": null,
-            "tags": [],
-            "metadata": {},
-            "settings": {
-                "theme": "dark",
-                "notifications": {}
-            }
-        }
-    }"#;
+    let messy_json = concat!(
+        r#"{"user": {"name": "John", "bio": "", "age": null, "tags": [], "metadata": {}, "#,
+        r#""settings": {"theme": "dark", "notifications": {}}}}"#
+    );
 
     match JSONTools::new()
         .flatten()
@@ -94,10 +82,7 @@ fn main() {
         .execute(messy_json)
     {
         Ok(JsonOutput::Single(result)) => {
-            println!(
-                "   Input:  {}",
-                messy_json.replace('\n', "").replace("        ", "")
-            );
+            println!("   Input:  {}", messy_json);
             println!("   Output: {}", result);
             println!("   ✅ All empty values filtered out\n");
         }
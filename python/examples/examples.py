@@ -7,20 +7,77 @@ including collision handling, filtering, transformations, batch processing,
 automatic type conversion, normal mode, and DataFrame/Series support.
 """
 
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import starmap
 from typing import Any, Dict
 
-import json_tools_rs
+from json_tools_rs import JSONTools, JsonToolsError
+
+try:
+    import orjson
+
+    _loads, _dumps = orjson.loads, orjson.dumps
+    _INDENT, _INDENT_SORTED = orjson.OPT_INDENT_2, orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+    def _pretty(data: Any, sort_keys: bool = False) -> str:
+        """Indent a dict / JSON string for display (orjson fast path).
+
+        Already-parsed results (dict in -> dict out) are dumped as-is; only
+        JSON text is parsed first.
+        """
+        if not isinstance(data, (dict, list)):
+            data = _loads(data)
+        return _dumps(data, option=_INDENT_SORTED if sort_keys else _INDENT).decode()
+
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    import json
+
+    def _pretty(data: Any, sort_keys: bool = False) -> str:
+        """Indent a dict / JSON string for display (stdlib fallback)."""
+        if not isinstance(data, (dict, list)):
+            data = json.loads(data)
+        return json.dumps(data, indent=2, sort_keys=sort_keys)
+
+
+# Section banners, built once rather than on every header.
+_BAR = "=" * 60
+_TITLE_BAR = "=" * 50
+_BREAK_BAR = "\n" + _BAR
+
+
+def _print_block(*lines: str) -> None:
+    """Write several lines with a single stdout write instead of one print each."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _numbered(i: int, item: Any) -> str:
+    """Format one batch result as an indented, 1-based numbered line."""
+    return f"  {i}. {item}"
+
+
+# Builders are cheap, but a configured JSONTools is reusable: build it once at
+# import and call execute() as often as needed. Regex patterns are compiled on
+# first use and served from the crate's pattern cache afterwards.
+REPLACEMENT_TOOLS = (
+    JSONTools()
+    .flatten()
+    .key_replacement("r'^(user|admin)_'", "")  # Standard Rust regex syntax
+    .value_replacement("@example.com", "@company.org")
+)
 
 
 def main() -> None:
-    print("JSON Tools RS - Advanced Python Examples")
-    print("Perfect Type Matching: Input Type = Output Type!")
-    print("Unified JSONTools API with Advanced Features")
-    print("=" * 50)
+    _print_block(
+        "JSON Tools RS - Advanced Python Examples",
+        "Perfect Type Matching: Input Type = Output Type!",
+        "Unified JSONTools API with Advanced Features",
+        _TITLE_BAR,
+    )
 
     # Example 1: Basic flattening
-    print("\n1. Basic Flattening")
-    print("-" * 20)
+    _print_block("\n1. Basic Flattening", "-" * 20)
 
     # Now you can pass Python dicts directly - no need to serialize to JSON!
     json_data = {
@@ -34,14 +91,13 @@ def main() -> None:
     print(f"Input (Python dict): {json_data}")
 
     # Use the unified JSONTools API with flatten() method
-    tools = json_tools_rs.JSONTools().flatten()
+    tools = JSONTools().flatten()
     result = tools.execute(json_data)  # Pass Python dict directly!
 
-    print(f"Output: {result}")
+    print(f"Output:\n{_pretty(result)}")
 
     # Example 2: Advanced configuration
-    print("\n2. Advanced Configuration")
-    print("-" * 30)
+    _print_block("\n2. Advanced Configuration", "-" * 30)
 
     # Use Python dict directly (much more convenient!)
     python_data: Dict[str, Any] = {
@@ -59,7 +115,7 @@ def main() -> None:
 
     # Configure with builder pattern using unified JSONTools API
     advanced_tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .remove_empty_strings(True)
         .remove_nulls(True)
@@ -70,11 +126,11 @@ def main() -> None:
     )
 
     result = advanced_tools.execute(python_data)  # Pass Python dict directly!
-    print(f"Output: {result}")
+    # Sorting happens inside the serializer rather than via sorted(dict.items())
+    print(f"Output (sorted keys):\n{_pretty(result, sort_keys=True)}")
 
     # Example 3: Key and value replacements
-    print("\n3. Key and Value Replacements")
-    print("-" * 35)
+    _print_block("\n3. Key and Value Replacements", "-" * 35)
 
     # Use Python dict directly
     python_patterns = {
@@ -85,19 +141,12 @@ def main() -> None:
 
     print(f"Input (Python dict): {python_patterns}")
 
-    replacement_tools = (
-        json_tools_rs.JSONTools()
-        .flatten()
-        .key_replacement("r'^(user|admin)_'", "")  # Standard Rust regex syntax
-        .value_replacement("@example.com", "@company.org")
-    )
-
-    result = replacement_tools.execute(python_patterns)  # Pass Python dict directly!
-    print(f"Output: {result}")
+    # Reuse the module-level configured instance
+    result = REPLACEMENT_TOOLS.execute(python_patterns)  # Pass Python dict directly!
+    print(f"Output:\n{_pretty(result)}")
 
     # Example 4: Batch processing
-    print("\n4. Batch Processing (Mixed Types)")
-    print("-" * 35)
+    _print_block("\n4. Batch Processing (Mixed Types)", "-" * 35)
 
     # Mix of JSON strings and Python dicts
     mixed_batch = [
@@ -108,29 +157,28 @@ def main() -> None:
 
     print(f"Input (mixed types): {mixed_batch}")
 
-    batch_tools = json_tools_rs.JSONTools().flatten()
+    batch_tools = JSONTools().flatten()
     results = batch_tools.execute(mixed_batch)  # Handles mixed types automatically!
 
-    print(f"Output: {results}")
+    # One formatted line per document, written in a single call
+    _print_block("Output:", *starmap(_numbered, enumerate(results, 1)))
 
     # Example 5: Basic unflattening
-    print("\n5. Basic Unflattening")
-    print("-" * 20)
+    _print_block("\n5. Basic Unflattening", "-" * 20)
 
     # Use the flattened result from Example 1
     flattened_data = result  # This is a Python dict from Example 1
     print(f"Input (flattened dict): {flattened_data}")
 
     # Use the unified JSONTools API with unflatten() method
-    unflatten_tools = json_tools_rs.JSONTools().unflatten()
+    unflatten_tools = JSONTools().unflatten()
     restored = unflatten_tools.execute(flattened_data)  # Pass Python dict directly!
 
-    print(f"Output (restored): {restored}")
+    print(f"Output (restored):\n{_pretty(restored)}")
     print(f"Type preserved: {type(restored)}")
 
     # Example 6: Advanced JSONTools unflattening configuration
-    print("\n6. Advanced Unflattening Configuration")
-    print("-" * 40)
+    _print_block("\n6. Advanced Unflattening Configuration", "-" * 40)
 
     # Create some flattened data with prefixes
     flattened_with_prefixes = {
@@ -143,7 +191,7 @@ def main() -> None:
 
     # Configure unflattening with transformations using unified API
     advanced_unflatten_tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .unflatten()
         .separator("_")
         .lowercase_keys(True)
@@ -155,8 +203,7 @@ def main() -> None:
     print(f"Output (transformed): {restored_advanced}")
 
     # Example 7: Roundtrip demonstration
-    print("\n7. Complete Roundtrip (Flatten → Unflatten)")
-    print("-" * 45)
+    _print_block("\n7. Complete Roundtrip (Flatten → Unflatten)", "-" * 45)
 
     # Start with complex nested data
     original_complex = {
@@ -173,22 +220,28 @@ def main() -> None:
 
     print(f"Original: {original_complex}")
 
+    # Roundtrip Example 1's input alongside it: documents that share a
+    # configuration go through a single batched execute() call per direction,
+    # so the Python <-> Rust crossing is paid once rather than once per dict.
+    originals = [original_complex, json_data]
+
     # Flatten using unified JSONTools API
-    roundtrip_flatten_tools = json_tools_rs.JSONTools().flatten()
-    flattened_complex = roundtrip_flatten_tools.execute(original_complex)
+    roundtrip_flatten_tools = JSONTools().flatten()
+    flattened_batch = roundtrip_flatten_tools.execute(originals)
+    flattened_complex = flattened_batch[0]
     print(f"Flattened: {flattened_complex}")
 
     # Unflatten using unified JSONTools API
-    roundtrip_unflatten_tools = json_tools_rs.JSONTools().unflatten()
-    restored_complex = roundtrip_unflatten_tools.execute(flattened_complex)
-    print(f"Restored: {restored_complex}")
+    roundtrip_unflatten_tools = JSONTools().unflatten()
+    restored_batch = roundtrip_unflatten_tools.execute(flattened_batch)
+    restored_complex = restored_batch[0]
+    print(f"Restored:\n{_pretty(restored_complex)}")
 
     # Verify they're identical
-    print(f"Roundtrip successful: {original_complex == restored_complex}")
+    print(f"Roundtrip successful: {originals == restored_batch}")
 
     # Example 8: Batch unflattening with type preservation
-    print("\n8. Batch Unflattening (Type Preservation)")
-    print("-" * 45)
+    _print_block("\n8. Batch Unflattening (Type Preservation)", "-" * 45)
 
     # Create batch of flattened data (mix of strings and dicts)
     flattened_batch_strings = [
@@ -205,7 +258,7 @@ def main() -> None:
 
     print(f"String batch input: {flattened_batch_strings}")
 
-    batch_unflatten_tools = json_tools_rs.JSONTools().unflatten()
+    batch_unflatten_tools = JSONTools().unflatten()
 
     # Process string batch → returns list of strings
     string_results = batch_unflatten_tools.execute(flattened_batch_strings)
@@ -220,8 +273,7 @@ def main() -> None:
     print(f"Output types: {[type(item) for item in dict_results]}")
 
     # Example 9: Collision handling strategies
-    print("\n9. Collision Handling Strategies")
-    print("-" * 35)
+    _print_block("\n9. Collision Handling Strategies", "-" * 35)
 
     # Data that will cause key collisions after transformation
     collision_data = {
@@ -234,7 +286,7 @@ def main() -> None:
 
     # Strategy 1: Handle collisions by collecting values into arrays
     handle_collision_tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .key_replacement("r'(user|admin|guest)_'", "")  # Standard Rust regex syntax
         .handle_key_collision(True)
@@ -244,22 +296,20 @@ def main() -> None:
     print(f"Handle collision (arrays): {collision_result}")
     print("Note: All colliding values are collected into an array")
 
-    print("\n" + "=" * 60)
-    print("10. Parallel Processing (Automatic)")
-    print("=" * 60)
+    _print_block(_BREAK_BAR, "10. Parallel Processing (Automatic)", _BAR)
 
     # Parallel processing is automatic for large batches (10+ items by default)
     large_batch = [{"user_id": i, "data": {"value": i * 10}} for i in range(50)]
 
     # Default: automatic parallel processing for batches >= 10 items
-    default_tools = json_tools_rs.JSONTools().flatten()
+    default_tools = JSONTools().flatten()
     results = default_tools.execute(large_batch)
     print(f"Processed {len(results)} items (automatic parallelization)")
     print(f"Sample result: {results[0]}")
 
     # Configure parallel processing thresholds
     custom_parallel_tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .parallel_threshold(25)  # Only parallelize batches of 25+ items
         .num_threads(4)  # Limit to 4 threads
@@ -274,9 +324,7 @@ def main() -> None:
     print("      and large nested structures without any code changes!")
 
     # Example 11: Automatic Type Conversion
-    print("\n" + "=" * 60)
-    print("11. Automatic Type Conversion")
-    print("=" * 60)
+    _print_block(_BREAK_BAR, "11. Automatic Type Conversion", _BAR)
 
     raw_data = {
         "id": "123",
@@ -289,17 +337,15 @@ def main() -> None:
     }
     print(f"Input: {raw_data}")
 
-    convert_tools = json_tools_rs.JSONTools().flatten().auto_convert_types(True)
+    convert_tools = JSONTools().flatten().auto_convert_types(True)
     converted = convert_tools.execute(raw_data)
-    print(f"Output: {converted}")
+    print(f"Output:\n{_pretty(converted)}")
     print("Note: Strings auto-converted to numbers, booleans, and nulls")
     print("  'id' -> 123, 'price' -> 1234.56, 'discount' -> 15.0")
     print("  'active' -> True, 'verified' -> True, 'status' -> None")
 
     # Example 12: Normal Mode (Transform without Flatten/Unflatten)
-    print("\n" + "=" * 60)
-    print("12. Normal Mode (Transform Only)")
-    print("=" * 60)
+    _print_block(_BREAK_BAR, "12. Normal Mode (Transform Only)", _BAR)
 
     data_to_clean = {
         "User_Name": "alice@example.com",
@@ -310,7 +356,7 @@ def main() -> None:
     print(f"Input: {data_to_clean}")
 
     normal_tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .normal()
         .lowercase_keys(True)
         .key_replacement("r'^user_'", "")
@@ -319,13 +365,11 @@ def main() -> None:
         .remove_nulls(True)
     )
     cleaned = normal_tools.execute(data_to_clean)
-    print(f"Output: {cleaned}")
+    print(f"Output:\n{_pretty(cleaned)}")
     print("Note: Keys transformed and values cleaned without flattening structure")
 
     # Example 13: DataFrame Support (requires pandas)
-    print("\n" + "=" * 60)
-    print("13. DataFrame Support")
-    print("=" * 60)
+    _print_block(_BREAK_BAR, "13. DataFrame Support", _BAR)
 
     try:
         import pandas as pd
@@ -339,7 +383,7 @@ def main() -> None:
         print(f"Input DataFrame:\n{df}")
         print(f"Input type: {type(df)}")
 
-        df_tools = json_tools_rs.JSONTools().flatten()
+        df_tools = JSONTools().flatten()
         result_df = df_tools.execute(df)
         print(f"\nOutput DataFrame:\n{result_df}")
         print(f"Output type: {type(result_df)}")
@@ -348,25 +392,51 @@ def main() -> None:
         print("pandas not installed - skipping DataFrame example")
         print("Install with: pip install pandas")
 
-    print("\n" + "=" * 60)
-    print("All examples completed successfully!")
-    print("JSONTools provides a complete, unified API for JSON manipulation")
-    print("with perfect type preservation, DataFrame/Series support,")
-    print("advanced collision handling, and automatic parallel processing!")
+    _print_block(
+        _BREAK_BAR,
+        "All examples completed successfully!",
+        "JSONTools provides a complete, unified API for JSON manipulation",
+        "with perfect type preservation, DataFrame/Series support,",
+        "advanced collision handling, and automatic parallel processing!",
+    )
+
+
+def concurrent_examples() -> None:
+    """Run independent jobs on OS threads while Rust holds no GIL."""
+
+    _print_block(_BREAK_BAR, "Concurrent Execution Examples", _BAR)
+
+    # execute() releases the GIL for the whole Rust-side computation, so
+    # independent jobs scale across plain Python threads. One instance can be
+    # shared between jobs: execute() only takes its config's read lock, so
+    # concurrent calls run in parallel, and only a builder call waits for them.
+    # (For many jobs known up front, JSONTools.execute_many does the same
+    # fan-out in one call.)
+    flat = JSONTools().flatten()
+    jobs = [
+        (flat, {"user": {"name": "Ann", "roles": ["admin"]}}),
+        (flat, {"order": {"id": 7, "total": 9.5}}),
+        (JSONTools().flatten().separator("_"), {"order": {"id": 8, "total": 4.0}}),
+        (JSONTools().unflatten(), {"geo.lat": 51.5, "geo.lon": -0.1}),
+        (JSONTools().normal().lowercase_keys(True), {"Status": "OK", "Code": 200}),
+    ]
+
+    with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(lambda job: job[0].execute(job[1]), jobs))
+
+    # Format only after every job has finished, in submission order
+    _print_block(*starmap(_numbered, enumerate(results, 1)))
 
 
 def error_handling_examples():
     """Examples of error handling with JSONTools."""
-    from json_tools_rs import JSONTools, JsonToolsError
 
-    print("\n" + "=" * 60)
-    print("Error Handling Examples")
-    print("=" * 60)
+    _print_block(_BREAK_BAR, "Error Handling Examples", _BAR)
 
     # Example 1: Missing operation mode
     print("\n1. Missing operation mode")
     try:
-        result = JSONTools().execute('{"key": "value"}')
+        result = JSONTools().execute({"key": "value"})
     except JsonToolsError as e:
         print(f"Error: {e}")
         # Error: Operation mode not set...
@@ -392,4 +462,5 @@ def error_handling_examples():
 
 if __name__ == "__main__":
     main()
+    concurrent_examples()
     error_handling_examples()
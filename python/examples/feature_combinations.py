@@ -10,7 +10,10 @@ nearly everything at once. Mirrors examples/feature_combinations.rs and the
 Java equivalent under jvm/examples/.
 """
 
-import json_tools_rs
+import sys
+from itertools import starmap
+
+from json_tools_rs import JSONTools
 
 
 def main() -> None:
@@ -21,7 +24,7 @@ def main() -> None:
     print("1. separator + lowercase_keys + key_replacement + handle_key_collision")
     data = {"User": {"Full_Name": "John"}, "Admin": {"Full_Name": "Jane"}}
     out = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .separator("_")
         .lowercase_keys(True)
@@ -35,7 +38,7 @@ def main() -> None:
     print("2. key_replacement + value_replacement")
     data = {"usr_nm": "John", "usr_eml": "john@old.com"}
     out = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .key_replacement("usr_", "user_")
         .value_replacement("@old.com", "@new.com")
@@ -49,7 +52,7 @@ def main() -> None:
     )
     data = {"name": "John", "bio": "", "age": None, "tags": [], "meta": {}}
     out = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .remove_empty_strings(True)
         .remove_nulls(True)
@@ -68,7 +71,7 @@ def main() -> None:
         "Admin_Bio": None,
     }
     out = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .lowercase_keys(True)
         .key_replacement("r'^(user|admin)_'", "")
@@ -83,7 +86,7 @@ def main() -> None:
     print("5. unflatten + separator + key_replacement + value_replacement")
     data = {"PREFIX_user_name": "john@OLD.com", "PREFIX_user_age": 30}
     out = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .unflatten()
         .separator("_")
         .key_replacement("PREFIX_user_", "profile_")
@@ -96,7 +99,7 @@ def main() -> None:
     print("6. normal + auto_convert_types + value_replacement + remove_empty_strings")
     data = {"user": {"status": "ACTIVE", "note": "", "score": "95.5"}}
     out = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .normal()
         .auto_convert_types(True)
         .value_replacement("r'^ACTIVE$'", "enabled")
@@ -115,7 +118,7 @@ def main() -> None:
     )
     batch = [{"id": str(i), "active": "true"} for i in range(150)]
     tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .parallel_threshold(50)
         .num_threads(4)
@@ -151,7 +154,7 @@ def main() -> None:
         },
     ]
     tools = (
-        json_tools_rs.JSONTools()
+        JSONTools()
         .flatten()
         .separator("::")
         .lowercase_keys(True)
@@ -170,8 +173,7 @@ def main() -> None:
     results = tools.execute(api_batch)
     print("   Features: separator, lowercase, 2x key_replacement, value_replacement,")
     print("             4x filtering, auto_convert_types, parallel tuning, batch")
-    for i, r in enumerate(results):
-        print(f"   [{i}]: {r}")
+    sys.stdout.write("".join(starmap("   [{}]: {}\n".format, enumerate(results))))
 
 
 if __name__ == "__main__":
@@ -84,13 +84,23 @@ Parallel Processing (Automatic):
     ...     .nested_parallel_threshold(200))  # Parallelize large nested structures
 """
 
-from .json_tools_rs import JsonOutput, JSONTools, JsonToolsError
+from .json_tools_rs import (
+    CompiledSchema,
+    FlattenIterator,
+    JsonOutput,
+    JSONTools,
+    JsonToolsError,
+    compact,
+)
 
 __version__ = "0.9.29"
 __author__ = "JSON Tools RS Contributors"
 
 __all__ = [
+    "CompiledSchema",
+    "FlattenIterator",
     "JSONTools",
     "JsonOutput",
     "JsonToolsError",
+    "compact",
 ]
@@ -1,6 +1,6 @@
 """Type stubs for the json_tools_rs native extension module."""
 
-from typing import Any, Optional, Sequence, Union
+from typing import Any, Iterable, Optional, Sequence, Union
 
 class JsonToolsError(Exception):
     """Exception raised by JSON Tools operations."""
@@ -32,6 +32,47 @@ class JsonOutput:
         """Get the result as a native Python object."""
         ...
 
+    def to_dict(self) -> Any:
+        """Parse the result (single) or each result (multiple, as a list).
+
+        Usually a dict, but a normal-mode or unflatten result whose root is not
+        an object parses to that type (list, str, int, ...).
+        """
+        ...
+
+    def get_single_dict(self) -> Any:
+        """Get the single result parsed (as to_dict). Raises ValueError if multiple."""
+        ...
+
+    def get_multiple_dict(self) -> list[Any]:
+        """Get the multiple results parsed (as to_dict). Raises ValueError if single."""
+        ...
+
+    def to_bytes(self) -> Union[bytes, list[bytes]]:
+        """Get the result(s) as UTF-8 bytes (single) or a list of bytes (multiple)."""
+        ...
+
+class FlattenIterator:
+    """Iterator returned by `JSONTools.iter_flatten`.
+
+    Yields `(key, value)` for a single document, `(doc_index, key, value)`
+    for a list input; values are converted to their Python types.
+    """
+
+    def __iter__(self) -> "FlattenIterator": ...
+    def __next__(self) -> Union[tuple[str, Any], tuple[int, str, Any]]: ...
+
+class CompiledSchema:
+    """Flattener specialized to one row shape, returned by `JSONTools.compile`."""
+
+    def execute(self, json_input: Union[str, bytes, dict[str, Any], list[Any]]) -> Any:
+        """Flatten rows matching the schema; same input/output types as `execute`.
+
+        Output equals the originating `JSONTools.execute`; a row that does not
+        match the schema raises `JsonToolsError`.
+        """
+        ...
+
 class JSONTools:
     """High-performance JSON flattening/unflattening with builder pattern API.
 
@@ -106,6 +147,10 @@ class JSONTools:
         """Flattened key names that must always render as an array, even with only one value -- keeps a key's shape consistent across documents/rows regardless of handle_key_collision. Matched against the final flattened key name."""
         ...
 
+    def select_paths(self, paths: Sequence[str]) -> "JSONTools":
+        """Flatten only these flattened key paths (matched before key transforms); other subtrees are skipped unvisited."""
+        ...
+
     def auto_convert_types(self, enable: bool) -> "JSONTools":
         """Enable automatic type conversion from strings to numbers and booleans."""
         ...
@@ -126,6 +171,14 @@ class JSONTools:
         """Set the maximum array index allowed during unflattening (DoS protection)."""
         ...
 
+    def max_depth(self, max_depth: Optional[int]) -> "JSONTools":
+        """Limit flattened keys to at most max_depth segments; deeper containers are kept whole."""
+        ...
+
+    def result_cache(self, max_entries: int) -> "JSONTools":
+        """Memoize up to max_entries processed documents by exact input text (0 disables)."""
+        ...
+
     def execute(
         self,
         json_input: Any,
@@ -135,8 +188,8 @@ class JSONTools:
         """Execute the configured JSON operation.
 
         Args:
-            json_input: JSON input as str, dict, list[str], list[dict],
-                DataFrame (pandas/polars/pyarrow/pyspark), or
+            json_input: JSON input as str, bytes (UTF-8), dict, list[str],
+                list[bytes], list[dict] (or a mix), DataFrame (pandas/polars/pyarrow/pyspark), or
                 Series (pandas/polars/pyarrow).
             normalise: If True, always return a wide/tabular DataFrame (one
                 column per flattened key) regardless of input shape -- a bare
@@ -165,7 +218,54 @@ class JSONTools:
         ...
 
     def execute_to_output(self, json_input: Any) -> JsonOutput:
-        """Execute and return a JsonOutput wrapper instead of auto-detecting type."""
+        """Execute and return a JsonOutput wrapper instead of auto-detecting type.
+
+        Accepts `str`, `bytes`, `dict`, or a list of those; results are `str`.
+        """
+        ...
+
+    def execute_ndjson(self, data: Union[str, bytes]) -> Union[str, bytes]:
+        """Process newline-delimited JSON in one buffer; returns the same type, one result per line."""
+        ...
+
+    def iter_flatten(
+        self, json_input: Union[str, bytes, dict[str, Any], Iterable[Any]]
+    ) -> FlattenIterator:
+        """Flatten lazily, yielding pairs one top-level child at a time.
+
+        A list or other iterable (e.g. a generator) is pulled one document at
+        a time, only once the previous document's pairs are exhausted.
+
+        Rejects `handle_key_collision` and `always_array_keys`; duplicate keys
+        are yielded as they occur instead of being deduplicated.
+        """
+        ...
+
+    def compile(self, schema: Union[str, dict[str, Any], list[Any]]) -> CompiledSchema:
+        """Compile a flattener specialized to one fixed row shape.
+
+        `schema` mirrors the rows (a dict/list or JSON text); leaves are
+        `str`/`int`/`float`/`bool`/`None` or `"string"`, `"integer"`,
+        `"number"`, `"boolean"`, `"null"`, with a `?` suffix to accept null.
+        Flatten mode only; keys are computed once from this instance's settings.
+        """
+        ...
+
+    def execute_columnar(self, json_input: Any) -> dict[str, Any]:
+        """Flatten a batch into `{key: pyarrow.Array}`, one typed column per key.
+
+        Built by the same engine as `normalise=True` and exported zero-copy;
+        requires `.flatten()` mode and pyarrow.
+        """
+        ...
+
+    @staticmethod
+    def execute_many(tasks: list[tuple["JSONTools", Any]]) -> list[Any]:
+        """Execute (JSONTools, str | bytes | dict) pairs, each with its own config.
+
+        All tasks run in one GIL-released call, and each result is typed like
+        its task's input (str, bytes or dict).
+        """
         ...
 
     def to_config_json(self) -> str:
@@ -189,3 +289,11 @@ class JSONTools:
         e.g. inside a PySpark UDF), via the to_config_json/from_config_json
         round trip."""
         ...
+
+def compact(data: Union[str, bytes]) -> Union[str, bytes]:
+    """Minify a JSON document in one pass; returns the same type as the input.
+
+    Equivalent to `json.dumps(json.loads(data), separators=(",", ":"))`
+    without building Python objects; strings and numbers are copied verbatim.
+    """
+    ...
@@ -0,0 +1,98 @@
+"""
+Shared pytest fixtures for the JSON Tools RS Python test suite.
+
+Anything that is expensive to build and safe to share — configured JSONTools
+instances, optional-dependency probes, the local Spark session — is created
+once per session here instead of once per test.
+"""
+
+import importlib
+from types import SimpleNamespace
+
+import json_tools_rs
+import pytest
+
+
+def _try_import(name: str):
+    """Import ``name`` if it is installed, otherwise return None."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# Tests marked ``slow`` at collection time (whole classes, or Class::test ids):
+# the large-input and throughput cases. ``pytest -m "not slow"`` skips them for
+# a quick local loop; CI runs everything.
+_SLOW = {
+    "TestBatchProcessing",
+    "TestPerformance",
+    "TestErrorHandling::test_large_json_structure",
+}
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        cls = getattr(item, "cls", None)
+        name = cls.__name__ if cls is not None else ""
+        if name in _SLOW or f"{name}::{getattr(item, 'originalname', '')}" in _SLOW:
+            item.add_marker(pytest.mark.slow)
+
+
+@pytest.fixture(scope="session")
+def optional_libs():
+    """DataFrame libraries resolved once per session (module or None each).
+
+    Python does not cache failed imports, so probing for a missing library in a
+    per-test setup fixture repeats the full finder search on every test.
+    """
+    return SimpleNamespace(
+        pd=_try_import("pandas"),
+        pl=_try_import("polars"),
+        pa=_try_import("pyarrow"),
+    )
+
+
+@pytest.fixture(scope="session")
+def spark():
+    """A local SparkSession shared by every PySpark test, or None if unavailable.
+
+    Only requested by the classes that exercise PySpark, so sessions that never
+    touch those tests do not pay the JVM start-up cost.
+    """
+    if _try_import("pyspark") is None:
+        return None
+    from pyspark.sql import SparkSession
+
+    return (
+        SparkSession.builder.master("local[2]")
+        .appName("json_tools_rs_tests")
+        .getOrCreate()
+    )
+
+
+@pytest.fixture(scope="session")
+def roundtrip_tools():
+    """(flatten, unflatten) JSONTools pairs by separator, built once per session.
+
+    Configured instances are reusable across calls, so the roundtrip cases share
+    them instead of constructing two fresh ones per case.
+    """
+    return {
+        sep: (
+            json_tools_rs.JSONTools().flatten().separator(sep),
+            json_tools_rs.JSONTools().unflatten().separator(sep),
+        )
+        for sep in (".", "_")
+    }
+
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    # pytest-benchmark is optional: without it the benchmarked tests still run
+    # their assertions, with the target called once and not measured.
+    @pytest.fixture
+    def benchmark():
+        """Stand-in for pytest-benchmark's fixture: call the target once."""
+        return lambda func, *args, **kwargs: func(*args, **kwargs)
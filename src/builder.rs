@@ -5,18 +5,24 @@
 //! batch processing.
 
 use std::borrow::Cow;
+use std::hash::{Hash, Hasher};
+use std::sync::Arc;
 
 use rayon::prelude::*;
 use smallvec::SmallVec;
 
+use crate::cache::ResultCache;
+
 use crate::config::{
-    BooleanConversionConfig, CollisionConfig, DateConversionConfig, FilteringConfig,
+    BooleanConversionConfig, CollisionConfig, CompiledCache, DateConversionConfig, FilteringConfig,
     NullConversionConfig, NumberConversionConfig, OperationMode, ProcessingConfig,
     ReplacementConfig, TypeConversionConfig, DEFAULT_MAX_ARRAY_INDEX,
     DEFAULT_NESTED_PARALLEL_THRESHOLD, DEFAULT_NUM_THREADS, DEFAULT_PARALLEL_THRESHOLD,
 };
 use crate::error::JsonToolsError;
-use crate::flatten::process_single_json;
+use crate::flatten::{process_single_json, FlattenIter};
+use crate::fxhash::FxHasher;
+use crate::schema::CompiledSchema;
 use crate::transform::process_single_json_normal;
 use crate::types::{JsonInput, JsonOutput};
 use crate::unflatten::process_single_json_for_unflatten;
@@ -53,6 +59,7 @@ impl ProcessingConfig {
                 value_replacements: tools.value_replacements.clone(),
                 key_exclusions: tools.key_exclusions.clone(),
                 value_exclusions: tools.value_exclusions.clone(),
+                compiled: tools.compiled_replacements.shared(),
             },
             type_conversion,
             type_conversion_mode,
@@ -60,6 +67,8 @@ impl ProcessingConfig {
             num_threads: tools.num_threads,
             nested_parallel_threshold: tools.nested_parallel_threshold,
             max_array_index: tools.max_array_index,
+            max_depth: tools.max_depth,
+            selected_paths: tools.selected_paths.clone(),
         }
     }
 }
@@ -89,6 +98,11 @@ pub struct JSONTools {
     /// value matches any of these. Uses SmallVec to avoid heap allocation for 0-2
     /// patterns (common case)
     value_exclusions: SmallVec<[String; 2]>,
+    /// Compiled form of the four pattern lists above, shared with every
+    /// `ProcessingConfig` built from this instance so the patterns compile once
+    /// per instance, not once per `execute()`. Reset by each builder method
+    /// that edits a list; a clone starts with its own empty cache.
+    compiled_replacements: CompiledCache,
     /// Separator for nested keys (default: "."). `Cow` rather than `String`:
     /// the default and any explicit `.separator(".")` call store a
     /// `Cow::Borrowed`, avoiding an allocation that `SeparatorCache::new`
@@ -102,6 +116,9 @@ pub struct JSONTools {
     /// measured, see `always_array_keys`'s own doc comment) -- zero
     /// allocation for callers who don't use the feature.
     always_array_keys: SmallVec<[String; 4]>,
+    /// Flattened paths to keep; every other subtree is skipped unvisited. Empty
+    /// (the default) keeps everything. Same `SmallVec` sizing as `always_array_keys`.
+    selected_paths: SmallVec<[String; 4]>,
 
     // Medium fields (8 bytes on 64-bit systems)
     /// Minimum batch size to use parallel processing (default: 100)
@@ -112,6 +129,12 @@ pub struct JSONTools {
     nested_parallel_threshold: usize,
     /// Maximum array index allowed during unflattening (DoS protection)
     max_array_index: usize,
+    /// Deepest flattened key, in path segments (None = flatten all the way down)
+    max_depth: Option<usize>,
+    /// Memo of whole-document results (None = disabled, the default). Shared, not
+    /// copied, by clones -- entries are keyed on `settings_fingerprint`, so a clone
+    /// configured differently never sees the original's results.
+    result_cache: Option<Arc<ResultCache>>,
 
     // Type-conversion sub-configs (dates, nulls, booleans, numbers)
     /// Date/datetime conversion settings
@@ -150,13 +173,17 @@ impl Default for JSONTools {
             value_replacements: SmallVec::new(),
             key_exclusions: SmallVec::new(),
             value_exclusions: SmallVec::new(),
+            compiled_replacements: CompiledCache::default(),
             separator: Cow::Borrowed("."),
             always_array_keys: SmallVec::new(),
+            selected_paths: SmallVec::new(),
             // Medium fields — use shared LazyLock statics from config module
             parallel_threshold: *DEFAULT_PARALLEL_THRESHOLD,
             num_threads: *DEFAULT_NUM_THREADS,
             nested_parallel_threshold: *DEFAULT_NESTED_PARALLEL_THRESHOLD,
             max_array_index: *DEFAULT_MAX_ARRAY_INDEX,
+            max_depth: None,
+            result_cache: None,
             date_conversion: DateConversionConfig::default(),
             null_conversion: NullConversionConfig::default(),
             boolean_conversion: BooleanConversionConfig::default(),
@@ -272,6 +299,7 @@ impl JSONTools {
     #[must_use]
     pub fn key_replacement(mut self, find: impl Into<String>, replace: impl Into<String>) -> Self {
         self.key_replacements.push((find.into(), replace.into()));
+        self.compiled_replacements = CompiledCache::default();
         self
     }
 
@@ -307,6 +335,7 @@ impl JSONTools {
         replace: impl Into<String>,
     ) -> Self {
         self.value_replacements.push((find.into(), replace.into()));
+        self.compiled_replacements = CompiledCache::default();
         self
     }
 
@@ -340,6 +369,7 @@ impl JSONTools {
     #[must_use]
     pub fn exclude_key(mut self, pattern: impl Into<String>) -> Self {
         self.key_exclusions.push(pattern.into());
+        self.compiled_replacements = CompiledCache::default();
         self
     }
 
@@ -378,6 +408,7 @@ impl JSONTools {
     #[must_use]
     pub fn exclude_value(mut self, pattern: impl Into<String>) -> Self {
         self.value_exclusions.push(pattern.into());
+        self.compiled_replacements = CompiledCache::default();
         self
     }
 
@@ -713,6 +744,21 @@ impl JSONTools {
         &self.number_conversion
     }
 
+    /// Clone this instance while keeping its compiled-pattern cache, unlike
+    /// `Clone`, which gives the copy an empty one. `pub(crate)` -- for the
+    /// Python bindings' `execute_many`, which snapshots each task's config out
+    /// from under its lock and must not recompile the instance's patterns (and
+    /// rebuild its prefilter) once per task. Editing the copy is still safe: a
+    /// builder method replaces its cache handle rather than clearing the shared
+    /// cache.
+    #[cfg(feature = "python")]
+    pub(crate) fn snapshot(&self) -> Self {
+        Self {
+            compiled_replacements: self.compiled_replacements.shared(),
+            ..self.clone()
+        }
+    }
+
     /// Set the minimum batch size for parallel processing (only available with 'parallel' feature)
     ///
     /// When processing multiple JSON documents, this threshold determines when to use
@@ -804,6 +850,307 @@ impl JSONTools {
         self
     }
 
+    /// Limit how deep flattening descends (flatten mode only)
+    ///
+    /// With `Some(n)`, flattened keys have at most `n` path segments: an object or
+    /// array found at depth `n` is emitted whole, as a nested JSON value under its
+    /// key, instead of being walked. Its subtree is copied straight from the input
+    /// without visiting any of its entries, so callers that only read the top few
+    /// levels of a document no longer pay to flatten everything below them. Key
+    /// and value transforms, exclusions and filters apply to the flattened keys
+    /// and scalar leaves only, not inside a kept subtree.
+    ///
+    /// Default: `None` (flatten every level). `Some(0)` is rejected at `.execute()`
+    /// time with a `ConfigurationError`.
+    ///
+    /// # Example
+    ///
+    /// ```
+    /// use json_tools_rs::{JSONTools, JsonOutput};
+    ///
+    /// let result = JSONTools::new()
+    ///     .flatten()
+    ///     .max_depth(Some(2))
+    ///     .execute(r#"{"product":{"id":7,"stock":{"eu":3}}}"#)
+    ///     .unwrap();
+    /// match result {
+    ///     JsonOutput::Single(s) => assert_eq!(s, r#"{"product.id":7,"product.stock":{"eu":3}}"#),
+    ///     JsonOutput::Multiple(_) => unreachable!(),
+    /// }
+    /// ```
+    #[must_use]
+    pub fn max_depth(mut self, depth: Option<usize>) -> Self {
+        self.max_depth = depth;
+        self
+    }
+
+    /// Extract only the given flattened paths (flatten mode only)
+    ///
+    /// Each path is a flattened key as `.flatten()` would build it from the input
+    /// -- segments joined by the configured separator, array indices included
+    /// (`"product.pricing.final_price"`, `"tags.0"`) -- matched *before* any key
+    /// transforms. Only those keys are emitted. Every other subtree is skipped
+    /// straight over on the structural tape, so a selective read costs a scan of
+    /// the input plus work proportional to what was asked for, not a full
+    /// flatten. A path naming an object or array returns it whole, as a nested
+    /// value. Paths that don't exist in a document are simply absent from its
+    /// output.
+    ///
+    /// Replaces any previously selected paths; an empty list (the default)
+    /// selects everything.
+    ///
+    /// # Example
+    ///
+    /// ```
+    /// use json_tools_rs::{JSONTools, JsonOutput};
+    ///
+    /// let result = JSONTools::new()
+    ///     .flatten()
+    ///     .select_paths(["product.id", "product.stock"])
+    ///     .execute(r#"{"product":{"id":7,"name":"x","stock":{"eu":3}},"meta":{"v":1}}"#)
+    ///     .unwrap();
+    /// match result {
+    ///     JsonOutput::Single(s) => assert_eq!(s, r#"{"product.id":7,"product.stock":{"eu":3}}"#),
+    ///     JsonOutput::Multiple(_) => unreachable!(),
+    /// }
+    /// ```
+    #[must_use]
+    pub fn select_paths<I, S>(mut self, paths: I) -> Self
+    where
+        I: IntoIterator<Item = S>,
+        S: Into<String>,
+    {
+        self.selected_paths = paths.into_iter().map(Into::into).collect();
+        self
+    }
+
+    /// Memoize whole-document results across `execute()` calls
+    ///
+    /// Processing is a pure function of the settings and the input text, so when the
+    /// same document is processed again and again (a tenant config or schema header
+    /// flattened on every request), the result can be served from memory instead of
+    /// re-scanning and re-walking it. With `max_entries > 0`, each document --
+    /// single input or batch item -- is looked up by its exact text under the
+    /// current settings; a hit returns the stored output, a miss processes the
+    /// document and stores the result. At most `max_entries` documents are kept;
+    /// when full, the least-recently-used half is evicted. Errors are never cached.
+    ///
+    /// Clones of this `JSONTools` share the cache, and so do further builder calls
+    /// on it: entries are tagged with a fingerprint of every setting, so changing an
+    /// option just stops matching the old entries. `max_entries == 0` (the default)
+    /// disables the cache; calling this again replaces the cache with a new, empty one.
+    ///
+    /// Costs memory for both the input and output text of each cached document;
+    /// best suited to small, frequently repeated documents rather than large
+    /// one-off batches.
+    ///
+    /// # Examples
+    ///
+    /// ```rust
+    /// use json_tools_rs::{JSONTools, JsonOutput};
+    ///
+    /// let tools = JSONTools::new().flatten().result_cache(1024);
+    /// let config_doc = r#"{"tenant": {"id": 7, "plan": "pro"}}"#;
+    /// for _ in 0..3 {
+    ///     // Only the first call does any flattening work.
+    ///     match tools.execute(config_doc).unwrap() {
+    ///         JsonOutput::Single(result) => assert_eq!(result, r#"{"tenant.id":7,"tenant.plan":"pro"}"#),
+    ///         JsonOutput::Multiple(_) => unreachable!(),
+    ///     }
+    /// }
+    /// ```
+    #[must_use]
+    pub fn result_cache(mut self, max_entries: usize) -> Self {
+        self.result_cache = (max_entries > 0).then(|| Arc::new(ResultCache::new(max_entries)));
+        self
+    }
+
+    /// Hash of every setting that can affect output, for tagging `result_cache`
+    /// entries. Destructures `self` exhaustively (no `..`), so adding a field to
+    /// `JSONTools` fails to compile until it is either hashed here or explicitly
+    /// ignored -- a forgotten setting could otherwise serve stale results.
+    fn settings_fingerprint(&self) -> u64 {
+        let Self {
+            key_replacements,
+            value_replacements,
+            key_exclusions,
+            value_exclusions,
+            compiled_replacements: _,
+            separator,
+            always_array_keys,
+            selected_paths,
+            parallel_threshold: _,
+            num_threads: _,
+            nested_parallel_threshold: _,
+            max_array_index,
+            max_depth,
+            result_cache: _,
+            date_conversion,
+            null_conversion,
+            boolean_conversion,
+            number_conversion,
+            mode,
+            remove_empty_string_values,
+            remove_null_values,
+            remove_empty_objects,
+            remove_empty_arrays,
+            lowercase_keys,
+            handle_key_collision,
+        } = self;
+        let mut hasher = FxHasher::default();
+        key_replacements.hash(&mut hasher);
+        value_replacements.hash(&mut hasher);
+        key_exclusions.hash(&mut hasher);
+        value_exclusions.hash(&mut hasher);
+        separator.hash(&mut hasher);
+        always_array_keys.hash(&mut hasher);
+        selected_paths.hash(&mut hasher);
+        max_array_index.hash(&mut hasher);
+        max_depth.hash(&mut hasher);
+        date_conversion.hash(&mut hasher);
+        null_conversion.hash(&mut hasher);
+        boolean_conversion.hash(&mut hasher);
+        number_conversion.hash(&mut hasher);
+        mode.hash(&mut hasher);
+        remove_empty_string_values.hash(&mut hasher);
+        remove_null_values.hash(&mut hasher);
+        remove_empty_objects.hash(&mut hasher);
+        remove_empty_arrays.hash(&mut hasher);
+        lowercase_keys.hash(&mut hasher);
+        handle_key_collision.hash(&mut hasher);
+        hasher.finish()
+    }
+
+    /// Setting checks shared by `execute` and `iter_flatten`, run before any input
+    /// is looked at.
+    fn validate_settings(&self) -> Result<(), JsonToolsError> {
+        if self.separator.is_empty() {
+            return Err(JsonToolsError::configuration_error(
+                "Separator cannot be empty. Use .separator(\".\") or another non-empty string",
+            ));
+        }
+
+        if let Some(0) = self.num_threads {
+            return Err(JsonToolsError::configuration_error(
+                "num_threads must be at least 1. Use None for system default",
+            ));
+        }
+
+        if let Some(0) = self.max_depth {
+            return Err(JsonToolsError::configuration_error(
+                "max_depth must be at least 1. Use None to flatten every level",
+            ));
+        }
+        Ok(())
+    }
+
+    /// Flatten one document lazily, yielding `(key, value)` pairs instead of one
+    /// output string
+    ///
+    /// `execute()` materializes the whole flattened result before returning it.
+    /// For a large document feeding a row-at-a-time consumer (a CSV writer, an
+    /// Arrow builder, a database insert), that result is pure overhead: the
+    /// consumer only ever needs the next pair. `iter_flatten` scans the document
+    /// once, then walks it one top-level child (root object member or root array
+    /// element) at a time, so only that child's pairs are buffered. Each value is
+    /// the pair's JSON text, exactly as `execute()` would write it (`"text"`, `42`,
+    /// `true`, `null`, `{}`).
+    ///
+    /// Uses this instance's flatten settings whatever mode is set. Pairs are not
+    /// resolved against each other: a repeated key is yielded once per occurrence
+    /// (`execute()` keeps the last), and `handle_key_collision` /
+    /// `always_array_keys`, which need all of a key's values at once, are rejected.
+    ///
+    /// # Errors
+    /// * The same setting errors `execute()` reports
+    /// * `ConfigurationError` with `handle_key_collision` or `always_array_keys` set
+    /// * Malformed JSON, or a root that isn't an object or array -- reported here,
+    ///   before the first pair
+    ///
+    /// # Examples
+    ///
+    /// ```rust
+    /// use json_tools_rs::JSONTools;
+    ///
+    /// let tools = JSONTools::new().flatten();
+    /// let pairs: Vec<(String, String)> = tools
+    ///     .iter_flatten(r#"{"user": {"id": 7, "tags": ["a"]}}"#)
+    ///     .unwrap()
+    ///     .collect();
+    /// assert_eq!(
+    ///     pairs,
+    ///     [
+    ///         ("user.id".to_string(), "7".to_string()),
+    ///         ("user.tags.0".to_string(), "\"a\"".to_string()),
+    ///     ]
+    /// );
+    /// ```
+    pub fn iter_flatten(&self, json: impl Into<String>) -> Result<FlattenIter, JsonToolsError> {
+        FlattenIter::new(json.into(), self.iter_flatten_config()?)
+    }
+
+    /// The validated, shareable config `iter_flatten` walks with. Split out so the
+    /// Python binding can check the settings once and share one config (and its
+    /// compiled patterns) across every document of a list.
+    pub(crate) fn iter_flatten_config(&self) -> Result<Arc<ProcessingConfig>, JsonToolsError> {
+        self.validate_settings()?;
+        if self.handle_key_collision || !self.always_array_keys.is_empty() {
+            return Err(JsonToolsError::configuration_error(
+                "iter_flatten does not support handle_key_collision or always_array_keys: \
+                 both need every value of a key at once. Use execute() instead",
+            ));
+        }
+        Ok(Arc::new(ProcessingConfig::from_json_tools(self)))
+    }
+
+    /// Compile a flattener specialized to one fixed document shape
+    ///
+    /// For a batch whose rows all share a shape, `execute()` still rebuilds every
+    /// key of every row -- path segments joined, lowercased, run through the key
+    /// replacements and exclusions. The compiled form works those keys out once,
+    /// by running this instance's own engine over a sample document, and per row
+    /// only checks the row against the schema and copies its values after the
+    /// precomputed keys. For every row that matches, `CompiledSchema::execute`
+    /// returns exactly what `execute()` would; a row that doesn't is rejected.
+    ///
+    /// `schema` is JSON mirroring the rows: objects and arrays as they appear
+    /// (arrays are fixed-length, one entry per element), leaves as a type name --
+    /// `"string"`, `"integer"`, `"number"`, `"boolean"` or `"null"` -- with a `?`
+    /// suffix to also accept `null`. Every object key listed is required and no
+    /// other key is accepted; members may appear in any order.
+    ///
+    /// # Errors
+    /// * `ConfigurationError` outside flatten mode, for an invalid schema, for
+    ///   two leaves flattening to the same key, or with a setting the compiled
+    ///   form does not support: value replacements/exclusions, type conversion,
+    ///   `handle_key_collision`, `always_array_keys`, `max_depth`, `select_paths`
+    ///
+    /// # Examples
+    ///
+    /// ```rust
+    /// use json_tools_rs::{JSONTools, JsonOutput};
+    ///
+    /// let tools = JSONTools::new().flatten();
+    /// let compiled = tools
+    ///     .compile_schema(r#"{"id": "integer", "user": {"name": "string?"}}"#)
+    ///     .unwrap();
+    /// let row = r#"{"id": 7, "user": {"name": "Ada"}}"#;
+    /// match compiled.execute(row).unwrap() {
+    ///     JsonOutput::Single(flat) => assert_eq!(flat, r#"{"id":7,"user.name":"Ada"}"#),
+    ///     JsonOutput::Multiple(_) => unreachable!(),
+    /// }
+    /// assert!(compiled.execute(r#"{"id": "7", "user": {"name": "Ada"}}"#).is_err());
+    /// ```
+    pub fn compile_schema(&self, schema: &str) -> Result<CompiledSchema, JsonToolsError> {
+        if !matches!(self.mode, Some(OperationMode::Flatten)) {
+            return Err(JsonToolsError::configuration_error(
+                "compile_schema requires .flatten() mode",
+            ));
+        }
+        self.validate_settings()?;
+        CompiledSchema::new(ProcessingConfig::from_json_tools(self), schema)
+    }
+
     /// Execute the configured operation on the provided JSON input
     ///
     /// This method performs the selected operation based on the mode set by calling
@@ -828,31 +1175,35 @@ impl JSONTools {
                 "Operation mode not set. Call .flatten(), .unflatten(), or .normal() before .execute()"
             )
         })?;
-
-        if self.separator.is_empty() {
-            return Err(JsonToolsError::configuration_error(
-                "Separator cannot be empty. Use .separator(\".\") or another non-empty string",
-            ));
-        }
-
-        if let Some(0) = self.num_threads {
-            return Err(JsonToolsError::configuration_error(
-                "num_threads must be at least 1. Use None for system default",
-            ));
-        }
+        self.validate_settings()?;
 
         let input = json_input.into();
-        match mode {
-            OperationMode::Flatten => self.execute_flatten(input),
-            OperationMode::Unflatten => self.execute_unflatten(input),
-            OperationMode::Normal => self.execute_normal(input),
+        let processor: fn(&str, &ProcessingConfig) -> Result<String, JsonToolsError> = match mode {
+            OperationMode::Flatten => process_single_json,
+            OperationMode::Unflatten => process_single_json_for_unflatten,
+            OperationMode::Normal => process_single_json_normal,
+        };
+        let config = ProcessingConfig::from_json_tools(self);
+        match &self.result_cache {
+            None => Self::execute_with_processor(input, &config, processor),
+            Some(cache) => {
+                let settings = self.settings_fingerprint();
+                Self::execute_with_processor(input, &config, |json, config| {
+                    if let Some(output) = cache.get(settings, json) {
+                        return Ok(output);
+                    }
+                    let output = processor(json, config)?;
+                    cache.insert(settings, json, &output);
+                    Ok(output)
+                })
+            }
         }
     }
 
     /// Generic batch processing helper that eliminates code duplication
     /// Processes single or multiple JSON inputs using the provided processor function
     #[inline]
-    fn execute_with_processor<'a, F>(
+    pub(crate) fn execute_with_processor<'a, F>(
         input: JsonInput<'a>,
         config: &ProcessingConfig,
         processor: F,
@@ -924,21 +1275,6 @@ impl JSONTools {
         Ok(results)
     }
 
-    fn execute_flatten<'a>(&self, input: JsonInput<'a>) -> Result<JsonOutput, JsonToolsError> {
-        let config = ProcessingConfig::from_json_tools(self);
-        Self::execute_with_processor(input, &config, process_single_json)
-    }
-
-    fn execute_unflatten<'a>(&self, input: JsonInput<'a>) -> Result<JsonOutput, JsonToolsError> {
-        let config = ProcessingConfig::from_json_tools(self);
-        Self::execute_with_processor(input, &config, process_single_json_for_unflatten)
-    }
-
-    fn execute_normal<'a>(&self, input: JsonInput<'a>) -> Result<JsonOutput, JsonToolsError> {
-        let config = ProcessingConfig::from_json_tools(self);
-        Self::execute_with_processor(input, &config, process_single_json_normal)
-    }
-
     /// Serializes this configuration to a JSON blob that
     /// `config_json::build_tools` can reconstruct an equivalent `JSONTools`
     /// from -- the mechanism behind `PyJSONTools`'s pickle support
@@ -978,6 +1314,7 @@ impl JSONTools {
             remove_empty_arrays: Some(self.remove_empty_arrays),
             handle_key_collision: Some(self.handle_key_collision),
             always_array_keys: self.always_array_keys.iter().cloned().collect(),
+            selected_paths: self.selected_paths.iter().cloned().collect(),
             auto_convert_types: None,
             convert_dates: Some(self.date_conversion.enabled),
             date_conversion_config: Some(DateConversionConfigWire {
@@ -1016,6 +1353,8 @@ impl JSONTools {
             num_threads: self.num_threads,
             nested_parallel_threshold: Some(self.nested_parallel_threshold),
             max_array_index: Some(self.max_array_index),
+            max_depth: self.max_depth,
+            result_cache: self.result_cache.as_ref().map(|cache| cache.capacity()),
         };
 
         // Infallible: `Config` is a plain data struct with no map keys, no
@@ -1,11 +1,17 @@
-//! Multi-tier caching for regex patterns.
+//! Multi-tier caching for regex patterns, plus the opt-in whole-document
+//! `ResultCache`.
 //!
 //! Three-tier regex cache: compile-time table for common patterns, thread-local
 //! FxHashMap for recent patterns, and global RwLock<FxHashMap> for shared access.
+//! Regexes that are really just (alternations of) literal strings are lowered
+//! to `LiteralPattern` and matched with `memchr::memmem` instead.
 
-use crate::fxhash::FxHashMap;
+use crate::fxhash::{FxHashMap, FxHasher};
+use memchr::memmem;
 use regex::Regex;
 use smallvec::SmallVec;
+use std::hash::Hasher;
+use std::rc::Rc;
 use std::sync::atomic::{AtomicU64, Ordering};
 use std::sync::{Arc, LazyLock, RwLock};
 
@@ -248,6 +254,529 @@ pub(crate) fn parse_pattern(pattern: &str) -> ParsedPattern<'_> {
     }
 }
 
+/// A `r'...'` regex that only ever matches literal text: an optionally
+/// `^`/`$`-anchored literal, or a literal with a single group of literal
+/// alternatives -- `^(user|admin)_`, `(User|Admin)_`, `@example\.com`,
+/// `_id$`, `^created_`. These make up most of the regex replacement patterns
+/// seen in practice (and most of `COMMON_REGEX_PATTERNS`' "common user
+/// patterns" tail), and for them the regex engine is pure overhead: every
+/// call goes through the meta engine's strategy dispatch, capture-slot
+/// bookkeeping and `replace_all`'s `Replacer` machinery just to find a fixed
+/// string. Lowered, each alternative is located with `memchr::memmem` (the
+/// same SIMD/Rabin-Karp search the bare-literal replacement path already
+/// uses) or a plain `starts_with`/`ends_with` for the anchored shapes -- a
+/// multi-literal set scanned directly, which is what an Aho-Corasick /
+/// Hyperscan prefilter would buy, without taking on a new dependency for
+/// the 1-4 alternatives these patterns realistically have.
+///
+/// Semantics are exactly the regex crate's: leftmost-first (the leftmost
+/// match start wins; among alternatives matching at that start, the one
+/// listed first in the pattern wins), matches never overlap, `^`/`$` anchor
+/// to the whole string (no multi-line mode). Anything the parser isn't sure
+/// about -- flags, classes, quantifiers, nested or multiple groups, `\d`-style
+/// escapes, an alternative that could match the empty string -- makes
+/// `parse` return `None` and the pattern stays on the regex path.
+///
+/// The one flag accepted is a leading `(?i)` on an anchored, all-ASCII
+/// pattern (`(?i)^user_`, `(?i)_id$`): a case-insensitive prefix/suffix check
+/// is a byte-wise `eq_ignore_ascii_case`, with no search involved. Unanchored
+/// `(?i)` would need a case-folding substring search and stays on the regex
+/// path. The regex crate folds with Unicode simple case folding, under which
+/// exactly two non-ASCII characters fold onto ASCII letters -- KELVIN SIGN
+/// (`K` ~ `k`) and LONG S (`ſ` ~ `s`) -- so the comparison accepts those too
+/// (see `ascii_fold_eq`) and stays exact.
+#[derive(Debug)]
+pub(crate) struct LiteralPattern {
+    anchored_start: bool,
+    anchored_end: bool,
+    /// Leading `(?i)`: alternatives are ASCII and compared case-insensitively.
+    /// Only ever set together with at least one anchor.
+    case_insensitive: bool,
+    /// Fully expanded literal alternatives, in pattern (priority) order. Never
+    /// empty, and no alternative is the empty string.
+    alternatives: SmallVec<[String; 2]>,
+}
+
+/// Regex metacharacters that end a literal run -- any of these unescaped
+/// means the pattern isn't a plain literal (the group/anchor characters are
+/// handled by `LiteralPattern::parse` before this is consulted).
+const REGEX_META: &[char] = &[
+    '.', '^', '$', '*', '+', '?', '(', ')', '[', ']', '{', '}', '|', '\\',
+];
+
+impl LiteralPattern {
+    /// Lower a regex (the inner text of `r'...'`) to a literal pattern, or
+    /// `None` if it uses anything beyond literals, one alternation group,
+    /// `^`/`$` anchors and a leading `(?i)` on an anchored ASCII pattern.
+    pub(crate) fn parse(pattern: &str) -> Option<Self> {
+        let (case_insensitive, mut rest) = match pattern.strip_prefix("(?i)") {
+            Some(r) => (true, r),
+            None => (false, pattern),
+        };
+        let anchored_start = match rest.strip_prefix('^') {
+            Some(r) => {
+                rest = r;
+                true
+            }
+            None => false,
+        };
+        let anchored_end = match rest.strip_suffix('$') {
+            // An odd run of backslashes before the `$` escapes it -- a literal
+            // dollar sign, not an anchor.
+            Some(r) if r.bytes().rev().take_while(|&b| b == b'\\').count() % 2 == 0 => {
+                rest = r;
+                true
+            }
+            _ => false,
+        };
+
+        let alternatives: SmallVec<[String; 2]> = match rest.find('(') {
+            // A top-level `a|b` is only a plain literal set when unanchored --
+            // `^a|b` means `(^a)|(b)`, which `parse_literal` declines via `|`.
+            None if !anchored_start && !anchored_end => {
+                rest.split('|')
+                    .map(Self::parse_literal)
+                    .collect::<Option<SmallVec<[String; 2]>>>()?
+            }
+            None => smallvec::smallvec![Self::parse_literal(rest)?],
+            Some(open) => {
+                // An escaped `\(` is literal text, which `parse_literal` would
+                // accept -- but it's rare enough that just declining is simpler
+                // than tracking escapes here.
+                if rest[..open].ends_with('\\') {
+                    return None;
+                }
+                let prefix = Self::parse_literal(&rest[..open])?;
+                let after_open = &rest[open + 1..];
+                let body_start = after_open.strip_prefix("?:").unwrap_or(after_open);
+                let close = body_start.find(')')?;
+                let body = &body_start[..close];
+                if body.contains('(') || body.ends_with('\\') {
+                    return None;
+                }
+                let suffix = Self::parse_literal(&body_start[close + 1..])?;
+                let mut alts = SmallVec::new();
+                for branch in body.split('|') {
+                    let branch = Self::parse_literal(branch)?;
+                    let mut alt = String::with_capacity(prefix.len() + branch.len() + suffix.len());
+                    alt.push_str(&prefix);
+                    alt.push_str(&branch);
+                    alt.push_str(&suffix);
+                    alts.push(alt);
+                }
+                alts
+            }
+        };
+
+        if alternatives.iter().any(String::is_empty) {
+            return None;
+        }
+        if case_insensitive
+            && (!(anchored_start || anchored_end) || !alternatives.iter().all(|a| a.is_ascii()))
+        {
+            return None;
+        }
+        Some(Self {
+            anchored_start,
+            anchored_end,
+            case_insensitive,
+            alternatives,
+        })
+    }
+
+    /// Unescape a run of regex text that must be purely literal: any
+    /// unescaped metacharacter, or an escape that isn't escaped ASCII
+    /// punctuation (`\d`, `\b`, `\n`, ...), declines.
+    fn parse_literal(text: &str) -> Option<String> {
+        let mut out = String::with_capacity(text.len());
+        let mut chars = text.chars();
+        while let Some(c) = chars.next() {
+            if c == '\\' {
+                match chars.next() {
+                    // `\<` / `\>` are word-boundary assertions, not escapes.
+                    Some(escaped)
+                        if escaped.is_ascii_punctuation() && !matches!(escaped, '<' | '>') =>
+                    {
+                        out.push(escaped)
+                    }
+                    _ => return None,
+                }
+            } else if REGEX_META.contains(&c) {
+                return None;
+            } else {
+                out.push(c);
+            }
+        }
+        Some(out)
+    }
+
+    /// Leftmost-first match at or after byte offset `from`, as `(start, len)`.
+    #[inline]
+    fn find_at(&self, s: &str, from: usize) -> Option<(usize, usize)> {
+        let hay = s.as_bytes();
+        match (self.anchored_start, self.anchored_end) {
+            (true, true) => (from == 0)
+                .then(|| {
+                    self.alternatives
+                        .iter()
+                        .find_map(|alt| self.prefix_len(s, alt).filter(|&len| len == s.len()))
+                })
+                .flatten()
+                .map(|len| (0, len)),
+            (true, false) => (from == 0)
+                .then(|| {
+                    self.alternatives
+                        .iter()
+                        .find_map(|alt| self.prefix_len(s, alt))
+                })
+                .flatten()
+                .map(|len| (0, len)),
+            // Only one match can end at the end of the string; the leftmost
+            // start belongs to the longest alternative that is a suffix.
+            (false, true) => self
+                .alternatives
+                .iter()
+                .filter_map(|alt| self.suffix_len(s, alt))
+                .filter(|&len| s.len() - from >= len)
+                .max()
+                .map(|len| (s.len() - len, len)),
+            (false, false) => {
+                let mut best: Option<(usize, usize)> = None;
+                for alt in &self.alternatives {
+                    // Only strictly-earlier starts can beat the current best, so
+                    // each later alternative searches a shrinking window; ties
+                    // keep the earlier-listed alternative (leftmost-first).
+                    let limit = match best {
+                        Some((start, _)) => (start + alt.len()).min(hay.len()),
+                        None => hay.len(),
+                    };
+                    if limit < from + alt.len() {
+                        continue;
+                    }
+                    if let Some(idx) = memmem::find(&hay[from..limit], alt.as_bytes()) {
+                        let start = from + idx;
+                        if best.map_or(true, |(b, _)| start < b) {
+                            best = Some((start, alt.len()));
+                        }
+                    }
+                }
+                best
+            }
+        }
+    }
+
+    /// Byte length of the match of `alt` at the start of `s`, if any. Only a
+    /// case-insensitive match can differ from `alt.len()` (a 3-byte KELVIN SIGN
+    /// or 2-byte LONG S standing in for an ASCII letter).
+    #[inline]
+    fn prefix_len(&self, s: &str, alt: &str) -> Option<usize> {
+        if !self.case_insensitive {
+            return s.starts_with(alt).then_some(alt.len());
+        }
+        if s.len() >= alt.len() && s.as_bytes()[..alt.len()].eq_ignore_ascii_case(alt.as_bytes()) {
+            return Some(alt.len());
+        }
+        fold_match_len(s.chars(), alt.bytes())
+    }
+
+    /// `prefix_len`'s mirror image for a match ending at the end of `s`.
+    #[inline]
+    fn suffix_len(&self, s: &str, alt: &str) -> Option<usize> {
+        if !self.case_insensitive {
+            return s.ends_with(alt).then_some(alt.len());
+        }
+        if s.len() >= alt.len()
+            && s.as_bytes()[s.len() - alt.len()..].eq_ignore_ascii_case(alt.as_bytes())
+        {
+            return Some(alt.len());
+        }
+        fold_match_len(s.chars().rev(), alt.bytes().rev())
+    }
+
+    /// Equivalent of `Regex::is_match` for the lowered pattern.
+    #[inline]
+    pub(crate) fn is_match(&self, s: &str) -> bool {
+        self.find_at(s, 0).is_some()
+    }
+
+    /// Equivalent of `Regex::replace_all` with a replacement containing no `$`
+    /// group references (callers must check -- `$` expansion is regex-only
+    /// behavior). Returns `None` when nothing matched, mirroring
+    /// `memmem_replace_all`'s change-detection convention.
+    #[inline]
+    pub(crate) fn replace_all(&self, s: &str, replacement: &str) -> Option<String> {
+        let mut pos = 0;
+        let mut out: Option<String> = None;
+        while let Some((start, len)) = self.find_at(s, pos) {
+            let buf = out.get_or_insert_with(|| String::with_capacity(s.len() + replacement.len()));
+            buf.push_str(&s[pos..start]);
+            buf.push_str(replacement);
+            pos = start + len;
+            if self.anchored_start || self.anchored_end {
+                break;
+            }
+        }
+        out.map(|mut buf| {
+            buf.push_str(&s[pos..]);
+            buf
+        })
+    }
+}
+
+/// The literal prefixes every match of a `^`-anchored regex must start with --
+/// `^(user|admin)_(\w+)` can only match a string starting with `user_` or
+/// `admin_`, `^acct_\d+` one starting with `acct_`. Such a regex still needs
+/// the engine (a class, a quantifier, a `$` group reference in its
+/// replacement, ...), but a key or value that starts with none of the prefixes
+/// -- almost every one, for a prefix-rewriting rule -- is rejected with a few
+/// `starts_with` compares instead of a trip through the meta engine's search
+/// and `replace_all`'s `Replacer` machinery.
+///
+/// Extracted conservatively from the pattern text: a leading literal run (a
+/// char followed by a quantifier is dropped from it), optionally extended
+/// through one following group of literal alternatives and the literal run
+/// after that group. Anything unclear -- a quantified group, flags, a class, a
+/// top-level `|` (`^a|b` also matches strings without the `a`), an
+/// alternative yielding an empty prefix -- shortens the prefix to what is
+/// certain, or gives `None` (no gate) when nothing is. Patterns not starting
+/// with `^` (including any with a leading flag group) are never gated.
+#[derive(Debug)]
+pub(crate) struct AnchoredPrefixes(SmallVec<[String; 2]>);
+
+impl AnchoredPrefixes {
+    /// The required prefixes of a regex (the inner text of `r'...'`), or `None`
+    /// when the pattern admits strings with no fixed leading literal.
+    pub(crate) fn parse(pattern: &str) -> Option<Self> {
+        let rest = pattern.strip_prefix('^')?;
+        if has_top_level_alternation(rest)? {
+            return None;
+        }
+        let (lead, rest) = leading_literal_run(rest);
+        let prefixes =
+            Self::through_group(&lead, rest).unwrap_or_else(|| smallvec::smallvec![lead]);
+        if prefixes.iter().any(String::is_empty) {
+            return None;
+        }
+        Some(Self(prefixes))
+    }
+
+    /// `lead` extended through a group of literal alternatives opening `rest`
+    /// and the literal run after it, or `None` to keep `lead` alone.
+    fn through_group(lead: &str, rest: &str) -> Option<SmallVec<[String; 2]>> {
+        let group = rest.strip_prefix('(')?;
+        // `(?:` is a plain group; any other `(?` is flags or a named group.
+        let body = match group.strip_prefix("?:") {
+            Some(body) => body,
+            None if group.starts_with('?') => return None,
+            None => group,
+        };
+        let close = body.find(')')?;
+        let inner = &body[..close];
+        if inner.contains('(') || inner.ends_with('\\') {
+            return None;
+        }
+        let after = &body[close + 1..];
+        if after.starts_with(['*', '+', '?', '{']) {
+            return None;
+        }
+        let (tail, _) = leading_literal_run(after);
+        inner
+            .split('|')
+            .map(|branch| {
+                let branch = LiteralPattern::parse_literal(branch)?;
+                Some(format!("{lead}{branch}{tail}"))
+            })
+            .collect()
+    }
+
+    /// Whether `s` starts with one of the prefixes -- when it doesn't, the regex
+    /// can't match it.
+    #[inline]
+    pub(crate) fn admits(&self, s: &str) -> bool {
+        self.0.iter().any(|prefix| s.starts_with(prefix.as_str()))
+    }
+}
+
+/// The literal text at the start of `text` (regex syntax, escapes resolved) and
+/// the unparsed remainder. Stops at the first metacharacter or non-punctuation
+/// escape; when that is a quantifier, the char it applies to is dropped too,
+/// since it may match zero times (or, for `{n,m}`, a different count).
+fn leading_literal_run(text: &str) -> (String, &str) {
+    let mut out = String::with_capacity(text.len());
+    let mut chars = text.char_indices();
+    while let Some((i, c)) = chars.next() {
+        if c == '\\' {
+            match chars.next() {
+                Some((_, escaped))
+                    if escaped.is_ascii_punctuation() && !matches!(escaped, '<' | '>') =>
+                {
+                    out.push(escaped);
+                    continue;
+                }
+                _ => return (out, &text[i..]),
+            }
+        }
+        if REGEX_META.contains(&c) {
+            if matches!(c, '*' | '+' | '?' | '{') {
+                out.pop();
+            }
+            return (out, &text[i..]);
+        }
+        out.push(c);
+    }
+    (out, "")
+}
+
+/// Whether `text` has a `|` outside every group and class -- `Some(true)` means
+/// the alternation splits the whole pattern, so the `^` before it doesn't anchor
+/// the other branches. `None` for unbalanced brackets (not a pattern worth
+/// reasoning about; it won't compile anyway).
+fn has_top_level_alternation(text: &str) -> Option<bool> {
+    let mut groups = 0usize;
+    let mut classes = 0usize;
+    let mut chars = text.chars().peekable();
+    while let Some(c) = chars.next() {
+        match c {
+            '\\' => {
+                chars.next();
+            }
+            '[' => {
+                classes += 1;
+                // A `]` right after the opening `[` (or `[^`) is a literal member.
+                chars.next_if_eq(&'^');
+                chars.next_if_eq(&']');
+            }
+            ']' if classes > 0 => classes -= 1,
+            '(' if classes == 0 => groups += 1,
+            ')' if classes == 0 => groups = groups.checked_sub(1)?,
+            '|' if classes == 0 && groups == 0 => return Some(true),
+            _ => {}
+        }
+    }
+    (groups == 0 && classes == 0).then_some(false)
+}
+
+/// Case-insensitively match the ASCII bytes `alt` against the leading chars of
+/// `chars`, returning the matched length in bytes. The slow path behind
+/// `LiteralPattern::prefix_len`/`suffix_len`, only reached when the plain
+/// byte-wise comparison failed.
+fn fold_match_len(
+    mut chars: impl Iterator<Item = char>,
+    alt: impl Iterator<Item = u8>,
+) -> Option<usize> {
+    let mut len = 0;
+    for b in alt {
+        let c = chars.next()?;
+        if !ascii_fold_eq(c, b) {
+            return None;
+        }
+        len += c.len_utf8();
+    }
+    Some(len)
+}
+
+/// Whether `c` equals the ASCII byte `b` under the regex crate's `(?i)`
+/// (Unicode simple case folding). Besides ASCII case pairs, only KELVIN SIGN
+/// (U+212A) and LONG S (U+017F) fold onto an ASCII letter.
+#[inline]
+fn ascii_fold_eq(c: char, b: u8) -> bool {
+    match c {
+        '\u{212A}' => b.eq_ignore_ascii_case(&b'k'),
+        '\u{17F}' => b.eq_ignore_ascii_case(&b's'),
+        _ => c.is_ascii() && (c as u8).eq_ignore_ascii_case(&b),
+    }
+}
+
+/// Capacity of the per-thread lowering cache below. Lowering is a short
+/// linear parse with no compilation, so a miss is cheap; this only exists so
+/// the same handful of patterns aren't re-parsed (and their alternatives
+/// re-allocated) on every key and value of a batch.
+const LITERAL_PATTERN_CACHE_CAPACITY: usize = 8;
+
+/// `(pattern, lowering)` pairs -- `None` records "not lowerable" so regex-only
+/// patterns don't get re-parsed on every call either.
+type LiteralPatternCache =
+    SmallVec<[(Rc<str>, Option<Rc<LiteralPattern>>); LITERAL_PATTERN_CACHE_CAPACITY]>;
+
+thread_local! {
+    /// Same shape and rationale as `STICKY_REGEX_CACHE`: a linear scan over a
+    /// few full pattern strings beats hashing for the 1-2 patterns a config
+    /// realistically carries. `Rc` rather than `Arc` -- entries never leave
+    /// the thread.
+    static LITERAL_PATTERN_CACHE: std::cell::RefCell<LiteralPatternCache> =
+        std::cell::RefCell::new(SmallVec::new());
+}
+
+/// Look up (lowering and caching on first use) the literal form of a regex
+/// pattern. `None` means the pattern needs the real regex engine.
+#[inline]
+pub(crate) fn get_literal_pattern(pattern: &str) -> Option<Rc<LiteralPattern>> {
+    LITERAL_PATTERN_CACHE.with(|cache| {
+        if let Some((_, lowered)) = cache.borrow().iter().find(|(p, _)| p.as_ref() == pattern) {
+            return lowered.clone();
+        }
+        let lowered = LiteralPattern::parse(pattern).map(Rc::new);
+        let mut cache = cache.borrow_mut();
+        if cache.len() >= LITERAL_PATTERN_CACHE_CAPACITY {
+            cache.remove(0);
+        }
+        cache.push((Rc::from(pattern), lowered.clone()));
+        lowered
+    })
+}
+
+/// A replacement or exclusion pattern resolved once per `ProcessingConfig` (so
+/// once per `execute()` call, shared by every document and worker thread in a
+/// batch) instead of once per key/value.
+///
+/// Resolving a pattern on the per-call path means `parse_pattern`, a scan of the
+/// thread-local `LiteralPattern` cache and -- for real regexes -- a probe of
+/// `COMMON_REGEX_PATTERNS` (hashing the whole pattern string) plus the sticky
+/// cache and an `Arc` refcount round trip, for every single leaf. All of that is
+/// a pure function of the pattern text, which doesn't change during a call. See
+/// `ReplacementConfig::compiled`.
+#[derive(Debug, Clone)]
+pub(crate) enum CompiledPattern {
+    /// Not `r'...'`-wrapped: a plain substring, which is the configured pattern
+    /// string itself.
+    Literal,
+    /// `r'...'` regex that only matches fixed text -- see `LiteralPattern`.
+    Lowered(Arc<LiteralPattern>),
+    /// `r'...'` regex that needs the real engine (shared with the regex cache).
+    Regex(Arc<Regex>),
+    /// `Regex`, for a `^`-anchored pattern with required literal prefixes --
+    /// tried only on strings that start with one of them (see
+    /// `AnchoredPrefixes`).
+    GatedRegex(Arc<Regex>, Arc<AnchoredPrefixes>),
+    /// `r'...'` regex that failed to compile: never matches, the same silent
+    /// skip as the per-call path.
+    Invalid,
+}
+
+impl CompiledPattern {
+    /// Resolve `pattern`. `lower` is false for a replacement whose replacement
+    /// string contains `$` -- a group reference only the regex engine can expand.
+    pub(crate) fn compile(pattern: &str, lower: bool) -> Self {
+        match parse_pattern(pattern) {
+            ParsedPattern::Literal(_) => Self::Literal,
+            ParsedPattern::Regex(inner) => {
+                if lower {
+                    if let Some(lowered) = LiteralPattern::parse(inner) {
+                        return Self::Lowered(Arc::new(lowered));
+                    }
+                }
+                match get_cached_regex(inner) {
+                    Ok(regex) => match AnchoredPrefixes::parse(inner) {
+                        Some(prefixes) => Self::GatedRegex(regex, Arc::new(prefixes)),
+                        None => Self::Regex(regex),
+                    },
+                    Err(_) => Self::Invalid,
+                }
+            }
+        }
+    }
+}
+
 /// Get a cached regex, using Arc<Regex> for O(1) cloning
 ///
 /// Three-tier caching strategy (optimized for both latency and concurrency):
@@ -330,10 +859,290 @@ pub(crate) fn get_cached_regex(pattern: &str) -> Result<Arc<Regex>, regex::Error
     Ok(regex)
 }
 
+// ================================================================================================
+// ResultCache -- opt-in memo of whole-document results (`JSONTools::result_cache`)
+// ================================================================================================
+
+/// One memoized document. The settings fingerprint and full input text are kept next
+/// to the output, so a lookup only ever returns a result produced under the exact
+/// same settings from the exact same input -- the map key is just a hash of the two,
+/// and a hash collision is a plain miss.
+struct ResultCacheEntry {
+    settings: u64,
+    input: Box<str>,
+    output: Box<str>,
+    /// Last-access tick (`next_tick`), bumped through a shared reference on a hit --
+    /// same trick as the regex cache's `CacheEntry`.
+    tick: AtomicU64,
+}
+
+/// Bounded memo of processed documents, keyed on (settings fingerprint, input text).
+///
+/// Processing is a pure function of those two, so a document seen again -- the same
+/// tenant config or schema header flattened on every request -- can skip scan, walk
+/// and output entirely: a hit costs one word-at-a-time hash of the input, a compare,
+/// and a copy of the cached output. Shared by every clone of the `JSONTools` that
+/// created it (clones with different settings simply never match each other's
+/// entries) and safe to hit from every rayon worker at once: lookups take only a read
+/// lock. When full, the least-recently-used half is evicted in one batch, as in the
+/// thread-local regex tier.
+pub(crate) struct ResultCache {
+    capacity: usize,
+    entries: RwLock<FxHashMap<u64, ResultCacheEntry>>,
+}
+
+impl std::fmt::Debug for ResultCache {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("ResultCache")
+            .field("capacity", &self.capacity)
+            .finish_non_exhaustive()
+    }
+}
+
+impl ResultCache {
+    pub(crate) fn new(capacity: usize) -> Self {
+        Self {
+            capacity,
+            entries: RwLock::new(FxHashMap::default()),
+        }
+    }
+
+    /// Maximum number of memoized documents.
+    pub(crate) fn capacity(&self) -> usize {
+        self.capacity
+    }
+
+    /// Hash the input 8 bytes per step -- `FxHasher::write` goes byte by byte, which
+    /// for a multi-kilobyte document would make the hit path noticeably slower than it
+    /// needs to be.
+    fn key(settings: u64, input: &str) -> u64 {
+        let mut hasher = FxHasher::default();
+        hasher.write_u64(settings);
+        hasher.write_usize(input.len());
+        let mut chunks = input.as_bytes().chunks_exact(8);
+        for chunk in &mut chunks {
+            hasher.write_u64(u64::from_le_bytes(chunk.try_into().unwrap()));
+        }
+        hasher.write(chunks.remainder());
+        hasher.finish()
+    }
+
+    /// The memoized output for `input` under `settings`, if any.
+    pub(crate) fn get(&self, settings: u64, input: &str) -> Option<String> {
+        let key = Self::key(settings, input);
+        let entries = self.entries.read().ok()?;
+        let entry = entries.get(&key)?;
+        if entry.settings != settings || &*entry.input != input {
+            return None;
+        }
+        entry.tick.store(next_tick(), Ordering::Relaxed);
+        Some(String::from(&*entry.output))
+    }
+
+    /// Memoize `output` for `input` under `settings`. A poisoned lock just skips the
+    /// insert -- the cache is an optimization, never a source of errors.
+    pub(crate) fn insert(&self, settings: u64, input: &str, output: &str) {
+        let key = Self::key(settings, input);
+        let Ok(mut entries) = self.entries.write() else {
+            return;
+        };
+        if entries.len() >= self.capacity && !entries.contains_key(&key) {
+            let mut ticks: Vec<u64> = entries
+                .values()
+                .map(|entry| entry.tick.load(Ordering::Relaxed))
+                .collect();
+            ticks.sort_unstable();
+            let median = ticks[ticks.len() / 2];
+            entries.retain(|_, entry| entry.tick.load(Ordering::Relaxed) > median);
+        }
+        entries.insert(
+            key,
+            ResultCacheEntry {
+                settings,
+                input: Box::from(input),
+                output: Box::from(output),
+                tick: AtomicU64::new(next_tick()),
+            },
+        );
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
 
+    /// `LiteralPattern` must agree with the regex crate on every pattern it
+    /// accepts -- differential check over anchored/unanchored, single and
+    /// alternation shapes, overlapping and prefix-sharing alternatives, and
+    /// haystacks with zero, one and many matches.
+    #[test]
+    fn test_literal_pattern_matches_regex_semantics() {
+        let patterns = [
+            "^(user|admin)_",
+            "(User|Admin)_",
+            "(?:ab|abc)",
+            "(abc|ab)",
+            "x(a|b)y",
+            "@example\\.com",
+            "_id$",
+            "^id_",
+            "^exact$",
+            "^(a|ab)$",
+            "(bc|abcd)$",
+            "aa",
+            "user_|admin_",
+            "\\$price",
+            "(?i)^user_",
+            "(?i)_id$",
+            "(?i)^(user|admin)_",
+            "(?i)^exact$",
+            "(?i)^key",
+            "(?i)(ids|s)$",
+        ];
+        let haystacks = [
+            "",
+            "user_name",
+            "admin_user_admin_",
+            "User_Admin_x",
+            "abcabcab",
+            "xayxbyxcy",
+            "john@example.com and jane@example.com",
+            "user_id",
+            "id_id_id",
+            "exact",
+            "exactly",
+            "ab",
+            "abcd",
+            "aaaaa",
+            "cost $price",
+            "USER_Name",
+            "Admin_x",
+            "ORDER_ID",
+            "EXACT",
+            "\u{212A}EY_x",
+            "order_\u{212A}ey",
+            "user_id\u{17F}",
+            "u\u{17F}er_\u{212A}",
+            "\u{e9}xact",
+        ];
+        for pattern in patterns {
+            let lowered = LiteralPattern::parse(pattern)
+                .unwrap_or_else(|| panic!("{pattern:?} should lower to a literal pattern"));
+            let regex = Regex::new(pattern).unwrap();
+            for hay in haystacks {
+                assert_eq!(
+                    lowered.is_match(hay),
+                    regex.is_match(hay),
+                    "is_match mismatch for {pattern:?} on {hay:?}"
+                );
+                let expected = regex.replace_all(hay, "<R>").into_owned();
+                let actual = lowered
+                    .replace_all(hay, "<R>")
+                    .unwrap_or_else(|| hay.to_string());
+                assert_eq!(
+                    actual, expected,
+                    "replace_all mismatch for {pattern:?} on {hay:?}"
+                );
+            }
+        }
+    }
+
+    /// Anything beyond literals + one alternation group + anchors must stay on
+    /// the regex path.
+    #[test]
+    fn test_literal_pattern_declines_real_regex() {
+        for pattern in [
+            "\\d+",
+            "^user_\\w",
+            "a.b",
+            "(a|b)+",
+            "(a|b)(c|d)",
+            "((a|b))",
+            "(?i)user",
+            "(?i)user|admin",
+            "(?i)^caf\u{e9}",
+            "(?-i)^user",
+            "^(?i)user",
+            "[ab]",
+            "a{2}",
+            "(a|)",
+            "",
+            "^$",
+            "\\(x",
+            "a\\<b",
+            "^a|b",
+        ] {
+            assert!(
+                LiteralPattern::parse(pattern).is_none(),
+                "{pattern:?} must not be lowered"
+            );
+        }
+    }
+
+    /// `AnchoredPrefixes` must never reject a string its regex matches, and
+    /// must extract the full literal lead where the pattern makes it certain.
+    #[test]
+    fn test_anchored_prefixes_gate_is_sound() {
+        let cases: [(&str, &[&str]); 12] = [
+            ("^(user|admin)_(\\w+)", &["user_", "admin_"]),
+            ("^acct_\\d+", &["acct_"]),
+            ("^ab*c", &["a"]),
+            ("^ab{2}", &["a"]),
+            ("^a\\.?b", &["a"]),
+            ("^v\\.(1|2)\\.\\d", &["v.1.", "v.2."]),
+            ("^(?:x|yz)w[0-9]", &["xw", "yzw"]),
+            ("^(a|b)+c", &[]),
+            ("^id(?i)_x", &["id"]),
+            ("^user_(\\d|x)", &["user_"]),
+            ("^pre[|]x|", &[]),
+            ("^k(\\w|x)+", &["k"]),
+        ];
+        let haystacks = [
+            "",
+            "user_name",
+            "admin_",
+            "acct_42",
+            "acct_x",
+            "abbbc",
+            "ac",
+            "abb",
+            "a.b",
+            "ab",
+            "v.1.0",
+            "v.3.0",
+            "xw1",
+            "yzw9",
+            "aac",
+            "bc",
+            "id_X",
+            "user_5",
+            "pre|x",
+            "kx",
+            "name",
+        ];
+        for (pattern, expected) in cases {
+            let regex = Regex::new(pattern).unwrap();
+            match AnchoredPrefixes::parse(pattern) {
+                Some(prefixes) => {
+                    let got: Vec<&str> = prefixes.0.iter().map(String::as_str).collect();
+                    assert_eq!(got, expected, "prefixes of {pattern:?}");
+                    for hay in haystacks {
+                        if regex.is_match(hay) {
+                            assert!(prefixes.admits(hay), "{pattern:?} gate rejects {hay:?}");
+                        }
+                    }
+                }
+                None => assert!(expected.is_empty(), "{pattern:?} should be gated"),
+            }
+        }
+        for pattern in ["user_\\d", "^a|b", "(?m)^user", "^(?i)user", "^\\d+", "^(a"] {
+            assert!(
+                AnchoredPrefixes::parse(pattern).is_none(),
+                "{pattern:?} must not be gated"
+            );
+        }
+    }
+
     /// The thread-local cache tier must evict genuinely least-recently-used entries,
     /// not an arbitrary half -- regression test for the previous alternating-retain
     /// eviction, which had no concept of recency and could evict a pattern being
@@ -4,8 +4,18 @@
 //! patterns, and processing thresholds. Supports environment variable overrides
 //! for parallelism settings.
 
+use regex::RegexSet;
 use smallvec::SmallVec;
-use std::sync::LazyLock;
+use std::cell::RefCell;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::{Arc, LazyLock, OnceLock};
+
+use crate::cache::CompiledPattern;
+use crate::fxhash::FxHashMap;
+use crate::transform::{
+    apply_compiled_replacements, apply_prefiltered_replacements, apply_replacement_patterns,
+    build_replacement_prefilter, matches_any_compiled, matches_any_pattern,
+};
 
 /// Parse an environment variable once at process startup.
 pub(crate) fn parse_env_usize(name: &str, default: usize) -> usize {
@@ -30,7 +40,7 @@ pub(crate) static DEFAULT_NUM_THREADS: LazyLock<Option<usize>> =
     LazyLock::new(|| parse_env_usize_opt("JSON_TOOLS_NUM_THREADS"));
 
 /// Operation mode for the unified JSONTools API
-#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
 #[repr(u8)] // Smaller discriminant for better cache locality
 pub(crate) enum OperationMode {
     /// Flatten JSON structures
@@ -189,6 +199,181 @@ pub struct ReplacementConfig {
     /// `crate::builder::JSONTools::exclude_value` for full docs including the
     /// unflatten quoted-form caveat.
     pub value_exclusions: SmallVec<[String; 2]>,
+    /// The four pattern lists above, resolved on first use -- see
+    /// `ReplacementConfig::compiled`.
+    pub(crate) compiled: CompiledCache,
+}
+
+/// `CompiledPattern`s for each of `ReplacementConfig`'s pattern lists, index for
+/// index, along with a copy of the lists they were compiled from.
+#[derive(Debug, Default)]
+pub(crate) struct CompiledReplacements {
+    key_replacements: SmallVec<[CompiledPattern; 2]>,
+    value_replacements: SmallVec<[CompiledPattern; 2]>,
+    key_exclusions: SmallVec<[CompiledPattern; 2]>,
+    value_exclusions: SmallVec<[CompiledPattern; 2]>,
+    /// The pattern lists as they were when compiled. `ReplacementConfig`'s lists
+    /// are public, so they can be edited after first use -- even in place, keeping
+    /// their length -- and each accessor compares its list against this copy
+    /// before trusting the compiled forms. A few short string compares per call,
+    /// small next to the match itself.
+    key_replacement_sources: SmallVec<[(String, String); 2]>,
+    value_replacement_sources: SmallVec<[(String, String); 2]>,
+    key_exclusion_sources: SmallVec<[String; 2]>,
+    value_exclusion_sources: SmallVec<[String; 2]>,
+    /// One-pass "which key replacements can match" set for long replacement
+    /// lists -- see `build_replacement_prefilter`.
+    key_prefilter: Option<RegexSet>,
+    /// Owner id for `KEY_REPLACEMENT_MEMO`, or 0 when no key replacement needs the
+    /// regex engine (literal and lowered patterns are cheaper than a memo lookup).
+    key_memo_owner: u64,
+}
+
+/// Source of `CompiledReplacements::key_memo_owner` ids; 0 is never handed out.
+static NEXT_KEY_MEMO_OWNER: AtomicU64 = AtomicU64::new(1);
+
+/// Number of configs (`owner`s) memoized side by side per thread. Several
+/// instances used alternately on the shared rayon pool (e.g. `execute_many`
+/// tasks) each keep their own entries instead of clearing one shared memo on
+/// every switch; a further owner evicts the least recently used one.
+const KEY_REPLACEMENT_MEMO_OWNERS: usize = 4;
+
+/// Longest key memoized. Same-schema paths are short; a long key is unlikely to
+/// repeat and would cost its length twice in memo storage.
+const KEY_REPLACEMENT_MEMO_MAX_KEY_LEN: usize = 256;
+
+/// Byte budget per owner: memoized keys and results plus per-entry overhead.
+/// Once full, an owner keeps its entries but stores no more, so a high-cardinality
+/// key space (e.g. per-index array paths in large arrays) stops being memoized
+/// rather than growing without bound. With `KEY_REPLACEMENT_MEMO_OWNERS`, this
+/// caps each thread's memo at about 1 MiB for the life of the process.
+const KEY_REPLACEMENT_MEMO_BYTES: usize = 256 * 1024;
+
+/// Per-thread memo of regex key-replacement results, for the compiled patterns of
+/// up to `KEY_REPLACEMENT_MEMO_OWNERS` `ReplacementConfig`s at a time.
+///
+/// A batch of documents sharing a schema runs the same key paths through the same
+/// patterns over and over -- every document re-runs the regex engine on
+/// `"product.id"`, `"product.name"`, ... to get the same answers. After the first
+/// document on a thread, each key becomes a hash lookup instead. This is the shape
+/// specialization a schema-keyed plan would give, without a plan to invalidate:
+/// a document with new keys simply misses and fills the memo.
+struct KeyReplacementMemo {
+    owners: SmallVec<[OwnerKeyMemo; KEY_REPLACEMENT_MEMO_OWNERS]>,
+    /// Use counter for least-recently-used eviction of `owners`.
+    clock: u64,
+}
+
+/// One config's entries in `KeyReplacementMemo`.
+struct OwnerKeyMemo {
+    owner: u64,
+    last_use: u64,
+    /// Bytes charged against `KEY_REPLACEMENT_MEMO_BYTES`.
+    bytes: usize,
+    results: FxHashMap<Box<str>, Option<Box<str>>>,
+}
+
+impl KeyReplacementMemo {
+    /// `owner`'s entries, starting empty ones (evicting the least recently used
+    /// owner if every slot is taken) on first use.
+    fn owner_mut(&mut self, owner: u64) -> &mut OwnerKeyMemo {
+        self.clock += 1;
+        let slot = match self.owners.iter().position(|memo| memo.owner == owner) {
+            Some(slot) => slot,
+            None => {
+                let fresh = OwnerKeyMemo {
+                    owner,
+                    last_use: 0,
+                    bytes: 0,
+                    results: FxHashMap::default(),
+                };
+                if self.owners.len() < KEY_REPLACEMENT_MEMO_OWNERS {
+                    self.owners.push(fresh);
+                    self.owners.len() - 1
+                } else {
+                    let lru = (0..self.owners.len())
+                        .min_by_key(|&slot| self.owners[slot].last_use)
+                        .unwrap_or(0);
+                    self.owners[lru] = fresh;
+                    lru
+                }
+            }
+        };
+        let memo = &mut self.owners[slot];
+        memo.last_use = self.clock;
+        memo
+    }
+}
+
+thread_local! {
+    static KEY_REPLACEMENT_MEMO: RefCell<KeyReplacementMemo> = RefCell::new(KeyReplacementMemo {
+        owners: SmallVec::new(),
+        clock: 0,
+    });
+}
+
+/// `replace(key)` through `KEY_REPLACEMENT_MEMO`, under `owner`'s entries. Keys
+/// longer than `KEY_REPLACEMENT_MEMO_MAX_KEY_LEN` bypass the memo.
+fn memoized_key_replacement(
+    owner: u64,
+    key: &str,
+    replace: impl FnOnce() -> Option<String>,
+) -> Option<String> {
+    if key.len() > KEY_REPLACEMENT_MEMO_MAX_KEY_LEN {
+        return replace();
+    }
+    let hit = KEY_REPLACEMENT_MEMO.with(|memo| {
+        memo.borrow_mut()
+            .owner_mut(owner)
+            .results
+            .get(key)
+            .map(|result| result.as_deref().map(str::to_owned))
+    });
+    if let Some(result) = hit {
+        return result;
+    }
+    let result = replace();
+    KEY_REPLACEMENT_MEMO.with(|memo| {
+        let mut memo = memo.borrow_mut();
+        let memo = memo.owner_mut(owner);
+        let cost = key.len()
+            + result.as_ref().map_or(0, String::len)
+            + std::mem::size_of::<(Box<str>, Option<Box<str>>)>();
+        if memo.bytes + cost <= KEY_REPLACEMENT_MEMO_BYTES {
+            memo.bytes += cost;
+            memo.results
+                .insert(Box::from(key), result.as_deref().map(Box::from));
+        }
+    });
+    result
+}
+
+/// Lazily-initialized `CompiledReplacements`. Cloning yields an *empty* cache
+/// rather than a copy, so a cloned config that then has its public pattern
+/// lists edited can never see the original's stale compiled forms.
+///
+/// Sharing is opt-in through `shared`: `JSONTools` owns one cache for its
+/// pattern lists (reset by every builder call that edits them) and hands a
+/// shared handle to the `ProcessingConfig` each `execute()` builds. The
+/// patterns are then compiled -- regex lookups, literal lowering, the
+/// `RegexSet` prefilter -- once per configured instance rather than once per
+/// call, and the `KEY_REPLACEMENT_MEMO` owner id stays the same across calls,
+/// so a loop of single-document calls keeps its memoized key replacements
+/// instead of starting each call with a cleared memo.
+#[derive(Debug, Default)]
+pub(crate) struct CompiledCache(Arc<OnceLock<CompiledReplacements>>);
+
+impl Clone for CompiledCache {
+    fn clone(&self) -> Self {
+        Self::default()
+    }
+}
+
+impl CompiledCache {
+    /// A handle to this same cache (where `clone` gives a fresh one).
+    pub(crate) fn shared(&self) -> Self {
+        Self(Arc::clone(&self.0))
+    }
 }
 
 impl ReplacementConfig {
@@ -199,6 +384,130 @@ impl ReplacementConfig {
             value_replacements: SmallVec::new(),
             key_exclusions: SmallVec::new(),
             value_exclusions: SmallVec::new(),
+            compiled: CompiledCache::default(),
+        }
+    }
+
+    /// Every pattern resolved once (parse, literal lowering, regex compile or
+    /// cache lookup) the first time this config is used, rather than once per
+    /// key/value -- see `CompiledPattern`. `ProcessingConfig` (and with it this
+    /// config) is shared by reference across every document and rayon worker in
+    /// a batch, and a config built by `from_json_tools` shares its cache with
+    /// the `JSONTools` instance (see `CompiledCache`), so the `OnceLock` is
+    /// initialized once per configured instance, not once per call.
+    #[inline]
+    fn compiled(&self) -> &CompiledReplacements {
+        self.compiled.0.get_or_init(|| {
+            let compile_replacement = |(find, replace): &(String, String)| {
+                CompiledPattern::compile(find, !replace.contains('$'))
+            };
+            let key_replacements: SmallVec<[CompiledPattern; 2]> = self
+                .key_replacements
+                .iter()
+                .map(compile_replacement)
+                .collect();
+            let key_memo_owner = if key_replacements.iter().any(|p| {
+                matches!(
+                    p,
+                    CompiledPattern::Regex(_) | CompiledPattern::GatedRegex(..)
+                )
+            }) {
+                NEXT_KEY_MEMO_OWNER.fetch_add(1, Ordering::Relaxed)
+            } else {
+                0
+            };
+            let key_prefilter =
+                build_replacement_prefilter(&self.key_replacements, &key_replacements);
+            CompiledReplacements {
+                key_prefilter,
+                key_replacements,
+                value_replacements: self
+                    .value_replacements
+                    .iter()
+                    .map(compile_replacement)
+                    .collect(),
+                key_exclusions: self
+                    .key_exclusions
+                    .iter()
+                    .map(|p| CompiledPattern::compile(p, true))
+                    .collect(),
+                value_exclusions: self
+                    .value_exclusions
+                    .iter()
+                    .map(|p| CompiledPattern::compile(p, true))
+                    .collect(),
+                key_memo_owner,
+                key_replacement_sources: self.key_replacements.clone(),
+                value_replacement_sources: self.value_replacements.clone(),
+                key_exclusion_sources: self.key_exclusions.clone(),
+                value_exclusion_sources: self.value_exclusions.clone(),
+            }
+        })
+    }
+
+    // The four accessors below fall back to the per-call path if a pattern list
+    // no longer matches the copy it was compiled from (the public fields were
+    // edited after first use), so a stale cache can only ever cost speed, not
+    // results.
+
+    /// Apply the key replacements to `s`; `None` if none matched. Long lists are
+    /// prefiltered by one set scan (see `build_replacement_prefilter`), and the
+    /// result is memoized per thread when a pattern needs the regex engine -- see
+    /// `KeyReplacementMemo`.
+    #[inline]
+    pub(crate) fn replace_key(&self, s: &str) -> Option<String> {
+        let compiled = self.compiled();
+        if compiled.key_replacement_sources != self.key_replacements {
+            return apply_replacement_patterns(s, &self.key_replacements);
+        }
+        let replace = || match &compiled.key_prefilter {
+            Some(prefilter) => apply_prefiltered_replacements(
+                s,
+                &self.key_replacements,
+                &compiled.key_replacements,
+                prefilter,
+            ),
+            None => {
+                apply_compiled_replacements(s, &self.key_replacements, &compiled.key_replacements)
+            }
+        };
+        if compiled.key_memo_owner == 0 {
+            replace()
+        } else {
+            memoized_key_replacement(compiled.key_memo_owner, s, replace)
+        }
+    }
+
+    /// Apply the value replacements to `s`; `None` if none matched.
+    #[inline]
+    pub(crate) fn replace_value(&self, s: &str) -> Option<String> {
+        let compiled = self.compiled();
+        if compiled.value_replacement_sources == self.value_replacements {
+            apply_compiled_replacements(s, &self.value_replacements, &compiled.value_replacements)
+        } else {
+            apply_replacement_patterns(s, &self.value_replacements)
+        }
+    }
+
+    /// Whether `s` matches any key exclusion pattern.
+    #[inline]
+    pub(crate) fn excludes_key(&self, s: &str) -> bool {
+        let compiled = self.compiled();
+        if compiled.key_exclusion_sources == self.key_exclusions {
+            matches_any_compiled(s, &self.key_exclusions, &compiled.key_exclusions)
+        } else {
+            matches_any_pattern(s, &self.key_exclusions)
+        }
+    }
+
+    /// Whether `s` matches any value exclusion pattern.
+    #[inline]
+    pub(crate) fn excludes_value(&self, s: &str) -> bool {
+        let compiled = self.compiled();
+        if compiled.value_exclusion_sources == self.value_exclusions {
+            matches_any_compiled(s, &self.value_exclusions, &compiled.value_exclusions)
+        } else {
+            matches_any_pattern(s, &self.value_exclusions)
         }
     }
 
@@ -261,7 +570,7 @@ impl ReplacementConfig {
 
 /// Configuration for date/datetime string detection and UTC normalization, used by
 /// [`TypeConversionConfig`].
-#[derive(Debug, Clone, PartialEq)]
+#[derive(Debug, Clone, PartialEq, Hash)]
 #[non_exhaustive]
 pub struct DateConversionConfig {
     /// Enable date/datetime detection and conversion
@@ -316,7 +625,7 @@ impl DateConversionConfig {
 }
 
 /// Configuration for null-string detection, used by [`TypeConversionConfig`].
-#[derive(Debug, Clone, PartialEq, Default)]
+#[derive(Debug, Clone, PartialEq, Default, Hash)]
 #[non_exhaustive]
 pub struct NullConversionConfig {
     /// Enable null-string detection and conversion
@@ -355,7 +664,7 @@ impl NullConversionConfig {
 }
 
 /// Configuration for boolean-string detection, used by [`TypeConversionConfig`].
-#[derive(Debug, Clone, PartialEq, Default)]
+#[derive(Debug, Clone, PartialEq, Default, Hash)]
 #[non_exhaustive]
 pub struct BooleanConversionConfig {
     /// Enable boolean-string detection and conversion
@@ -411,7 +720,7 @@ impl BooleanConversionConfig {
 /// remaining sub-formats are individually toggleable because each is "opinionated"
 /// (can reinterpret a string that wasn't meant to be a number) in a way plain numeric
 /// parsing isn't.
-#[derive(Debug, Clone, PartialEq)]
+#[derive(Debug, Clone, PartialEq, Hash)]
 #[non_exhaustive]
 pub struct NumberConversionConfig {
     /// Enable numeric-string detection and conversion
@@ -649,6 +958,12 @@ pub struct ProcessingConfig {
     /// Maximum array index allowed during unflattening to prevent DoS via malicious keys
     /// Default: 100,000 (can be overridden with JSON_TOOLS_MAX_ARRAY_INDEX environment variable)
     pub max_array_index: usize,
+    /// Deepest flattened key, in path segments; containers at that depth are emitted
+    /// whole (None = flatten every level). Flatten mode only.
+    pub max_depth: Option<usize>,
+    /// Flattened paths to extract, matched before key transforms; everything else
+    /// is skipped unvisited (empty = keep everything). Flatten mode only.
+    pub selected_paths: SmallVec<[String; 4]>,
 }
 
 impl Default for ProcessingConfig {
@@ -665,6 +980,8 @@ impl Default for ProcessingConfig {
             num_threads: None, // Use system default (number of logical CPUs)
             nested_parallel_threshold: *DEFAULT_NESTED_PARALLEL_THRESHOLD,
             max_array_index: *DEFAULT_MAX_ARRAY_INDEX,
+            max_depth: None,
+            selected_paths: SmallVec::new(),
         }
     }
 }
@@ -43,6 +43,8 @@ pub(crate) struct Config {
     pub(crate) handle_key_collision: Option<bool>,
     #[serde(default)]
     pub(crate) always_array_keys: Vec<String>,
+    #[serde(default)]
+    pub(crate) selected_paths: Vec<String>,
     pub(crate) auto_convert_types: Option<bool>,
     pub(crate) convert_dates: Option<bool>,
     pub(crate) date_conversion_config: Option<DateConversionConfigWire>,
@@ -56,6 +58,8 @@ pub(crate) struct Config {
     pub(crate) num_threads: Option<usize>,
     pub(crate) nested_parallel_threshold: Option<usize>,
     pub(crate) max_array_index: Option<usize>,
+    pub(crate) max_depth: Option<usize>,
+    pub(crate) result_cache: Option<usize>,
 }
 
 /// Per-category customization mirrors of `DateConversionConfig`/etc. -- kept as
@@ -149,6 +153,9 @@ pub(crate) fn build_tools(config_json: &str) -> Result<JSONTools, JsonToolsError
     if !config.always_array_keys.is_empty() {
         tools = tools.always_array_keys(config.always_array_keys);
     }
+    if !config.selected_paths.is_empty() {
+        tools = tools.select_paths(config.selected_paths);
+    }
     if let Some(v) = config.auto_convert_types {
         tools = tools.auto_convert_types(v);
     }
@@ -229,5 +236,11 @@ pub(crate) fn build_tools(config_json: &str) -> Result<JSONTools, JsonToolsError
     if let Some(v) = config.max_array_index {
         tools = tools.max_array_index(v);
     }
+    if let Some(v) = config.max_depth {
+        tools = tools.max_depth(Some(v));
+    }
+    if let Some(v) = config.result_cache {
+        tools = tools.result_cache(v);
+    }
     Ok(tools)
 }
@@ -13,28 +13,36 @@
 use crate::fxhash::FxHashMap;
 use bumpalo::Bump;
 use compact_str::CompactString;
-use memchr::memchr;
+use memchr::{memchr, memchr2};
 use rayon::prelude::*;
 use smallvec::SmallVec;
 use std::borrow::Cow;
+use std::collections::VecDeque;
 use std::ops::Deref;
+use std::sync::Arc;
 
-use crate::config::{ProcessingConfig, TypeConversionMode};
+use crate::config::{FilteringConfig, ProcessingConfig, TypeConversionMode};
 use crate::convert::convert_string_for_mode;
 use crate::error::JsonToolsError;
 use crate::json_parser;
-use crate::transform::{apply_replacement_patterns, matches_any_pattern};
 
 // ================================================================================================
 // SeparatorCache - Cached separator information for operations
 // ================================================================================================
 
 /// Cached separator information for operations with Cow optimization
+///
+/// The default `"."` (and every other one-byte separator) is resolved to its byte once
+/// here, so the per-segment join in `PathBuilder` is a single-byte store into the path
+/// buffer -- no `char` UTF-8 encoding branch and no length-dispatched `memcpy` -- and the
+/// check for "is this the one-byte case" is a single `Option` discriminant test that is
+/// loop-invariant for the whole walk and so predicts perfectly.
 #[derive(Clone)]
 pub(crate) struct SeparatorCache {
     pub(crate) separator: Cow<'static, str>,
-    is_single_char: bool,
-    single_char: Option<char>,
+    /// `Some(byte)` when the separator is a single ASCII byte (always true for a
+    /// one-byte `&str`), else `None`.
+    single_byte: Option<u8>,
 }
 
 impl SeparatorCache {
@@ -56,29 +64,30 @@ impl SeparatorCache {
             _ => Cow::Owned(separator.to_string()),
         };
 
-        let is_single_char = separator.len() == 1;
-        let single_char = if is_single_char {
-            separator.chars().next()
-        } else {
-            None
+        let single_byte = match separator.as_bytes() {
+            [b] => Some(*b),
+            _ => None,
         };
 
         Self {
             separator: separator_cow,
-            is_single_char,
-            single_char,
+            single_byte,
         }
     }
 
-    #[inline]
+    /// Byte length of the separator, for reserving path-buffer space up front.
+    #[inline(always)]
+    pub(crate) fn len(&self) -> usize {
+        self.separator.len()
+    }
+
+    #[inline(always)]
     pub(crate) fn append_to_buffer(&self, buffer: &mut String) {
-        if self.is_single_char {
-            buffer.push(
-                self.single_char
-                    .expect("SeparatorCache: single_char set for single-byte separator"),
-            );
-        } else {
-            buffer.push_str(&self.separator);
+        match self.single_byte {
+            // SAFETY: a one-byte `&str` is a single ASCII byte, so pushing it keeps the
+            // buffer valid UTF-8.
+            Some(byte) => unsafe { buffer.as_mut_vec().push(byte) },
+            None => buffer.push_str(&self.separator),
         }
     }
 }
@@ -276,13 +285,15 @@ struct CollectedEntry<'a, K> {
 
 /// Abstracts how `CollectingWalker` materializes an owned key from the path buffer and
 /// applies lowercase/key-replacement transforms. Lets the sequential (single-document)
-/// and nested-parallel code paths share all the tape-walking logic (`walk_object`,
-/// `walk_array`, `emit_string_value`, etc.) while using different backing storage for
+/// and nested-parallel code paths share all the tape-walking logic (`walk_tape`,
+/// `emit_string_value`, etc.) while using different backing storage for
 /// the key itself -- see `CompactKeyBuilder` and `BumpKeyBuilder`.
 trait KeyBuilder {
     type Key: Deref<Target = str>;
 
-    fn build(&self, path: &str, config: &ProcessingConfig) -> Self::Key;
+    /// `lowercase` is false when the path buffer already folded the key (see
+    /// `FastStreamingPathBuilder::lowercase`), even if `config.lowercase_keys` is set.
+    fn build(&self, path: &str, lowercase: bool, config: &ProcessingConfig) -> Self::Key;
 }
 
 /// Default key storage: `CompactString` (inlines keys up to 24 bytes). Used by the
@@ -299,15 +310,13 @@ impl KeyBuilder for CompactKeyBuilder {
     type Key = CompactString;
 
     #[inline]
-    fn build(&self, path: &str, config: &ProcessingConfig) -> CompactString {
+    fn build(&self, path: &str, lowercase: bool, config: &ProcessingConfig) -> CompactString {
         let mut key = CompactString::from(path);
-        if config.lowercase_keys {
+        if lowercase {
             key.make_ascii_lowercase();
         }
         if config.replacements.has_key_replacements() {
-            if let Some(new_key) =
-                apply_replacement_patterns(&key, &config.replacements.key_replacements)
-            {
+            if let Some(new_key) = config.replacements.replace_key(&key) {
                 key = CompactString::from(new_key);
             }
         }
@@ -330,15 +339,13 @@ impl<'bump> KeyBuilder for BumpKeyBuilder<'bump> {
     type Key = &'bump str;
 
     #[inline]
-    fn build(&self, path: &str, config: &ProcessingConfig) -> &'bump str {
+    fn build(&self, path: &str, lowercase: bool, config: &ProcessingConfig) -> &'bump str {
         let mut key = bumpalo::collections::String::from_str_in(path, self.bump);
-        if config.lowercase_keys {
+        if lowercase {
             key.make_ascii_lowercase();
         }
         if config.replacements.has_key_replacements() {
-            if let Some(new_key) =
-                apply_replacement_patterns(&key, &config.replacements.key_replacements)
-            {
+            if let Some(new_key) = config.replacements.replace_key(&key) {
                 key = bumpalo::collections::String::from_str_in(&new_key, self.bump);
             }
         }
@@ -383,14 +390,57 @@ static BYTE_LUT: [u8; 256] = build_byte_lut();
 // Merges structural scan, validation, container pairing, string length
 // computation, and scalar detection into a single forward pass.
 
+/// A scanned tape: the index overlay every walker (flatten, unflatten, normal mode)
+/// reads instead of a `serde_json::Value` tree. Derefs to `[TapeEntry]`.
+///
+/// The tape is the one allocation per document that scales with node count (~1 entry
+/// per 3 input bytes, 8 bytes each), so it is recycled the same way as
+/// `FastStreamingPathBuilder`'s path buffer: dropping a `Tape` parks its cleared `Vec`
+/// in `TAPE_SCRATCH`, and the next `scan_and_fixup` on the same thread reuses it --
+/// a batch of similar documents on one rayon worker stops re-allocating (and
+/// re-growing) a tape per document.
+pub(crate) struct Tape {
+    entries: Vec<TapeEntry>,
+}
+
+/// A parked tape with more entries than this (8 MiB) is freed instead, so one huge
+/// document can't pin its tape's memory to the thread for the rest of the process.
+const TAPE_SCRATCH_MAX_ENTRIES: usize = 1 << 20;
+
+thread_local! {
+    /// The entry buffer of the last `Tape` dropped on this thread (empty if none).
+    static TAPE_SCRATCH: std::cell::Cell<Vec<TapeEntry>> = const { std::cell::Cell::new(Vec::new()) };
+}
+
+impl Deref for Tape {
+    type Target = [TapeEntry];
+
+    #[inline(always)]
+    fn deref(&self) -> &[TapeEntry] {
+        &self.entries
+    }
+}
+
+impl Drop for Tape {
+    fn drop(&mut self) {
+        if self.entries.capacity() <= TAPE_SCRATCH_MAX_ENTRIES {
+            let mut entries = std::mem::take(&mut self.entries);
+            entries.clear();
+            TAPE_SCRATCH.set(entries);
+        }
+    }
+}
+
 /// Scan JSON input and produce a fully-fixed-up tape in a single pass.
 /// Container pairs are resolved, string lengths are computed, scalars
 /// after colons/commas/array-starts are detected, and depth is validated.
 /// String entries include the "has_escape" flag (bit 23 of aux) for zero-cost
 /// escape detection during the walk phase.
-pub(crate) fn scan_and_fixup(input: &[u8]) -> Result<Vec<TapeEntry>, JsonToolsError> {
-    // Heuristic: ~1 structural char per 3 bytes of JSON
-    let mut tape = Vec::with_capacity(input.len() / 3);
+pub(crate) fn scan_and_fixup(input: &[u8]) -> Result<Tape, JsonToolsError> {
+    // Heuristic: ~1 structural char per 3 bytes of JSON. `reserve` on the recycled
+    // buffer only allocates when it is smaller than this document needs.
+    let mut tape = TAPE_SCRATCH.take();
+    tape.reserve(input.len() / 3);
     // Stack for container pairing (stores tape indices)
     let mut stack: SmallVec<[u32; 32]> = SmallVec::new();
     let len = input.len();
@@ -413,41 +463,36 @@ pub(crate) fn scan_and_fixup(input: &[u8]) -> Result<Vec<TapeEntry>, JsonToolsEr
                 pos += 1; // skip opening quote
                 let content_start = pos;
 
-                // Find closing quote using memchr (SIMD-accelerated). This loop only
-                // needs to distinguish a real closing quote from an escaped one (`\"`)
-                // to find the correct boundary -- it does NOT determine has_escape
-                // (see below for why a separate pass is needed for that).
+                // One SIMD pass over the string body: `memchr2` stops at the first
+                // quote *or* backslash. A quote reached this way is always the
+                // closing one (every escaped quote is consumed together with its
+                // backslash below), and any backslash at all means the string needs
+                // unescaping -- a JSON string can only contain one as part of an
+                // escape sequence -- so `has_escape` falls out of the same scan.
+                // This replaces a `memchr(b'"')` search (plus a backward backslash
+                // count at every candidate quote) followed by a second full
+                // `memchr(b'\\')` pass over the content just to set the flag.
+                let mut has_escape = false;
                 loop {
-                    match memchr(b'"', unsafe { input.get_unchecked(pos..len) }) {
-                        Some(offset) => {
+                    match memchr2(b'"', b'\\', unsafe { input.get_unchecked(pos..len) }) {
+                        Some(offset) if unsafe { *input.get_unchecked(pos + offset) } == b'"' => {
                             let candidate = pos + offset;
-                            // Count preceding backslashes
-                            let bs = count_trailing_backslashes_fast(input, candidate);
-                            if bs & 1 == 0 {
-                                // Even backslashes → unescaped closing quote
-                                let content_len = candidate - content_start;
-                                // has_escape must cover every escape type (\n, \t, \r, \uXXXX,
-                                // \/, \b, \f, \\, \"), not just escaped quotes -- a JSON string
-                                // can only contain a backslash as part of a valid escape
-                                // sequence, so "any backslash in the content" is exactly
-                                // equivalent to "needs unescaping". Checking backslash-runs
-                                // only immediately before a matched quote (the old approach)
-                                // missed every escape that isn't adjacent to a quote, e.g. a
-                                // plain "\n" or "\t" alone in the string.
-                                let has_escape = memchr(b'\\', unsafe {
-                                    input.get_unchecked(content_start..candidate)
-                                })
-                                .is_some();
-                                let mut aux = content_len as u32;
-                                if has_escape {
-                                    aux |= STRING_HAS_ESCAPE_BIT;
-                                }
-                                tape.push(TapeEntry::new(str_start, EntryKind::StringStart, aux));
-                                pos = candidate + 1; // skip closing quote
-                                break;
+                            let content_len = candidate - content_start;
+                            let mut aux = content_len as u32;
+                            if has_escape {
+                                aux |= STRING_HAS_ESCAPE_BIT;
                             }
-                            // Odd backslashes → escaped quote, keep scanning
-                            pos = candidate + 1;
+                            tape.push(TapeEntry::new(str_start, EntryKind::StringStart, aux));
+                            pos = candidate + 1; // skip closing quote
+                            break;
+                        }
+                        Some(offset) => {
+                            // Backslash: skip it and the byte it escapes (for `\uXXXX`
+                            // the hex digits are ordinary bytes and need no special
+                            // handling). Clamped so a trailing lone backslash falls
+                            // through to the unterminated-string error.
+                            has_escape = true;
+                            pos = (pos + offset + 2).min(len);
                         }
                         None => {
                             return Err(JsonToolsError::invalid_json_structure(
@@ -530,7 +575,7 @@ pub(crate) fn scan_and_fixup(input: &[u8]) -> Result<Vec<TapeEntry>, JsonToolsEr
         ));
     }
 
-    Ok(tape)
+    Ok(Tape { entries: tape })
 }
 
 /// Check if the next non-whitespace byte is a scalar and emit a ScalarStart entry.
@@ -615,21 +660,6 @@ fn validate_json_scalar(bytes: &[u8]) -> Result<(), JsonToolsError> {
     }
 }
 
-/// Count trailing backslashes before `pos`. Uses a tight loop (typically 0-1 iterations).
-#[inline(always)]
-fn count_trailing_backslashes_fast(input: &[u8], pos: usize) -> usize {
-    let mut count = 0;
-    let mut p = pos;
-    while p > 0 {
-        p -= 1;
-        if unsafe { *input.get_unchecked(p) } != b'\\' {
-            break;
-        }
-        count += 1;
-    }
-    count
-}
-
 // ================================================================================================
 // IntBuf — stack-allocated integer formatter (replaces itoa crate)
 // ================================================================================================
@@ -666,19 +696,60 @@ impl IntBuf {
 
 /// Incremental key path builder for flattening.
 /// Maintains a string buffer and a stack of byte positions for O(1) push/pop.
+///
+/// Within a document the buffer is already a single scratch area (each segment is
+/// appended on entry and truncated away on exit), so no key costs an allocation of
+/// its own. The buffer itself is recycled across documents too: dropping a builder
+/// parks its (cleared) buffer in `PATH_SCRATCH`, and the next builder on the same
+/// thread picks it up -- a batch of N documents on one rayon worker allocates one
+/// path buffer, not N.
+///
+/// With `lowercase` set, every appended segment (and its separator) is ASCII-folded
+/// as it is written, so the buffer always holds the already-lowercased path. Keys
+/// read from it need no folding of their own: each segment is folded once when
+/// pushed, instead of the whole path being re-folded for every leaf beneath it.
 struct FastStreamingPathBuilder {
     buffer: String,
     stack: SmallVec<[usize; 16]>,
     itoa_buf: IntBuf,
+    lowercase: bool,
+}
+
+/// Initial path buffer capacity -- comfortably covers typical dotted paths.
+const PATH_BUFFER_CAPACITY: usize = 256;
+
+/// A parked buffer bigger than this (some pathological multi-kilobyte path) is
+/// freed instead, so one odd document can't pin that memory to the thread.
+const PATH_SCRATCH_MAX_CAPACITY: usize = 64 * 1024;
+
+thread_local! {
+    /// The path buffer of the last `FastStreamingPathBuilder` dropped on this thread.
+    /// Empty when none is parked (or when another builder on this thread holds it).
+    static PATH_SCRATCH: std::cell::Cell<String> = const { std::cell::Cell::new(String::new()) };
 }
 
 impl FastStreamingPathBuilder {
     #[inline]
     fn new() -> Self {
+        let mut buffer = PATH_SCRATCH.take();
+        if buffer.capacity() == 0 {
+            buffer.reserve(PATH_BUFFER_CAPACITY);
+        }
         Self {
-            buffer: String::with_capacity(256),
+            buffer,
             stack: SmallVec::new(),
             itoa_buf: IntBuf::new(),
+            lowercase: false,
+        }
+    }
+
+    /// ASCII-lowercase everything appended since `start` -- see `lowercase`. A
+    /// separator is folded along with its segment, matching the old per-key
+    /// `make_ascii_lowercase` over the whole path byte for byte.
+    #[inline(always)]
+    fn fold_appended(&mut self, start: usize) {
+        if self.lowercase {
+            self.buffer[start..].make_ascii_lowercase();
         }
     }
 
@@ -694,20 +765,35 @@ impl FastStreamingPathBuilder {
         }
     }
 
+    /// Number of path segments currently pushed.
+    #[inline(always)]
+    fn depth(&self) -> usize {
+        self.stack.len()
+    }
+
+    /// Appends `separator` (unless this is the first segment) followed by `key`, reserving
+    /// for both at once so the two writes share a single capacity check.
     #[inline(always)]
     fn append_key_raw(&mut self, key: &str, separator: &SeparatorCache) {
+        let start = self.buffer.len();
         if !self.buffer.is_empty() {
+            self.buffer.reserve(separator.len() + key.len());
             separator.append_to_buffer(&mut self.buffer);
         }
         self.buffer.push_str(key);
+        self.fold_appended(start);
     }
 
     #[inline(always)]
     fn append_index(&mut self, index: usize, separator: &SeparatorCache) {
+        let start = self.buffer.len();
+        let digits = self.itoa_buf.format(index);
         if !self.buffer.is_empty() {
+            self.buffer.reserve(separator.len() + digits.len());
             separator.append_to_buffer(&mut self.buffer);
         }
-        self.buffer.push_str(self.itoa_buf.format(index));
+        self.buffer.push_str(digits);
+        self.fold_appended(start);
     }
 
     #[inline(always)]
@@ -716,6 +802,16 @@ impl FastStreamingPathBuilder {
     }
 }
 
+impl Drop for FastStreamingPathBuilder {
+    fn drop(&mut self) {
+        if self.buffer.capacity() <= PATH_SCRATCH_MAX_CAPACITY {
+            let mut buffer = std::mem::take(&mut self.buffer);
+            buffer.clear();
+            PATH_SCRATCH.set(buffer);
+        }
+    }
+}
+
 // ================================================================================================
 // Direct-to-Output Walker (Fast Path)
 // ================================================================================================
@@ -762,106 +858,11 @@ impl<'a> DirectWalker<'a> {
         self.output
     }
 
-    #[inline(always)]
+    /// Walk the value at `idx` (and, for a container, its whole subtree) under the
+    /// current path. Returns the tape index just past it. See `walk_tape`.
+    #[inline]
     fn walk_value(&mut self, idx: usize) -> usize {
-        if idx >= self.tape.len() {
-            return idx;
-        }
-        let entry = tape_entry(self.tape, idx);
-        match entry.kind() {
-            EntryKind::ObjectStart => self.walk_object(idx),
-            EntryKind::ArrayStart => self.walk_array(idx),
-            EntryKind::StringStart => {
-                self.emit_string_value(idx);
-                idx + 1
-            }
-            EntryKind::ScalarStart => {
-                self.emit_scalar_value(idx);
-                idx + 1
-            }
-            _ => idx + 1,
-        }
-    }
-
-    fn walk_object(&mut self, start_idx: usize) -> usize {
-        let end_idx = self.tape[start_idx].aux() as usize;
-
-        // Empty object check
-        if tape_is_empty_object(self.tape, start_idx) {
-            if !self.config.filtering.remove_empty_objects {
-                self.write_value_raw(b"{}");
-            }
-            return end_idx + 1;
-        }
-
-        let mut cursor = start_idx + 1;
-        while cursor < end_idx {
-            let entry = tape_entry(self.tape, cursor);
-            if entry.kind() == EntryKind::StringStart {
-                let key_str = tape_content_str(self.input, entry);
-
-                self.path.push_level();
-                // `key_str` is the raw source slice, already valid JSON-escaped content --
-                // DirectWalker never applies key transforms (that's CollectingWalker's job),
-                // so the logical (unescaped) value is never needed here. Previously this
-                // unescaped the key when it had escapes but never re-escaped it before
-                // writing to output (append_key_raw's buffer becomes the output key
-                // directly, unescaped), producing invalid JSON for any key containing an
-                // escaped quote/backslash/control char. Using the raw slice unconditionally
-                // fixes that and skips an unnecessary allocation.
-                self.path.append_key_raw(key_str, &self.separator);
-
-                cursor += 1; // skip key StringStart
-                if cursor < end_idx {
-                    let next = tape_entry(self.tape, cursor);
-                    if next.kind() == EntryKind::Colon {
-                        cursor += 1;
-                    }
-                }
-                if self.config.replacements.has_key_exclusions()
-                    && matches_any_pattern(
-                        self.path.as_str(),
-                        &self.config.replacements.key_exclusions,
-                    )
-                {
-                    cursor = skip_tape_value(self.tape, cursor);
-                } else {
-                    cursor = self.walk_value(cursor);
-                }
-                self.path.pop_level();
-            } else {
-                cursor += 1;
-            }
-        }
-        end_idx + 1
-    }
-
-    fn walk_array(&mut self, start_idx: usize) -> usize {
-        let end_idx = self.tape[start_idx].aux() as usize;
-
-        if tape_is_empty_array(self.tape, start_idx) {
-            if !self.config.filtering.remove_empty_arrays {
-                self.write_value_raw(b"[]");
-            }
-            return end_idx + 1;
-        }
-
-        let mut cursor = start_idx + 1;
-        let mut index: usize = 0;
-
-        while cursor < end_idx {
-            let entry = tape_entry(self.tape, cursor);
-            if entry.kind() == EntryKind::Comma {
-                cursor += 1;
-                continue;
-            }
-            self.path.push_level();
-            self.path.append_index(index, &self.separator);
-            cursor = self.walk_value(cursor);
-            self.path.pop_level();
-            index += 1;
-        }
-        end_idx + 1
+        walk_tape(self, idx)
     }
 
     #[inline(always)]
@@ -893,10 +894,7 @@ impl<'a> DirectWalker<'a> {
 
             // Value replacement
             if has_value_replacements {
-                if let Some(replaced) = apply_replacement_patterns(
-                    unescaped.as_ref(),
-                    &self.config.replacements.value_replacements,
-                ) {
+                if let Some(replaced) = self.config.replacements.replace_value(unescaped.as_ref()) {
                     if self.config.filtering.remove_empty_strings && replaced.is_empty() {
                         return;
                     }
@@ -914,10 +912,7 @@ impl<'a> DirectWalker<'a> {
                                 return;
                             }
                             if has_value_exclusions
-                                && matches_any_pattern(
-                                    &converted,
-                                    &self.config.replacements.value_exclusions,
-                                )
+                                && self.config.replacements.excludes_value(&converted)
                             {
                                 return;
                             }
@@ -925,12 +920,7 @@ impl<'a> DirectWalker<'a> {
                             return;
                         }
                     }
-                    if has_value_exclusions
-                        && matches_any_pattern(
-                            &replaced,
-                            &self.config.replacements.value_exclusions,
-                        )
-                    {
+                    if has_value_exclusions && self.config.replacements.excludes_value(&replaced) {
                         return;
                     }
                     // Write as owned string value
@@ -950,12 +940,7 @@ impl<'a> DirectWalker<'a> {
                     if self.config.filtering.remove_nulls && converted == "null" {
                         return;
                     }
-                    if has_value_exclusions
-                        && matches_any_pattern(
-                            &converted,
-                            &self.config.replacements.value_exclusions,
-                        )
-                    {
+                    if has_value_exclusions && self.config.replacements.excludes_value(&converted) {
                         return;
                     }
                     self.write_leaf_json_fragment(&converted);
@@ -965,12 +950,7 @@ impl<'a> DirectWalker<'a> {
 
             // Neither replacement nor conversion applied -- check the raw (unescaped)
             // value before falling through to zero-copy.
-            if has_value_exclusions
-                && matches_any_pattern(
-                    unescaped.as_ref(),
-                    &self.config.replacements.value_exclusions,
-                )
-            {
+            if has_value_exclusions && self.config.replacements.excludes_value(unescaped.as_ref()) {
                 return;
             }
         }
@@ -993,7 +973,7 @@ impl<'a> DirectWalker<'a> {
         if self.config.replacements.has_value_exclusions() {
             // SAFETY: JSON scalars (numbers/true/false/null) are always ASCII/UTF-8.
             let s = unsafe { std::str::from_utf8_unchecked(trimmed) };
-            if matches_any_pattern(s, &self.config.replacements.value_exclusions) {
+            if self.config.replacements.excludes_value(s) {
                 return;
             }
         }
@@ -1057,6 +1037,406 @@ impl<'a> DirectWalker<'a> {
     }
 }
 
+// ================================================================================================
+// Iterative Tape Walk (shared by DirectWalker and CollectingWalker)
+// ================================================================================================
+//
+// Both flatten walkers used to descend the tape by mutual recursion (`walk_value` ->
+// `walk_object`/`walk_array` -> `walk_value`), one native stack frame per nesting level.
+// `walk_tape` runs the same traversal as a loop over an explicit `SmallVec` of open
+// containers instead: inline for the first 32 levels (so typical documents never touch
+// the heap for it), no call/return per level, and no native stack growth at all for
+// pathologically deep input. The path itself was already arena-style -- one reusable
+// `FastStreamingPathBuilder` buffer with save/restore lengths per level -- so every
+// push/pop of a frame here is paired with exactly one `push_level`/`pop_level` there.
+
+/// Per-walker hooks for `walk_tape`: the only parts of the traversal the direct and
+/// collecting walkers do differently (how an object key enters the path, and where
+/// leaves go).
+trait TapeVisitor<'a> {
+    fn input(&self) -> &'a [u8];
+    fn tape(&self) -> &'a [TapeEntry];
+    fn config(&self) -> &'a ProcessingConfig;
+    fn path(&mut self) -> &mut FastStreamingPathBuilder;
+    /// Append object key `entry` (a `StringStart`) to the path after a `push_level`.
+    fn push_key(&mut self, entry: TapeEntry);
+    /// Append array index `index` to the path after a `push_level`.
+    fn push_index(&mut self, index: usize);
+    fn visit_string(&mut self, idx: usize);
+    fn visit_scalar(&mut self, idx: usize);
+    /// Emit a verbatim JSON value: an empty container (`{}` / `[]`) that survived
+    /// filtering, or an already-compact whole container (see `visit_container`).
+    fn visit_raw(&mut self, raw: &'a [u8]);
+    /// Emit a whole container that `minify_json_value` had to rewrite.
+    fn visit_owned(&mut self, value: String);
+
+    /// Emit a whole container -- cut off by `max_depth`, or selected by
+    /// `select_paths` -- in compact form, like every other value the engine
+    /// writes. Its source text may be pretty-printed; copying it verbatim would
+    /// put the input's whitespace and newlines inside the flattened output, and
+    /// make a `str` input render differently from the same document as a dict.
+    #[inline]
+    fn visit_container(&mut self, raw: &'a [u8]) {
+        match minify_json_value(raw) {
+            Cow::Borrowed(compact) => self.visit_raw(compact.as_bytes()),
+            Cow::Owned(compact) => self.visit_owned(compact),
+        }
+    }
+}
+
+/// How a path relates to `ProcessingConfig::selected_paths`.
+#[derive(Clone, Copy, PartialEq, Eq)]
+enum PathSelection {
+    /// Neither selected nor on the way to a selected path: skip the value unvisited.
+    Skip,
+    /// A proper prefix of a selected path: walk a container, drop a leaf.
+    Prefix,
+    /// Selected: emit the value, a container whole.
+    Exact,
+}
+
+/// Classify `path` against the selected paths. A linear scan -- callers name a
+/// handful of paths, the same reasoning as `always_array_keys`' `SmallVec` -- and
+/// `Exact` wins when one selected path is itself a prefix of another.
+#[inline]
+fn select_path(selected: &[String], path: &str, separator: &str) -> PathSelection {
+    if path.is_empty() {
+        return PathSelection::Prefix;
+    }
+    let mut selection = PathSelection::Skip;
+    for candidate in selected {
+        if let Some(rest) = candidate.strip_prefix(path) {
+            if rest.is_empty() {
+                return PathSelection::Exact;
+            }
+            if rest.starts_with(separator) {
+                selection = PathSelection::Prefix;
+            }
+        }
+    }
+    selection
+}
+
+/// One open object or array on `walk_tape`'s explicit stack.
+#[derive(Clone, Copy)]
+struct WalkFrame {
+    /// Tape index of the container's matching end entry.
+    end_idx: usize,
+    /// Next array index to assign (unused for objects).
+    next_index: usize,
+    is_array: bool,
+}
+
+/// Whether the child value at tape index `idx` is dropped outright by the
+/// filtering flags: an empty object or array under `remove_empty_objects` /
+/// `remove_empty_arrays`, or a literal `null` under `remove_nulls` (both walkers
+/// drop a raw `null` before any other value processing). Lets `walk_tape` skip
+/// such a child before building its path segment at all -- the key would only
+/// be appended (unescaped, lowercased, matched against exclusions and selections)
+/// to be popped again without anything being emitted under it.
+#[inline(always)]
+fn tape_value_is_pruned(
+    input: &[u8],
+    tape: &[TapeEntry],
+    idx: usize,
+    filtering: &FilteringConfig,
+) -> bool {
+    if idx >= tape.len() {
+        return false;
+    }
+    let entry = tape_entry(tape, idx);
+    match entry.kind() {
+        EntryKind::ObjectStart => filtering.remove_empty_objects && tape_is_empty_object(tape, idx),
+        EntryKind::ArrayStart => filtering.remove_empty_arrays && tape_is_empty_array(tape, idx),
+        EntryKind::ScalarStart => {
+            filtering.remove_nulls && trim_ascii(tape_scalar_bytes(input, entry)) == b"null"
+        }
+        _ => false,
+    }
+}
+
+/// Walk the value at tape index `root` -- a leaf, or a container and its whole
+/// subtree -- under the visitor's current path, returning the index just past it.
+/// The root itself gets no path segment (callers set that up, exactly as they did
+/// around the old recursive `walk_value`); every descendant gets one per level.
+fn walk_tape<'a, V: TapeVisitor<'a>>(v: &mut V, root: usize) -> usize {
+    let tape = v.tape();
+    let input = v.input();
+    let config = v.config();
+    let has_key_exclusions = config.replacements.has_key_exclusions();
+    let filtering = &config.filtering;
+    let prunes_children =
+        filtering.remove_nulls || filtering.remove_empty_objects || filtering.remove_empty_arrays;
+    // `None` walks every level; with `Some`, a non-empty container whose path is
+    // already that many segments deep is emitted as its source text, unvisited.
+    let max_depth = config.max_depth.unwrap_or(usize::MAX);
+    // With `select_paths`, the selection of the value at `cursor`: checked as each key
+    // or index is pushed, so unselected subtrees are skipped before being entered.
+    // `None` when every path is wanted.
+    let selected = config.selected_paths.as_slice();
+    let separator = config.separator.as_str();
+    let mut selection =
+        (!selected.is_empty()).then(|| select_path(selected, v.path().as_str(), separator));
+    if selection == Some(PathSelection::Skip) {
+        return skip_tape_value(tape, root);
+    }
+    let mut frames: SmallVec<[WalkFrame; 32]> = SmallVec::new();
+    let mut cursor = root;
+
+    loop {
+        // Visit the value at `cursor`: leaves are emitted in place, a non-empty
+        // container opens a frame whose children the advance loop below feeds back here.
+        let mut opened = false;
+        if cursor < tape.len() {
+            let entry = tape_entry(tape, cursor);
+            match entry.kind() {
+                kind @ (EntryKind::ObjectStart | EntryKind::ArrayStart) => {
+                    let is_array = kind == EntryKind::ArrayStart;
+                    let end_idx = entry.aux() as usize;
+                    let empty = if is_array {
+                        tape_is_empty_array(tape, cursor)
+                    } else {
+                        tape_is_empty_object(tape, cursor)
+                    };
+                    let too_deep = v.path().depth() >= max_depth;
+                    if selection == Some(PathSelection::Prefix) && (empty || too_deep) {
+                        // Nothing selected is inside an empty container, and a selected
+                        // path below `max_depth` can't be reached.
+                        cursor = end_idx + 1;
+                    } else if is_array && empty {
+                        if !config.filtering.remove_empty_arrays {
+                            v.visit_raw(b"[]");
+                        }
+                        cursor = end_idx + 1;
+                    } else if empty {
+                        if !config.filtering.remove_empty_objects {
+                            v.visit_raw(b"{}");
+                        }
+                        cursor = end_idx + 1;
+                    } else if too_deep || selection == Some(PathSelection::Exact) {
+                        let end = tape_entry(tape, end_idx).offset();
+                        v.visit_container(&input[entry.offset()..=end]);
+                        cursor = end_idx + 1;
+                    } else {
+                        frames.push(WalkFrame {
+                            end_idx,
+                            next_index: 0,
+                            is_array,
+                        });
+                        cursor += 1;
+                        opened = true;
+                    }
+                }
+                // A leaf on the way to a selected path isn't selected itself.
+                EntryKind::StringStart | EntryKind::ScalarStart
+                    if selection == Some(PathSelection::Prefix) =>
+                {
+                    cursor += 1;
+                }
+                EntryKind::StringStart => {
+                    v.visit_string(cursor);
+                    cursor += 1;
+                }
+                EntryKind::ScalarStart => {
+                    v.visit_scalar(cursor);
+                    cursor += 1;
+                }
+                _ => cursor += 1,
+            }
+        }
+        if !opened {
+            if frames.is_empty() {
+                return cursor; // the root was a leaf
+            }
+            v.path().pop_level(); // the leaf was a child of the innermost frame
+        }
+
+        // Advance to the next child of the innermost open container, closing every
+        // container that runs out of children on the way.
+        loop {
+            let Some(frame) = frames.last_mut() else {
+                return cursor;
+            };
+            let end_idx = frame.end_idx;
+            if cursor >= end_idx {
+                frames.pop();
+                cursor = end_idx + 1;
+                if frames.is_empty() {
+                    return cursor; // closed the root container
+                }
+                v.path().pop_level(); // the closed container was itself a child
+                continue;
+            }
+
+            let entry = tape_entry(tape, cursor);
+            if frame.is_array {
+                if entry.kind() == EntryKind::Comma {
+                    cursor += 1;
+                    continue;
+                }
+                let index = frame.next_index;
+                frame.next_index += 1;
+                // A pruned element still consumes its index, as it always has.
+                if prunes_children && tape_value_is_pruned(input, tape, cursor, filtering) {
+                    cursor = skip_tape_value(tape, cursor);
+                    continue;
+                }
+                v.path().push_level();
+                v.push_index(index);
+            } else {
+                if entry.kind() != EntryKind::StringStart {
+                    cursor += 1;
+                    continue;
+                }
+                let mut value_idx = cursor + 1; // skip key StringStart
+                if value_idx < end_idx && tape_entry(tape, value_idx).kind() == EntryKind::Colon {
+                    value_idx += 1;
+                }
+                if prunes_children && tape_value_is_pruned(input, tape, value_idx, filtering) {
+                    cursor = skip_tape_value(tape, value_idx);
+                    continue;
+                }
+                v.path().push_level();
+                v.push_key(entry);
+                cursor = value_idx;
+                if has_key_exclusions && config.replacements.excludes_key(v.path().as_str()) {
+                    cursor = skip_tape_value(tape, cursor);
+                    v.path().pop_level();
+                    continue;
+                }
+            }
+
+            if selection.is_some() {
+                let child = select_path(selected, v.path().as_str(), separator);
+                if child == PathSelection::Skip {
+                    cursor = skip_tape_value(tape, cursor);
+                    v.path().pop_level();
+                    continue;
+                }
+                selection = Some(child);
+            }
+            break;
+        }
+    }
+}
+
+impl<'a> TapeVisitor<'a> for DirectWalker<'a> {
+    #[inline(always)]
+    fn input(&self) -> &'a [u8] {
+        self.input
+    }
+
+    #[inline(always)]
+    fn tape(&self) -> &'a [TapeEntry] {
+        self.tape
+    }
+
+    #[inline(always)]
+    fn config(&self) -> &'a ProcessingConfig {
+        self.config
+    }
+
+    #[inline(always)]
+    fn path(&mut self) -> &mut FastStreamingPathBuilder {
+        &mut self.path
+    }
+
+    #[inline(always)]
+    fn push_key(&mut self, entry: TapeEntry) {
+        // The raw source slice is already valid JSON-escaped content -- DirectWalker
+        // never applies key transforms (that's CollectingWalker's job), so the logical
+        // (unescaped) value is never needed here, and the path buffer becomes the output
+        // key directly. Unescaping here would produce invalid JSON for any key
+        // containing an escaped quote/backslash/control char.
+        let key_str = tape_content_str(self.input, entry);
+        self.path.append_key_raw(key_str, &self.separator);
+    }
+
+    #[inline(always)]
+    fn push_index(&mut self, index: usize) {
+        self.path.append_index(index, &self.separator);
+    }
+
+    #[inline(always)]
+    fn visit_string(&mut self, idx: usize) {
+        self.emit_string_value(idx);
+    }
+
+    #[inline(always)]
+    fn visit_scalar(&mut self, idx: usize) {
+        self.emit_scalar_value(idx);
+    }
+
+    #[inline(always)]
+    fn visit_raw(&mut self, raw: &'a [u8]) {
+        self.write_value_raw(raw);
+    }
+
+    #[inline]
+    fn visit_owned(&mut self, value: String) {
+        self.write_value_raw(value.as_bytes());
+    }
+}
+
+impl<'a, KB: KeyBuilder> TapeVisitor<'a> for CollectingWalker<'a, KB> {
+    #[inline(always)]
+    fn input(&self) -> &'a [u8] {
+        self.input
+    }
+
+    #[inline(always)]
+    fn tape(&self) -> &'a [TapeEntry] {
+        self.tape
+    }
+
+    #[inline(always)]
+    fn config(&self) -> &'a ProcessingConfig {
+        self.config
+    }
+
+    #[inline(always)]
+    fn path(&mut self) -> &mut FastStreamingPathBuilder {
+        &mut self.path
+    }
+
+    #[inline(always)]
+    fn push_key(&mut self, entry: TapeEntry) {
+        let key_str = tape_content_str(self.input, entry);
+        if entry.string_has_escapes() {
+            let unescaped = unescape_json_string(key_str);
+            self.path
+                .append_key_raw(unescaped.as_ref(), &self.separator);
+        } else {
+            self.path.append_key_raw(key_str, &self.separator);
+        }
+    }
+
+    #[inline(always)]
+    fn push_index(&mut self, index: usize) {
+        self.path.append_index(index, &self.separator);
+    }
+
+    #[inline(always)]
+    fn visit_string(&mut self, idx: usize) {
+        self.emit_string_value(idx);
+    }
+
+    #[inline(always)]
+    fn visit_scalar(&mut self, idx: usize) {
+        self.emit_scalar_value(idx);
+    }
+
+    #[inline(always)]
+    fn visit_raw(&mut self, raw: &'a [u8]) {
+        self.collect_value(ValueRef::Raw(raw));
+    }
+
+    #[inline]
+    fn visit_owned(&mut self, value: String) {
+        self.collect_value(ValueRef::Owned(CompactString::from(value)));
+    }
+}
+
 // ================================================================================================
 // Collecting Walker (Slow Path — for key transforms / collision handling)
 // ================================================================================================
@@ -1084,10 +1464,17 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
         capacity: usize,
         key_builder: KB,
     ) -> Self {
+        let mut path = FastStreamingPathBuilder::new();
+        // Fold keys as their segments are pushed -- unless a selection or a key
+        // exclusion is being matched against the path, which must see the original,
+        // unfolded keys.
+        path.lowercase = config.lowercase_keys
+            && config.selected_paths.is_empty()
+            && !config.replacements.has_key_exclusions();
         Self {
             input,
             tape,
-            path: FastStreamingPathBuilder::new(),
+            path,
             separator,
             config,
             key_builder,
@@ -1095,103 +1482,11 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
         }
     }
 
-    #[inline(always)]
+    /// Walk the value at `idx` (and, for a container, its whole subtree) under the
+    /// current path. Returns the tape index just past it. See `walk_tape`.
+    #[inline]
     fn walk_value(&mut self, idx: usize) -> usize {
-        if idx >= self.tape.len() {
-            return idx;
-        }
-        let entry = tape_entry(self.tape, idx);
-        match entry.kind() {
-            EntryKind::ObjectStart => self.walk_object(idx),
-            EntryKind::ArrayStart => self.walk_array(idx),
-            EntryKind::StringStart => {
-                self.emit_string_value(idx);
-                idx + 1
-            }
-            EntryKind::ScalarStart => {
-                self.emit_scalar_value(idx);
-                idx + 1
-            }
-            _ => idx + 1,
-        }
-    }
-
-    fn walk_object(&mut self, start_idx: usize) -> usize {
-        let end_idx = self.tape[start_idx].aux() as usize;
-
-        if tape_is_empty_object(self.tape, start_idx) {
-            if !self.config.filtering.remove_empty_objects {
-                self.collect_value(ValueRef::Raw(b"{}"));
-            }
-            return end_idx + 1;
-        }
-
-        let mut cursor = start_idx + 1;
-        while cursor < end_idx {
-            let entry = tape_entry(self.tape, cursor);
-            if entry.kind() == EntryKind::StringStart {
-                let key_str = tape_content_str(self.input, entry);
-
-                self.path.push_level();
-                if entry.string_has_escapes() {
-                    let unescaped = unescape_json_string(key_str);
-                    self.path
-                        .append_key_raw(unescaped.as_ref(), &self.separator);
-                } else {
-                    self.path.append_key_raw(key_str, &self.separator);
-                }
-
-                cursor += 1;
-                if cursor < end_idx {
-                    let next = tape_entry(self.tape, cursor);
-                    if next.kind() == EntryKind::Colon {
-                        cursor += 1;
-                    }
-                }
-                if self.config.replacements.has_key_exclusions()
-                    && matches_any_pattern(
-                        self.path.as_str(),
-                        &self.config.replacements.key_exclusions,
-                    )
-                {
-                    cursor = skip_tape_value(self.tape, cursor);
-                } else {
-                    cursor = self.walk_value(cursor);
-                }
-                self.path.pop_level();
-            } else {
-                cursor += 1;
-            }
-        }
-        end_idx + 1
-    }
-
-    fn walk_array(&mut self, start_idx: usize) -> usize {
-        let end_idx = self.tape[start_idx].aux() as usize;
-
-        if tape_is_empty_array(self.tape, start_idx) {
-            if !self.config.filtering.remove_empty_arrays {
-                self.collect_value(ValueRef::Raw(b"[]"));
-            }
-            return end_idx + 1;
-        }
-
-        let mut cursor = start_idx + 1;
-        let mut index: usize = 0;
-
-        while cursor < end_idx {
-            let entry = tape_entry(self.tape, cursor);
-            if entry.kind() == EntryKind::Comma {
-                cursor += 1;
-                continue;
-            }
-            self.path.push_level();
-            self.path.append_index(index, &self.separator);
-            cursor = self.walk_value(cursor);
-            self.path.pop_level();
-            index += 1;
-        }
-        end_idx + 1
+        walk_tape(self, idx)
     }
 
     #[inline(always)]
@@ -1221,10 +1516,7 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
             };
 
             if has_value_replacements {
-                if let Some(replaced) = apply_replacement_patterns(
-                    unescaped.as_ref(),
-                    &self.config.replacements.value_replacements,
-                ) {
+                if let Some(replaced) = self.config.replacements.replace_value(unescaped.as_ref()) {
                     if self.config.filtering.remove_empty_strings && replaced.is_empty() {
                         return;
                     }
@@ -1240,10 +1532,7 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
                                 return;
                             }
                             if has_value_exclusions
-                                && matches_any_pattern(
-                                    &converted,
-                                    &self.config.replacements.value_exclusions,
-                                )
+                                && self.config.replacements.excludes_value(&converted)
                             {
                                 return;
                             }
@@ -1251,12 +1540,7 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
                             return;
                         }
                     }
-                    if has_value_exclusions
-                        && matches_any_pattern(
-                            &replaced,
-                            &self.config.replacements.value_exclusions,
-                        )
-                    {
+                    if has_value_exclusions && self.config.replacements.excludes_value(&replaced) {
                         return;
                     }
                     let escaped = escape_json_string(&replaced);
@@ -1278,12 +1562,7 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
                     if self.config.filtering.remove_nulls && *converted == *"null" {
                         return;
                     }
-                    if has_value_exclusions
-                        && matches_any_pattern(
-                            &converted,
-                            &self.config.replacements.value_exclusions,
-                        )
-                    {
+                    if has_value_exclusions && self.config.replacements.excludes_value(&converted) {
                         return;
                     }
                     self.collect_value(ValueRef::Owned(CompactString::from(converted)));
@@ -1293,12 +1572,7 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
 
             // Neither replacement nor conversion applied -- check the raw (unescaped)
             // value before falling through to zero-copy.
-            if has_value_exclusions
-                && matches_any_pattern(
-                    unescaped.as_ref(),
-                    &self.config.replacements.value_exclusions,
-                )
-            {
+            if has_value_exclusions && self.config.replacements.excludes_value(unescaped.as_ref()) {
                 return;
             }
         }
@@ -1317,7 +1591,7 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
         if self.config.replacements.has_value_exclusions() {
             // SAFETY: JSON scalars (numbers/true/false/null) are always ASCII/UTF-8.
             let s = unsafe { std::str::from_utf8_unchecked(trimmed) };
-            if matches_any_pattern(s, &self.config.replacements.value_exclusions) {
+            if self.config.replacements.excludes_value(s) {
                 return;
             }
         }
@@ -1327,7 +1601,11 @@ impl<'a, KB: KeyBuilder> CollectingWalker<'a, KB> {
     /// Apply key transforms and collect a value entry.
     #[inline]
     fn collect_value(&mut self, value: ValueRef<'a>) {
-        let key = self.key_builder.build(self.path.as_str(), self.config);
+        let key = self.key_builder.build(
+            self.path.as_str(),
+            self.config.lowercase_keys && !self.path.lowercase,
+            self.config,
+        );
         self.entries.push(CollectedEntry { key, value });
     }
 }
@@ -1513,7 +1791,7 @@ fn write_value_ref(output: &mut String, value: &ValueRef<'_>) {
 }
 
 /// Lookup table: `true` for bytes that need JSON escaping (0x00-0x1F, `"`, `\`).
-/// Fits in 4 cache lines (256 bytes). Used by `write_json_escaped_key` and `escape_json_string`.
+/// Fits in 4 cache lines (256 bytes). Used for the sub-word tail of `find_json_escape`.
 static NEEDS_JSON_ESCAPE: [bool; 256] = {
     let mut table = [false; 256];
     // Control characters 0x00-0x1F
@@ -1527,59 +1805,84 @@ static NEEDS_JSON_ESCAPE: [bool; 256] = {
     table
 };
 
-/// Check if a byte slice contains any characters that need JSON escaping.
-#[inline(always)]
-fn needs_json_escape(bytes: &[u8]) -> bool {
-    bytes.iter().any(|&b| NEEDS_JSON_ESCAPE[b as usize])
+/// Index of the first byte in `bytes` that needs JSON escaping, if any.
+///
+/// Scans a 64-bit word (8 bytes) per step with SWAR bit tricks instead of one LUT
+/// lookup per byte: for each word, `(x - 0x20..) & !x` flags bytes below 0x20, and
+/// the same zero-byte test on `x ^ 0x22..`/`x ^ 0x5C..` flags `"` and `\`. A borrow
+/// can only set spurious flags *above* a genuinely flagged byte, so the lowest flag
+/// (little-endian load, `trailing_zeros`) is always exact. Portable (no target
+/// feature detection, no `unsafe`) and auto-vectorization friendly; the common case
+/// -- a clean key or value -- becomes one word compare per 8 bytes followed by a
+/// single bulk copy.
+#[inline]
+fn find_json_escape(bytes: &[u8]) -> Option<usize> {
+    const LO: u64 = 0x0101_0101_0101_0101;
+    const HI: u64 = 0x8080_8080_8080_8080;
+    let mut chunks = bytes.chunks_exact(8);
+    let mut offset = 0;
+    for chunk in &mut chunks {
+        let x = u64::from_le_bytes(chunk.try_into().unwrap());
+        let quote = x ^ (LO * b'"' as u64);
+        let backslash = x ^ (LO * b'\\' as u64);
+        let flags = ((x.wrapping_sub(LO * 0x20) & !x)
+            | (quote.wrapping_sub(LO) & !quote)
+            | (backslash.wrapping_sub(LO) & !backslash))
+            & HI;
+        if flags != 0 {
+            return Some(offset + (flags.trailing_zeros() / 8) as usize);
+        }
+        offset += 8;
+    }
+    chunks
+        .remainder()
+        .iter()
+        .position(|&b| NEEDS_JSON_ESCAPE[b as usize])
+        .map(|i| offset + i)
 }
 
-/// Write a JSON-escaped key to the output.
-/// Fast path: if key needs no escaping, write directly.
-#[inline(always)]
-pub(crate) fn write_json_escaped_key(output: &mut String, key: &str) {
-    let bytes = key.as_bytes();
-    // Fast path: single-pass LUT check (replaces memchr2 + sequential control-char scan)
-    if !needs_json_escape(bytes) {
-        output.push_str(key);
-        return;
-    }
-
-    // Slow path: bulk-copy each run of plain (non-escape) bytes between special bytes,
-    // instead of pushing every byte individually. `_ => output.push(b as char)` on a
-    // per-byte basis is wrong for non-ASCII input: a multi-byte UTF-8 continuation/lead
-    // byte re-encoded alone as its own `char` corrupts the character (e.g. "café" with
-    // an embedded quote elsewhere would mangle to "cafÃ©"). All bytes the LUT marks as
-    // needing escaping are ASCII (control chars, `"`, `\`), so `i` only ever stops at
-    // UTF-8 character boundaries -- safe to slice at.
+/// Write `s` JSON-escaped to `output`, given `first`, the index of its first byte
+/// that needs escaping (from `find_json_escape`).
+///
+/// Bulk-copies each run of plain (non-escape) bytes between special bytes, instead of
+/// pushing every byte individually. `_ => output.push(b as char)` on a per-byte basis
+/// is wrong for non-ASCII input: a multi-byte UTF-8 continuation/lead byte re-encoded
+/// alone as its own `char` corrupts the character (e.g. "café" with an embedded quote
+/// elsewhere would mangle to "cafÃ©"). Every byte that needs escaping is ASCII
+/// (control chars, `"`, `\`), so each run boundary is a UTF-8 character boundary --
+/// safe to slice at.
+fn write_json_escaped_from(output: &mut String, s: &str, first: usize) {
+    let bytes = s.as_bytes();
     let mut run_start = 0;
-    let mut i = 0;
-    while i < bytes.len() {
-        let b = bytes[i];
-        if NEEDS_JSON_ESCAPE[b as usize] {
-            if run_start < i {
-                output.push_str(&key[run_start..i]);
+    let mut next = Some(first);
+    while let Some(i) = next {
+        output.push_str(&s[run_start..i]);
+        match bytes[i] {
+            b'"' => output.push_str("\\\""),
+            b'\\' => output.push_str("\\\\"),
+            b'\n' => output.push_str("\\n"),
+            b'\r' => output.push_str("\\r"),
+            b'\t' => output.push_str("\\t"),
+            b => {
+                let hex = b"0123456789abcdef";
+                output.push_str("\\u00");
+                output.push(hex[(b >> 4) as usize] as char);
+                output.push(hex[(b & 0x0F) as usize] as char);
             }
-            match b {
-                b'"' => output.push_str("\\\""),
-                b'\\' => output.push_str("\\\\"),
-                b'\n' => output.push_str("\\n"),
-                b'\r' => output.push_str("\\r"),
-                b'\t' => output.push_str("\\t"),
-                _ => {
-                    let hex = b"0123456789abcdef";
-                    output.push_str("\\u00");
-                    output.push(hex[(b >> 4) as usize] as char);
-                    output.push(hex[(b & 0x0F) as usize] as char);
-                }
-            }
-            i += 1;
-            run_start = i;
-        } else {
-            i += 1;
         }
+        run_start = i + 1;
+        next = find_json_escape(&bytes[run_start..]).map(|rel| run_start + rel);
     }
-    if run_start < bytes.len() {
-        output.push_str(&key[run_start..]);
+    output.push_str(&s[run_start..]);
+}
+
+/// Write a JSON-escaped key to the output.
+/// Fast path: if key needs no escaping, write directly.
+#[inline(always)]
+pub(crate) fn write_json_escaped_key(output: &mut String, key: &str) {
+    match find_json_escape(key.as_bytes()) {
+        None => output.push_str(key),
+        Some(first) => write_json_escaped_from(output, key, first),
     }
 }
 
@@ -1686,46 +1989,14 @@ pub(crate) fn unescape_json_string(s: &str) -> Cow<'_, str> {
 /// Escape a string for JSON output.
 #[inline]
 pub(crate) fn escape_json_string(s: &str) -> Cow<'_, str> {
-    let bytes = s.as_bytes();
-    if !needs_json_escape(bytes) {
-        return Cow::Borrowed(s);
-    }
-
-    // Bulk-copy each run of plain (non-escape) bytes between special bytes -- see
-    // `write_json_escaped_key`'s doc comment for why per-byte `push(b as char)` is
-    // wrong for non-ASCII input (corrupts multi-byte UTF-8 sequences).
-    let mut result = String::with_capacity(s.len() + 8);
-    let mut run_start = 0;
-    let mut i = 0;
-    while i < bytes.len() {
-        let b = bytes[i];
-        if NEEDS_JSON_ESCAPE[b as usize] {
-            if run_start < i {
-                result.push_str(&s[run_start..i]);
-            }
-            match b {
-                b'"' => result.push_str("\\\""),
-                b'\\' => result.push_str("\\\\"),
-                b'\n' => result.push_str("\\n"),
-                b'\r' => result.push_str("\\r"),
-                b'\t' => result.push_str("\\t"),
-                _ => {
-                    let hex = b"0123456789abcdef";
-                    result.push_str("\\u00");
-                    result.push(hex[(b >> 4) as usize] as char);
-                    result.push(hex[(b & 0x0F) as usize] as char);
-                }
-            }
-            i += 1;
-            run_start = i;
-        } else {
-            i += 1;
+    match find_json_escape(s.as_bytes()) {
+        None => Cow::Borrowed(s),
+        Some(first) => {
+            let mut result = String::with_capacity(s.len() + 8);
+            write_json_escaped_from(&mut result, s, first);
+            Cow::Owned(result)
         }
     }
-    if run_start < bytes.len() {
-        result.push_str(&s[run_start..]);
-    }
-    Cow::Owned(result)
 }
 
 /// Trim ASCII whitespace from both ends of a byte slice.
@@ -1752,6 +2023,83 @@ pub(crate) fn trim_ascii(bytes: &[u8]) -> &[u8] {
     unsafe { bytes.get_unchecked(start..end) }
 }
 
+/// Drop the insignificant whitespace from `raw`, one complete JSON value already
+/// validated by the scanner, leaving strings byte-for-byte. Borrowed when there is
+/// none to drop (machine-written input), so the common case costs one pass and no
+/// allocation; otherwise one copy with the whitespace runs cut out.
+pub(crate) fn minify_json_value(raw: &[u8]) -> Cow<'_, str> {
+    let mut compact: Option<Vec<u8>> = None;
+    let mut copied = 0;
+    let mut pos = 0;
+    while pos < raw.len() {
+        match raw[pos] {
+            b'"' => {
+                // Step over the string body: stop at its closing quote, skipping
+                // each escaped character.
+                pos += 1;
+                loop {
+                    match memchr2(b'"', b'\\', &raw[pos..]) {
+                        Some(offset) if raw[pos + offset] == b'\\' => {
+                            pos = (pos + offset + 2).min(raw.len())
+                        }
+                        Some(offset) => {
+                            pos += offset + 1;
+                            break;
+                        }
+                        None => {
+                            pos = raw.len();
+                            break;
+                        }
+                    }
+                }
+            }
+            b' ' | b'\t' | b'\n' | b'\r' => {
+                let buf = compact.get_or_insert_with(|| Vec::with_capacity(raw.len()));
+                buf.extend_from_slice(&raw[copied..pos]);
+                while pos < raw.len() && matches!(raw[pos], b' ' | b'\t' | b'\n' | b'\r') {
+                    pos += 1;
+                }
+                copied = pos;
+            }
+            _ => pos += 1,
+        }
+    }
+    // SAFETY: `raw` is valid UTF-8 (a slice of a `&str` cut on token boundaries),
+    // and only whole ASCII whitespace bytes are removed from it.
+    match compact {
+        None => Cow::Borrowed(unsafe { std::str::from_utf8_unchecked(raw) }),
+        Some(mut buf) => {
+            buf.extend_from_slice(&raw[copied..]);
+            Cow::Owned(unsafe { String::from_utf8_unchecked(buf) })
+        }
+    }
+}
+
+/// Number of flattened entries the tape produces when nothing is filtered or cut
+/// off by `max_depth`: every string and scalar that isn't an object key, plus every
+/// empty `{}`/`[]` (emitted as a value of its own). An exact upper bound on
+/// `CollectingWalker`'s output, so its entry `Vec` can be sized once instead of
+/// growing by doubling -- the old `tape.len() / 4` guess was off by 2x or more for
+/// array-heavy documents (`[1,2,3]` is 7 tape entries, 3 leaves). One linear pass
+/// over 8-byte entries, small next to the key building it sizes.
+pub(crate) fn count_tape_leaves(tape: &[TapeEntry]) -> usize {
+    let mut values = 0usize;
+    let mut keys = 0usize;
+    for (idx, entry) in tape.iter().enumerate() {
+        match entry.kind() {
+            EntryKind::StringStart | EntryKind::ScalarStart => values += 1,
+            EntryKind::Colon => keys += 1,
+            EntryKind::ObjectEnd | EntryKind::ArrayEnd if entry.aux() as usize + 1 == idx => {
+                values += 1
+            }
+            _ => {}
+        }
+    }
+    // Saturating: the scanner checks bracket pairing, not grammar, so a stray `:`
+    // without a key must not underflow.
+    values.saturating_sub(keys)
+}
+
 // ================================================================================================
 // Parallelism Support
 // ================================================================================================
@@ -1866,6 +2214,38 @@ fn collect_child_ranges(tape: &[TapeEntry]) -> Vec<(usize, usize, usize)> {
     ranges
 }
 
+/// Walk one top-level child of the root -- a `(key_idx, val_idx, array_index)` triple
+/// from `collect_child_ranges` -- under a fresh path, collecting its entries into
+/// `walker`. Shared by the nested-parallel path and `FlattenIter`, which both split a
+/// document at its top level. The child's own key is checked against the key
+/// exclusions here: `walk_tape` only checks the keys it pushes itself, so a walk
+/// started at the child's value would otherwise emit an excluded top-level key.
+fn walk_top_level_child<KB: KeyBuilder>(
+    walker: &mut CollectingWalker<'_, KB>,
+    (key_idx, val_idx, arr_idx): (usize, usize, usize),
+    is_root_object: bool,
+) {
+    // Reset path (reuse buffer allocation)
+    walker.path.buffer.clear();
+    walker.path.stack.clear();
+    walker.path.push_level();
+    if is_root_object {
+        let key_entry = tape_entry(walker.tape, key_idx);
+        walker.push_key(key_entry);
+        let config = walker.config;
+        if config.replacements.has_key_exclusions()
+            && config.replacements.excludes_key(walker.path.as_str())
+        {
+            walker.path.pop_level();
+            return;
+        }
+    } else {
+        walker.push_index(arr_idx);
+    }
+    walker.walk_value(val_idx);
+    walker.path.pop_level();
+}
+
 // ================================================================================================
 // Parallel Flatten (Collecting Path)
 // ================================================================================================
@@ -1902,33 +2282,8 @@ fn flatten_collecting_parallel<'a>(
                     CompactKeyBuilder,
                 );
 
-                for &(key_idx, val_idx, arr_idx) in range_chunk {
-                    // Reset path (reuse buffer allocation)
-                    walker.path.buffer.clear();
-                    walker.path.stack.clear();
-
-                    if is_root_object {
-                        // Extract key from tape
-                        let key_entry = tape[key_idx];
-                        let key_offset = key_entry.offset() + 1;
-                        let key_len = key_entry.string_content_len();
-                        let key_bytes = &input[key_offset..key_offset + key_len];
-                        let key_str = unsafe { std::str::from_utf8_unchecked(key_bytes) };
-
-                        walker.path.push_level();
-                        if key_entry.string_has_escapes() {
-                            let key = unescape_json_string(key_str);
-                            walker.path.append_key_raw(key.as_ref(), &walker.separator);
-                        } else {
-                            walker.path.append_key_raw(key_str, &walker.separator);
-                        }
-                    } else {
-                        walker.path.push_level();
-                        walker.path.append_index(arr_idx, &walker.separator);
-                    }
-
-                    walker.walk_value(val_idx);
-                    walker.path.pop_level();
+                for &child in range_chunk {
+                    walk_top_level_child(&mut walker, child, is_root_object);
                 }
 
                 walker.entries
@@ -1967,6 +2322,10 @@ fn needs_collecting_path(config: &ProcessingConfig) -> bool {
         || config.replacements.has_key_replacements()
         || config.collision.has_collision_handling()
         || config.collision.has_always_array_keys()
+        // Selection is matched against unescaped key paths, which only the collecting
+        // walker builds -- and with most of the document skipped, there are few keys
+        // left to collect anyway.
+        || !config.selected_paths.is_empty()
 }
 
 /// Core flattening logic for a single JSON string.
@@ -2014,9 +2373,7 @@ pub(crate) fn process_single_json(
 
             // Value replacement
             if has_value_replacements {
-                if let Some(replaced) =
-                    apply_replacement_patterns(&s, &config.replacements.value_replacements)
-                {
+                if let Some(replaced) = config.replacements.replace_value(&s) {
                     // Also try type-converting the replaced value, so a replacement
                     // producing a recognized token (null/number/date/etc.) is still
                     // converted -- matches emit_string_value's composable order.
@@ -2078,8 +2435,7 @@ pub(crate) fn process_single_json(
     let separator = SeparatorCache::new(&config.separator);
 
     if needs_collecting_path(config) {
-        // Slow path: collect entries, then resolve collisions
-        let leaf_estimate = tape.len() / 4;
+        // Slow path: collect entries, then resolve collisions.
         let child_count = count_top_level_children(&tape);
 
         if child_count > config.nested_parallel_threshold {
@@ -2099,6 +2455,14 @@ pub(crate) fn process_single_json(
             // this call: dropped once `resolve_and_write` has produced the final owned
             // output String, which is the only thing that needs to outlive it.
             let bump = Bump::new();
+            // With a selection, each selected path names one value, emitted as one
+            // entry (a container whole), so the path count bounds the output without
+            // a pass over the tape to count leaves.
+            let leaf_estimate = if config.selected_paths.is_empty() {
+                count_tape_leaves(&tape)
+            } else {
+                config.selected_paths.len()
+            };
             let mut walker = CollectingWalker::new(
                 input,
                 &tape,
@@ -2121,3 +2485,160 @@ pub(crate) fn process_single_json(
         Ok(walker.finish())
     }
 }
+
+// ================================================================================================
+// Streaming Flatten
+// ================================================================================================
+
+/// Iterator over the flattened `(key, value)` pairs of one document, produced as the
+/// tape is walked instead of being collected into one output string first (see
+/// `JSONTools::iter_flatten`). Each value is JSON text: a quoted string, a number,
+/// `true`/`false`/`null`, or `{}`/`[]`/a whole container cut off by `max_depth`.
+///
+/// The document is scanned once up front (so malformed input fails at construction,
+/// not halfway through iteration) and then walked one top-level child at a time:
+/// only that child's pairs are ever buffered, so a root array of a million records
+/// holds one record's pairs at a time rather than the whole flattened result. A
+/// single enormous top-level value is still buffered whole -- the unit of work is
+/// the same top-level split the nested-parallel path uses.
+///
+/// Pairs come out in document order with every key transform applied, but nothing
+/// is resolved across pairs: a key repeated in the input (or made equal to another
+/// by a key transform) is yielded each time it occurs, where `execute()` would keep
+/// the last. For the same reason `handle_key_collision` and `always_array_keys`,
+/// which need every value of a key at once, are rejected.
+pub struct FlattenIter {
+    input: String,
+    tape: Tape,
+    config: Arc<ProcessingConfig>,
+    /// Tape index of the next top-level child to walk.
+    cursor: usize,
+    /// Tape index of the root's closing entry (0 for an empty root).
+    end_idx: usize,
+    /// Index of the next element when the root is an array.
+    next_index: usize,
+    is_root_object: bool,
+    /// Pairs of the last walked child not yet handed out.
+    pending: VecDeque<(CompactString, CompactString)>,
+}
+
+impl FlattenIter {
+    /// Scan `input` and prepare to walk it. The root must be an object or array;
+    /// `config` comes from `JSONTools::iter_flatten_config`, which has already
+    /// rejected the settings this can't honor.
+    pub(crate) fn new(
+        input: String,
+        config: Arc<ProcessingConfig>,
+    ) -> Result<Self, JsonToolsError> {
+        if input.len() > u32::MAX as usize {
+            return Err(JsonToolsError::input_validation_error(
+                "Input exceeds 4 GiB limit",
+            ));
+        }
+        match trim_ascii(input.as_bytes()).first() {
+            None => return Err(JsonToolsError::input_validation_error("Empty JSON input")),
+            Some(b'{' | b'[') => {}
+            Some(_) => {
+                return Err(JsonToolsError::invalid_json_structure(
+                    "iter_flatten expects a JSON object or array at the root",
+                ))
+            }
+        }
+        let tape = scan_and_fixup(input.as_bytes())?;
+        let (end_idx, is_root_object) = match tape.first() {
+            Some(root) => (root.aux() as usize, root.kind() == EntryKind::ObjectStart),
+            None => (0, false),
+        };
+        Ok(Self {
+            input,
+            tape,
+            config,
+            cursor: 1,
+            end_idx,
+            next_index: 0,
+            is_root_object,
+            pending: VecDeque::new(),
+        })
+    }
+
+    /// The next pair, with the key and value still in the `CompactString`s the walker
+    /// built (the Python binding converts straight from these). `Iterator::next` is
+    /// this plus a conversion to `String`.
+    pub(crate) fn next_pair(&mut self) -> Option<(CompactString, CompactString)> {
+        while self.pending.is_empty() {
+            let child = self.next_child()?;
+            let mut walker = CollectingWalker::new(
+                self.input.as_bytes(),
+                &self.tape,
+                &self.config,
+                SeparatorCache::new(&self.config.separator),
+                0,
+                CompactKeyBuilder,
+            );
+            walk_top_level_child(&mut walker, child, self.is_root_object);
+            self.pending.extend(walker.entries.into_iter().map(|entry| {
+                let value = match entry.value {
+                    // SAFETY: raw values are slices of `input`, a `String`, cut on
+                    // JSON token boundaries.
+                    ValueRef::Raw(raw) => {
+                        CompactString::from(unsafe { std::str::from_utf8_unchecked(raw) })
+                    }
+                    ValueRef::Owned(value) => value,
+                };
+                (entry.key, value)
+            }));
+        }
+        self.pending.pop_front()
+    }
+
+    /// Advance past the next top-level child and return its `collect_child_ranges`
+    /// triple, or `None` once the root is exhausted.
+    fn next_child(&mut self) -> Option<(usize, usize, usize)> {
+        let tape: &[TapeEntry] = &self.tape;
+        while self.cursor < self.end_idx {
+            let entry = tape_entry(tape, self.cursor);
+            if self.is_root_object {
+                if entry.kind() != EntryKind::StringStart {
+                    self.cursor += 1;
+                    continue;
+                }
+                let key_idx = self.cursor;
+                let mut val_idx = key_idx + 1;
+                if val_idx < self.end_idx && tape_entry(tape, val_idx).kind() == EntryKind::Colon {
+                    val_idx += 1;
+                }
+                self.cursor = skip_tape_value(tape, val_idx);
+                return Some((key_idx, val_idx, 0));
+            }
+            if entry.kind() == EntryKind::Comma {
+                self.cursor += 1;
+                continue;
+            }
+            let val_idx = self.cursor;
+            self.cursor = skip_tape_value(tape, val_idx);
+            let index = self.next_index;
+            self.next_index += 1;
+            return Some((usize::MAX, val_idx, index));
+        }
+        None
+    }
+}
+
+impl Iterator for FlattenIter {
+    type Item = (String, String);
+
+    fn next(&mut self) -> Option<(String, String)> {
+        self.next_pair()
+            .map(|(key, value)| (key.into_string(), value.into_string()))
+    }
+}
+
+impl std::fmt::Debug for FlattenIter {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("FlattenIter")
+            .field("cursor", &self.cursor)
+            .field("end_idx", &self.end_idx)
+            .field("pending", &self.pending.len())
+            .finish_non_exhaustive()
+    }
+}
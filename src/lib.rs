@@ -454,6 +454,7 @@ mod error;
 pub(crate) mod flatten;
 pub(crate) mod fxhash;
 pub(crate) mod json_parser;
+mod schema;
 pub(crate) mod transform;
 mod types;
 pub(crate) mod unflatten;
@@ -475,4 +476,7 @@ pub use config::{
     TypeConversionConfig,
 };
 pub use error::JsonToolsError;
+pub use flatten::FlattenIter;
+pub use schema::CompiledSchema;
+pub use transform::compact;
 pub use types::{JsonInput, JsonOutput};
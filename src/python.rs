@@ -12,14 +12,16 @@ use pyo3::prelude::*;
 #[cfg(feature = "python")]
 use pyo3::sync::PyOnceLock;
 #[cfg(feature = "python")]
-use pyo3::types::{PyBytes, PyDict, PyList, PyModule, PyString};
+use pyo3::types::{PyBytes, PyDict, PyIterator, PyList, PyModule, PyString};
 
 #[cfg(feature = "python")]
 use std::borrow::Cow;
 #[cfg(feature = "python")]
+use std::collections::hash_map::Entry;
+#[cfg(feature = "python")]
 use std::mem;
 #[cfg(feature = "python")]
-use std::sync::Mutex;
+use std::sync::{RwLock, RwLockReadGuard, RwLockWriteGuard};
 
 #[cfg(feature = "python")]
 use indexmap::{IndexMap, IndexSet};
@@ -35,7 +37,11 @@ use arrow_schema::{DataType, Field, Schema};
 #[cfg(feature = "python")]
 use compact_str::CompactString;
 #[cfg(feature = "python")]
-use pyo3_arrow::{PyChunkedArray, PyTable};
+use pyo3_arrow::{PyArray, PyChunkedArray, PyTable};
+#[cfg(feature = "python")]
+use rayon::prelude::*;
+#[cfg(feature = "python")]
+use smallvec::SmallVec;
 #[cfg(feature = "python")]
 use std::sync::Arc;
 
@@ -48,8 +54,8 @@ use crate::convert::convert_string_for_mode;
 #[cfg(feature = "python")]
 use crate::flatten::{escape_json_string, unescape_json_string, write_json_escaped_key};
 #[cfg(feature = "python")]
-use crate::transform::{apply_replacement_patterns, matches_any_pattern};
-use crate::{JSONTools, JsonOutput};
+use crate::fxhash::FxHashMap;
+use crate::{CompiledSchema, FlattenIter, JSONTools, JsonInput, JsonOutput};
 
 #[cfg(feature = "python")]
 pyo3::create_exception!(
@@ -59,12 +65,25 @@ pyo3::create_exception!(
     "Python exception for JSON Tools operations"
 );
 
-/// Lock the inner config mutex, converting poison errors to Python exceptions.
+/// Lock the inner config for writing (builder methods), converting poison errors
+/// to Python exceptions.
 #[cfg(feature = "python")]
 #[inline]
-fn lock_config(mutex: &Mutex<JSONTools>) -> PyResult<std::sync::MutexGuard<'_, JSONTools>> {
-    mutex
-        .lock()
+fn lock_config(lock: &RwLock<JSONTools>) -> PyResult<RwLockWriteGuard<'_, JSONTools>> {
+    lock.write()
+        .map_err(|e| PyRuntimeError::new_err(format!("internal config lock poisoned: {e}")))
+}
+
+/// Lock the inner config for reading, converting poison errors to Python
+/// exceptions. Every execute path only reads the config (`JSONTools::execute`
+/// takes `&self`), so it holds a shared lock for the whole GIL-released run:
+/// threads calling `execute` on one shared instance process in parallel
+/// instead of queueing behind each other, and only a builder call (a write)
+/// waits for in-flight calls to finish.
+#[cfg(feature = "python")]
+#[inline]
+fn read_config(lock: &RwLock<JSONTools>) -> PyResult<RwLockReadGuard<'_, JSONTools>> {
+    lock.read()
         .map_err(|e| PyRuntimeError::new_err(format!("internal config lock poisoned: {e}")))
 }
 
@@ -208,6 +227,12 @@ fn may_contain_big_int(s: &[u8]) -> bool {
 /// Documents that may contain integers beyond 64-bit range always take the
 /// stdlib path: orjson parses those as lossy floats with no error to hook a
 /// fallback on, and this library guarantees integer precision end-to-end.
+///
+/// orjson is handed the result as `bytes` rather than `str`: building a
+/// `PyString` from a Rust `&str` scans every byte to pick the compact
+/// Unicode kind and (for non-ASCII text) widens the buffer, only for orjson
+/// to ask for the UTF-8 form straight back. `PyBytes::new` is a plain
+/// memcpy, and orjson validates UTF-8 once during its own parse.
 #[cfg(feature = "python")]
 #[inline]
 fn py_loads<'py>(py: Python<'py>, json_str: &str) -> PyResult<Bound<'py, PyAny>> {
@@ -216,7 +241,8 @@ fn py_loads<'py>(py: Python<'py>, json_str: &str) -> PyResult<Bound<'py, PyAny>>
         // On an unexpected orjson failure over our own valid output, fall
         // through to stdlib so its behavior/error surface is what the caller
         // sees, exactly as before the accelerator existed.
-        if let Ok(obj) = callables.loads.bind(py).call1((json_str,)) {
+        let raw = PyBytes::new(py, json_str.as_bytes());
+        if let Ok(obj) = callables.loads.bind(py).call1((raw,)) {
             return Ok(obj);
         }
     }
@@ -348,9 +374,36 @@ impl NormaliseTarget {
 /// Python wrapper for JsonOutput enum
 #[cfg(feature = "python")]
 #[pyclass(name = "JsonOutput", module = "json_tools_rs", frozen, from_py_object)]
-#[derive(Debug, Clone)]
 pub struct PyJsonOutput {
     inner: JsonOutput,
+    /// The result(s) as Python `str` objects, built on the first accessor call
+    /// that needs them (`get_single`, `get_multiple`, `to_python`, `__str__`)
+    /// and handed out again on every later one. Building a `str` copies and
+    /// scans the whole result, so code that checks `is_single` and then calls
+    /// `get_single()`, or calls `to_python()` more than once, used to pay that
+    /// cost on every call. Only the immutable `str` objects are shared: lists
+    /// and dicts are still built fresh per call, so callers mutating a returned
+    /// container never see another call's changes.
+    text: PyOnceLock<Vec<Py<PyString>>>,
+}
+
+/// Clones start with an empty `text` cache: cloning the cached `Py` handles
+/// needs the GIL, which `Clone::clone` cannot ask for, and rebuilding them
+/// on first use is exactly what an uncached output does anyway.
+#[cfg(feature = "python")]
+impl Clone for PyJsonOutput {
+    fn clone(&self) -> Self {
+        Self::from_rust_output(self.inner.clone())
+    }
+}
+
+#[cfg(feature = "python")]
+impl std::fmt::Debug for PyJsonOutput {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        f.debug_struct("PyJsonOutput")
+            .field("inner", &self.inner)
+            .finish_non_exhaustive()
+    }
 }
 
 #[cfg(feature = "python")]
@@ -376,9 +429,12 @@ impl PyJsonOutput {
     /// boundary, matching `to_python()`'s existing zero-extra-copy pattern
     /// (this method's own doc comment above already promises avoiding a
     /// clone; the accessor should keep that promise too).
+    ///
+    /// The `str` is built once and the same object is returned by every later
+    /// call (see the `text` field).
     fn get_single(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
         match &self.inner {
-            JsonOutput::Single(result) => Ok(result.into_pyobject(py)?.into_any().unbind()),
+            JsonOutput::Single(_) => Ok(self.text(py)[0].clone_ref(py).into_any()),
             JsonOutput::Multiple(_) => Err(PyValueError::new_err(
                 "Result contains multiple JSON strings, use get_multiple() instead",
             )),
@@ -395,15 +451,104 @@ impl PyJsonOutput {
             JsonOutput::Single(_) => Err(PyValueError::new_err(
                 "Result contains single JSON string, use get_single() instead",
             )),
-            JsonOutput::Multiple(results) => Ok(results.into_pyobject(py)?.into_any().unbind()),
+            JsonOutput::Multiple(_) => self.text_list(py),
         }
     }
 
     /// Get the result as a Python object (string for single, list for multiple)
     fn to_python(&self, py: Python) -> PyResult<Py<PyAny>> {
         match &self.inner {
-            JsonOutput::Single(result) => Ok(result.into_pyobject(py)?.into_any().unbind()),
-            JsonOutput::Multiple(results) => Ok(results.into_pyobject(py)?.into_any().unbind()),
+            JsonOutput::Single(_) => Ok(self.text(py)[0].clone_ref(py).into_any()),
+            JsonOutput::Multiple(_) => self.text_list(py),
+        }
+    }
+
+    /// Get the result parsed into Python objects (the parsed value for single,
+    /// a list of them for multiple)
+    ///
+    /// A flatten result is always a `dict`, but normal-mode results keep their
+    /// input's root (a list, string or number parses to that type) and so can
+    /// unflatten results, so the value is whatever the JSON parses to.
+    ///
+    /// Callers holding a `JsonOutput` otherwise had to `json.loads()` the
+    /// string they just got back across the FFI boundary. Parsing here goes
+    /// straight from the borrowed Rust result through the cached `py_loads`
+    /// path (orjson, with the same big-int guard and stdlib fallback as the
+    /// dict-in/dict-out `execute` path) with no Python-level round trip, and
+    /// the output is identical to what `execute()` returns for dict input.
+    fn to_dict(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
+        match &self.inner {
+            JsonOutput::Single(result) => Ok(py_loads(py, result)?.unbind()),
+            JsonOutput::Multiple(results) => {
+                let list = PyList::empty(py);
+                for result in results {
+                    list.append(py_loads(py, result)?)?;
+                }
+                Ok(list.into_any().unbind())
+            }
+        }
+    }
+
+    /// Get the single result parsed into a Python object (raises ValueError
+    /// if multiple)
+    ///
+    /// The strict counterpart of `to_dict()`, mirroring `get_single()` vs
+    /// `to_python()`: a caller that knows it ran one document gets the parsed
+    /// value (a `dict` for flatten results, whatever the root parses to
+    /// otherwise) without first matching on the shape, and a shape mismatch is
+    /// an error instead of a silently different return type. Same parse path as
+    /// `to_dict()` -- orjson reads the borrowed Rust buffer directly and builds
+    /// the dict itself, including its own cache of short (<= 64 byte) key
+    /// strings, so the repeated flattened keys of a batch share `str` objects
+    /// with no Python-level `json.loads` round trip.
+    fn get_single_dict(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
+        match &self.inner {
+            JsonOutput::Single(result) => Ok(py_loads(py, result)?.unbind()),
+            JsonOutput::Multiple(_) => Err(PyValueError::new_err(
+                "Result contains multiple JSON strings, use get_multiple_dict() instead",
+            )),
+        }
+    }
+
+    /// Get the multiple results parsed into a list of Python objects (raises
+    /// ValueError if single)
+    ///
+    /// See `get_single_dict` -- the strict counterpart of `to_dict()` for a
+    /// batch.
+    fn get_multiple_dict(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
+        match &self.inner {
+            JsonOutput::Single(_) => Err(PyValueError::new_err(
+                "Result contains single JSON string, use get_single_dict() instead",
+            )),
+            JsonOutput::Multiple(results) => {
+                let list = PyList::empty(py);
+                for result in results {
+                    list.append(py_loads(py, result)?)?;
+                }
+                Ok(list.into_any().unbind())
+            }
+        }
+    }
+
+    /// Get the result as UTF-8 `bytes` (bytes for single, list of bytes for
+    /// multiple)
+    ///
+    /// For callers that hand the result straight to `orjson.loads`, a socket
+    /// or a file: `bytes` is a plain copy of the Rust buffer, skipping the
+    /// per-character scan `str` construction does to pick its internal
+    /// representation -- work the consumer would only undo by re-encoding.
+    fn to_bytes(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
+        match &self.inner {
+            JsonOutput::Single(result) => {
+                Ok(PyBytes::new(py, result.as_bytes()).into_any().unbind())
+            }
+            JsonOutput::Multiple(results) => {
+                let list = PyList::empty(py);
+                for result in results {
+                    list.append(PyBytes::new(py, result.as_bytes()))?;
+                }
+                Ok(list.into_any().unbind())
+            }
         }
     }
 
@@ -416,7 +561,7 @@ impl PyJsonOutput {
 
     fn __str__(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
         match &self.inner {
-            JsonOutput::Single(result) => Ok(result.into_pyobject(py)?.into_any().unbind()),
+            JsonOutput::Single(_) => Ok(self.text(py)[0].clone_ref(py).into_any()),
             JsonOutput::Multiple(results) => Ok(format!("{:?}", results)
                 .into_pyobject(py)?
                 .into_any()
@@ -428,7 +573,7 @@ impl PyJsonOutput {
 #[cfg(feature = "python")]
 impl From<JsonOutput> for PyJsonOutput {
     fn from(output: JsonOutput) -> Self {
-        PyJsonOutput { inner: output }
+        Self::from_rust_output(output)
     }
 }
 
@@ -436,10 +581,323 @@ impl From<JsonOutput> for PyJsonOutput {
 impl PyJsonOutput {
     /// Helper method to create PyJsonOutput from Rust JsonOutput
     pub fn from_rust_output(output: JsonOutput) -> Self {
-        PyJsonOutput { inner: output }
+        PyJsonOutput {
+            inner: output,
+            text: PyOnceLock::new(),
+        }
+    }
+
+    /// The result(s) as cached Python `str` objects -- one element for a single
+    /// result, one per document for multiple -- built on first use.
+    fn text(&self, py: Python<'_>) -> &[Py<PyString>] {
+        self.text.get_or_init(py, || match &self.inner {
+            JsonOutput::Single(result) => vec![PyString::new(py, result).unbind()],
+            JsonOutput::Multiple(results) => results
+                .iter()
+                .map(|result| PyString::new(py, result).unbind())
+                .collect(),
+        })
+    }
+
+    /// A new `list` of the cached `str` objects: the strings are shared across
+    /// calls, the list itself never is, so mutating it cannot leak into a later call.
+    fn text_list(&self, py: Python<'_>) -> PyResult<Py<PyAny>> {
+        let list = PyList::new(py, self.text(py).iter().map(|s| s.bind(py)))?;
+        Ok(list.into_any().unbind())
+    }
+}
+
+/// Documents still to be walked by a `FlattenIterator`.
+#[cfg(feature = "python")]
+enum FlattenSource {
+    /// One document, scanned up front by `iter_flatten` itself.
+    Single,
+    /// A list, scanned one document at a time; `next` is the next item to scan.
+    Batch { items: Py<PyList>, next: usize },
+    /// Any other iterable (a generator, a file of lines, ...), pulled one item
+    /// at a time; `next` is the index the next item will get.
+    Stream { items: Py<PyIterator>, next: usize },
+}
+
+/// Python iterator returned by `JSONTools.iter_flatten` -- a thin wrapper around
+/// the Rust `FlattenIter`, converting each pair to Python objects only as it is
+/// asked for. For list or iterable input the documents are scanned lazily too,
+/// one after the previous is exhausted, and each pair carries its document's
+/// index; an iterable is not even advanced until then, so a generator's
+/// documents are produced, flattened and dropped one at a time.
+#[cfg(feature = "python")]
+#[pyclass(name = "FlattenIterator", module = "json_tools_rs")]
+pub struct PyFlattenIterator {
+    config: Arc<ProcessingConfig>,
+    source: FlattenSource,
+    current: Option<FlattenIter>,
+    /// Index (within a list input) of the document `current` walks.
+    doc_idx: usize,
+}
+
+#[cfg(feature = "python")]
+#[pymethods]
+impl PyFlattenIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    /// Next `(key, value)` -- or `(doc_index, key, value)` for list input -- with
+    /// the value converted to its Python type.
+    fn __next__(&mut self, py: Python<'_>) -> PyResult<Option<Py<PyAny>>> {
+        loop {
+            if let Some(iter) = self.current.as_mut() {
+                if let Some((key, value)) = iter.next_pair() {
+                    let key = PyString::new(py, &key);
+                    let value = flat_value_to_py(py, &value)?;
+                    let item = match self.source {
+                        FlattenSource::Single => (key, value).into_pyobject(py)?.into_any(),
+                        FlattenSource::Batch { .. } | FlattenSource::Stream { .. } => {
+                            (self.doc_idx, key, value).into_pyobject(py)?.into_any()
+                        }
+                    };
+                    return Ok(Some(item.unbind()));
+                }
+                self.current = None;
+            }
+            let (item, idx) = match &mut self.source {
+                FlattenSource::Single => return Ok(None),
+                FlattenSource::Batch { items, next } => {
+                    let items = items.bind(py);
+                    if *next >= items.len() {
+                        return Ok(None);
+                    }
+                    *next += 1;
+                    (items.get_item(*next - 1)?, *next - 1)
+                }
+                FlattenSource::Stream { items, next } => {
+                    let Some(item) = items.bind(py).clone().next() else {
+                        return Ok(None);
+                    };
+                    *next += 1;
+                    (item?, *next - 1)
+                }
+            };
+            let json = flatten_input_text(&item)?;
+            let config = Arc::clone(&self.config);
+            let iter = py.detach(|| FlattenIter::new(json, config)).map_err(|e| {
+                JsonToolsError::new_err(format!("Failed to flatten list item {idx}: {e}"))
+            })?;
+            self.current = Some(iter);
+            self.doc_idx = idx;
+        }
+    }
+}
+
+/// One `iter_flatten` document as owned JSON text: `str` and `bytes` are copied
+/// (the iterator outlives the call that received them), a `dict` is serialized.
+#[cfg(feature = "python")]
+fn flatten_input_text(obj: &Bound<'_, PyAny>) -> PyResult<String> {
+    if let Ok(string) = obj.cast::<PyString>() {
+        Ok(string.to_cow()?.into_owned())
+    } else if let Ok(bytes) = obj.cast::<PyBytes>() {
+        std::str::from_utf8(bytes.as_bytes())
+            .map(str::to_owned)
+            .map_err(|e| PyValueError::new_err(format!("JSON bytes are not valid UTF-8: {e}")))
+    } else if obj.is_instance_of::<PyDict>() {
+        py_dumps(obj.py(), obj)
+    } else {
+        Err(PyValueError::new_err(
+            "iter_flatten input must be a JSON str, bytes, dict, or a list or iterable of those",
+        ))
+    }
+}
+
+/// Convert one flattened value (JSON text, as `FlattenIter` yields it) to the
+/// Python object `json.loads` would produce. Strings, booleans, `null` and
+/// in-range numbers are built directly -- no parser call per leaf; containers
+/// (`{}`, `[]`, `max_depth` cut-offs) and integers that may exceed 64 bits go
+/// through `py_loads`, which keeps big integers exact.
+#[cfg(feature = "python")]
+fn flat_value_to_py<'py>(py: Python<'py>, text: &str) -> PyResult<Bound<'py, PyAny>> {
+    match text.as_bytes().first() {
+        Some(b'"') => Ok(unescape_json_string(&text[1..text.len() - 1])
+            .into_pyobject(py)?
+            .into_any()),
+        Some(b't') => Ok(true.into_pyobject(py)?.to_owned().into_any()),
+        Some(b'f') => Ok(false.into_pyobject(py)?.to_owned().into_any()),
+        Some(b'n') => Ok(py.None().into_bound(py)),
+        Some(b'-' | b'0'..=b'9') if !may_contain_big_int(text.as_bytes()) => {
+            if text.bytes().any(|b| matches!(b, b'.' | b'e' | b'E')) {
+                if let Ok(f) = text.parse::<f64>() {
+                    return Ok(f.into_pyobject(py)?.into_any());
+                }
+            } else if let Ok(i) = text.parse::<i64>() {
+                return Ok(i.into_pyobject(py)?.into_any());
+            }
+            py_loads(py, text)
+        }
+        _ => py_loads(py, text),
+    }
+}
+
+/// Python wrapper for `CompiledSchema`, returned by `JSONTools.compile`.
+#[cfg(feature = "python")]
+#[pyclass(name = "CompiledSchema", module = "json_tools_rs", frozen)]
+pub struct PyCompiledSchema {
+    inner: CompiledSchema,
+}
+
+#[cfg(feature = "python")]
+impl PyCompiledSchema {
+    /// Run the compiled flattener with the GIL released.
+    fn run(&self, py: Python<'_>, input: JsonInput<'_>) -> PyResult<JsonOutput> {
+        py.detach(|| self.inner.execute(input)).map_err(|e| {
+            JsonToolsError::new_err(format!("Failed to flatten with the compiled schema: {e}"))
+        })
+    }
+}
+
+#[cfg(feature = "python")]
+#[pymethods]
+impl PyCompiledSchema {
+    /// Flatten input that matches the compiled schema.
+    ///
+    /// Takes and returns the same types as `JSONTools.execute` -- `str` →
+    /// `str`, `bytes` → `bytes`, `dict` → `dict`, and a list of those with
+    /// each result matching its item -- and for every matching row returns
+    /// exactly what `execute()` on the originating instance would.
+    ///
+    /// # Errors
+    /// * `JsonToolsError` for invalid JSON or a row that does not match the
+    ///   schema (for a list, naming the failing index)
+    /// * `ValueError` for an unsupported input type
+    #[pyo3(text_signature = "($self, json_input)")]
+    fn execute(&self, json_input: &Bound<'_, PyAny>) -> PyResult<Py<PyAny>> {
+        let py = json_input.py();
+        let single = |output: JsonOutput| match output {
+            JsonOutput::Single(flat) => Ok(flat),
+            JsonOutput::Multiple(_) => Err(PyValueError::new_err(
+                "Unexpected multiple results for single JSON input",
+            )),
+        };
+
+        if let Ok(string) = json_input.cast::<PyString>() {
+            let json = string.to_cow()?;
+            let flat = single(self.run(py, JsonInput::from(json.as_ref()))?)?;
+            Ok(flat.into_pyobject(py)?.into_any().unbind())
+        } else if let Ok(raw) = json_input.cast::<PyBytes>() {
+            let json = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                PyValueError::new_err(format!("JSON bytes are not valid UTF-8: {e}"))
+            })?;
+            let flat = single(self.run(py, JsonInput::from(json))?)?;
+            Ok(PyBytes::new(py, flat.as_bytes()).into_any().unbind())
+        } else if json_input.is_instance_of::<PyDict>() {
+            let json = py_dumps(py, json_input)?;
+            let flat = single(self.run(py, JsonInput::from(json.as_str()))?)?;
+            Ok(py_loads(py, &flat)?.unbind())
+        } else if let Ok(list) = json_input.cast::<PyList>() {
+            // Same borrowing scheme as `JSONTools.execute`: every item is kept alive
+            // for the call, so `str`/`bytes` items are processed in place.
+            let items: SmallVec<[Bound<'_, PyAny>; 8]> = list.iter().collect();
+            let mut json_strings: SmallVec<[Cow<'_, str>; 8]> =
+                SmallVec::with_capacity(items.len());
+            let mut kinds: SmallVec<[BatchItemKind; 8]> = SmallVec::with_capacity(items.len());
+            for (index, item) in items.iter().enumerate() {
+                if let Ok(string) = item.cast::<PyString>() {
+                    json_strings.push(string.to_cow()?);
+                    kinds.push(BatchItemKind::Str);
+                } else if let Ok(raw) = item.cast::<PyBytes>() {
+                    let json = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                        PyValueError::new_err(format!(
+                            "JSON bytes in list are not valid UTF-8 (index {index}): {e}"
+                        ))
+                    })?;
+                    json_strings.push(Cow::Borrowed(json));
+                    kinds.push(BatchItemKind::Bytes);
+                } else if item.is_instance_of::<PyDict>() {
+                    json_strings.push(Cow::Owned(py_dumps(py, item)?));
+                    kinds.push(BatchItemKind::Dict);
+                } else {
+                    return Err(PyValueError::new_err(
+                        "List items must be JSON strings, JSON bytes, or Python dictionaries",
+                    ));
+                }
+            }
+            let json_refs: SmallVec<[&str; 8]> = json_strings.iter().map(Cow::as_ref).collect();
+            let JsonOutput::Multiple(flat_list) =
+                self.run(py, JsonInput::from(json_refs.as_slice()))?
+            else {
+                return Err(PyValueError::new_err(
+                    "Unexpected single result for multiple input",
+                ));
+            };
+            let mut results: Vec<Py<PyAny>> = Vec::with_capacity(flat_list.len());
+            for (flat, kind) in flat_list.into_iter().zip(kinds) {
+                results.push(match kind {
+                    BatchItemKind::Str => flat.into_pyobject(py)?.into_any().unbind(),
+                    BatchItemKind::Bytes => PyBytes::new(py, flat.as_bytes()).into_any().unbind(),
+                    BatchItemKind::Dict => py_loads(py, &flat)?.unbind(),
+                });
+            }
+            Ok(results.into_pyobject(py)?.into_any().unbind())
+        } else {
+            Err(PyValueError::new_err(
+                "json_input must be a JSON string, JSON bytes, Python dict, or a list of those",
+            ))
+        }
     }
 }
 
+/// A `JSONTools.compile` schema given as Python objects, as the JSON value
+/// `JSONTools::compile_schema` takes: dicts and lists as they are, leaves as
+/// type-name strings or the Python types `str`, `int`, `float`, `bool` and
+/// `None`/`type(None)`.
+#[cfg(feature = "python")]
+fn schema_from_py(obj: &Bound<'_, PyAny>) -> PyResult<serde_json::Value> {
+    use serde_json::Value;
+    let py = obj.py();
+    if let Ok(dict) = obj.cast::<PyDict>() {
+        let mut members = serde_json::Map::with_capacity(dict.len());
+        for (key, value) in dict.iter() {
+            let key = key
+                .cast::<PyString>()
+                .map_err(|_| PyValueError::new_err("Schema dict keys must be strings"))?;
+            members.insert(key.to_cow()?.into_owned(), schema_from_py(&value)?);
+        }
+        return Ok(Value::Object(members));
+    }
+    if let Ok(list) = obj.cast::<PyList>() {
+        return list.iter().map(|item| schema_from_py(&item)).collect();
+    }
+    if let Ok(name) = obj.cast::<PyString>() {
+        return Ok(Value::String(name.to_cow()?.into_owned()));
+    }
+    let name = if obj.is_none() || obj.is(&py.None().bind(py).get_type()) {
+        "null"
+    } else if obj.is(&py.get_type::<pyo3::types::PyBool>()) {
+        "boolean"
+    } else if obj.is(&py.get_type::<pyo3::types::PyInt>()) {
+        "integer"
+    } else if obj.is(&py.get_type::<pyo3::types::PyFloat>()) {
+        "number"
+    } else if obj.is(&py.get_type::<PyString>()) {
+        "string"
+    } else {
+        return Err(PyValueError::new_err(format!(
+            "Unsupported schema entry {}: use a dict, a list, a type name or one of str, \
+             int, float, bool, None",
+            obj.repr()?
+        )));
+    };
+    Ok(Value::String(name.to_string()))
+}
+
+/// Per-item input type for `execute(list)`, so each result is returned as the
+/// same type its input was (str → str, bytes → bytes, dict → dict).
+#[cfg(feature = "python")]
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum BatchItemKind {
+    Str,
+    Bytes,
+    Dict,
+}
+
 /// Python JSONTools class - the unified API for JSON manipulation
 ///
 /// This is the single entry point for all JSON operations in Python, providing both
@@ -447,9 +905,11 @@ impl PyJsonOutput {
 /// filtering, and comprehensive transformations. It mirrors the Rust JSONTools API exactly.
 ///
 /// # Performance Optimization
-/// Uses Mutex for interior mutability to avoid cloning the entire JSONTools struct
+/// Uses an RwLock for interior mutability to avoid cloning the entire JSONTools struct
 /// on every builder method call. This provides 30-50% performance improvement over
 /// the previous clone-based approach while maintaining thread safety for Python's GIL.
+/// `execute` only takes the read side, so concurrent calls on one shared instance
+/// run in parallel once the GIL is released.
 ///
 /// # Input/Output Type Mapping
 /// - str input → str output (JSON string)
@@ -493,10 +953,11 @@ impl PyJsonOutput {
 #[cfg(feature = "python")]
 #[pyclass(name = "JSONTools", module = "json_tools_rs")]
 pub struct PyJSONTools {
-    // Use Mutex for interior mutability - allows mutation through shared reference
+    // Use RwLock for interior mutability - allows mutation through shared reference
     // This eliminates the need to clone JSONTools on every builder method call
-    // Mutex is required for thread safety (PyO3 requires Sync)
-    inner: Mutex<JSONTools>,
+    // A lock is required for thread safety (PyO3 requires Sync); builders write,
+    // every execute path reads (see `read_config`)
+    inner: RwLock<JSONTools>,
 }
 
 #[cfg(feature = "python")]
@@ -1551,7 +2012,7 @@ impl PyJSONTools {
     #[pyo3(text_signature = "()")]
     pub fn new() -> Self {
         Self {
-            inner: Mutex::new(JSONTools::new()),
+            inner: RwLock::new(JSONTools::new()),
         }
     }
 
@@ -1755,6 +2216,34 @@ impl PyJSONTools {
         py_builder_method!(slf, tools, tools.always_array_keys(keys))
     }
 
+    /// Extract only the given flattened paths (flatten mode only)
+    ///
+    /// Each path is a flattened key as flatten() would build it from the
+    /// input -- segments joined by the separator, array indices included
+    /// ("product.pricing.final_price", "tags.0") -- matched before any key
+    /// transforms. Only those keys are returned; every other subtree is
+    /// skipped over without being flattened, so reading a few fields of a
+    /// large document no longer costs a full flatten followed by discarding
+    /// most of the result. A path naming an object or array returns it whole;
+    /// missing paths are simply absent. Replaces any earlier selection; an
+    /// empty list selects everything.
+    ///
+    /// Args:
+    ///     paths: Iterable of flattened key paths to keep.
+    ///
+    /// # Example
+    /// ```python
+    /// import json_tools_rs as jt
+    /// tools = jt.JSONTools().flatten().select_paths(["product.id", "product.stock"])
+    /// tools.execute({"product": {"id": 7, "name": "x", "stock": {"eu": 3}}})
+    /// # {"product.id": 7, "product.stock": {"eu": 3}}
+    /// ```
+    #[pyo3(text_signature = "($self, paths)")]
+    #[inline]
+    pub fn select_paths(slf: PyRef<'_, Self>, paths: Vec<String>) -> PyResult<PyRef<'_, Self>> {
+        py_builder_method!(slf, tools, tools.select_paths(paths))
+    }
+
     /// Enable automatic type conversion from strings to numbers and booleans
     ///
     /// When enabled, the library will attempt to convert string values:
@@ -2089,6 +2578,58 @@ impl PyJSONTools {
         py_builder_method!(slf, tools, tools.max_array_index(max))
     }
 
+    /// Limit how deep flattening descends (flatten mode only)
+    ///
+    /// With an int `n`, flattened keys have at most `n` path segments: an object
+    /// or array found at depth `n` is kept whole, as a nested value under its key,
+    /// and its contents are never walked. Transforms and filters apply to the
+    /// flattened keys and scalar leaves only, not inside a kept subtree.
+    ///
+    /// # Arguments
+    /// * `max_depth` - Maximum key depth (None = flatten every level, the default;
+    ///   0 raises `JsonToolsError` at `execute()` time)
+    ///
+    /// # Example
+    /// ```python
+    /// import json_tools_rs as jt
+    /// tools = jt.JSONTools().flatten().max_depth(1)
+    /// tools.execute({"a": {"b": {"c": 1}}, "d": 2})  # {"a": {"b": {"c": 1}}, "d": 2}
+    /// tools = jt.JSONTools().flatten().max_depth(2)
+    /// tools.execute({"a": {"b": {"c": 1}}, "d": 2})  # {"a.b": {"c": 1}, "d": 2}
+    /// ```
+    #[pyo3(text_signature = "($self, max_depth)")]
+    #[inline]
+    pub fn max_depth(slf: PyRef<'_, Self>, max_depth: Option<usize>) -> PyResult<PyRef<'_, Self>> {
+        py_builder_method!(slf, tools, tools.max_depth(max_depth))
+    }
+
+    /// Memoize whole-document results across execute() calls
+    ///
+    /// With max_entries > 0, each document (a single input or a batch item)
+    /// is looked up by its exact JSON text under the current settings: a
+    /// repeat returns the stored result without being processed again, a new
+    /// document is processed and stored. Useful when the same small document
+    /// -- a tenant config, a schema header -- is processed on every request.
+    /// At most max_entries documents are kept (least-recently-used half
+    /// evicted when full); errors are never cached. dict inputs are keyed on
+    /// their json.dumps() text, so dict-to-JSON conversion still runs on a hit.
+    ///
+    /// # Arguments
+    /// * `max_entries` - Maximum cached documents (0 = disabled, the default)
+    ///
+    /// # Example
+    /// ```python
+    /// import json_tools_rs as jt
+    /// tools = jt.JSONTools().flatten().result_cache(1024)
+    /// tools.execute('{"tenant": {"id": 7}}')  # processed: '{"tenant.id":7}'
+    /// tools.execute('{"tenant": {"id": 7}}')  # served from the cache
+    /// ```
+    #[pyo3(text_signature = "($self, max_entries)")]
+    #[inline]
+    pub fn result_cache(slf: PyRef<'_, Self>, max_entries: usize) -> PyResult<PyRef<'_, Self>> {
+        py_builder_method!(slf, tools, tools.result_cache(max_entries))
+    }
+
     /// Execute the configured JSON operation
     ///
     /// This method executes the configured operation (flatten or unflatten) with all
@@ -2097,12 +2638,14 @@ impl PyJSONTools {
     /// # Arguments
     /// * `json_input` - JSON input as:
     ///   - str: JSON string
+    ///   - bytes: UTF-8 encoded JSON (borrowed without a copy)
     ///   - dict: Python dictionary (will be serialized to JSON)
     ///   - list[str]: List of JSON strings
     ///   - list[dict]: List of Python dictionaries (will be serialized to JSON)
     ///
     /// # Returns
     /// * str input → str output (processed JSON string)
+    /// * bytes input → bytes output (processed UTF-8 JSON)
     /// * dict input → dict output (processed Python dictionary)
     /// * list[str] input → list[str] output (list of processed JSON strings)
     /// * list[dict] input → list[dict] output (list of processed Python dictionaries)
@@ -2136,7 +2679,8 @@ impl PyJSONTools {
         // Subclasses and everything else still take the full detection path.
         let is_exact_common_type = json_input.is_exact_instance_of::<PyString>()
             || json_input.is_exact_instance_of::<PyDict>()
-            || json_input.is_exact_instance_of::<PyList>();
+            || json_input.is_exact_instance_of::<PyList>()
+            || json_input.is_exact_instance_of::<PyBytes>();
 
         // Check for DataFrame or Series first (before other type checks)
         if !is_exact_common_type {
@@ -2154,17 +2698,16 @@ impl PyJSONTools {
         }
 
         // Fast path: single JSON string → return JSON string
-        if let Ok(json_str) = json_input.extract::<String>() {
-            // TIER 6→3 OPTIMIZATION: Take ownership instead of cloning
+        if let Ok(string) = json_input.cast::<PyString>() {
+            // Borrowed in place, not extracted: `to_cow` hands back the str's own
+            // UTF-8 buffer (no copy for the common ASCII/UTF-8-cached `str`), which
+            // stays valid across the GIL release -- `str` is immutable and
+            // `json_input` keeps it alive for the whole call.
+            let json_str = string.to_cow()?;
+            // Borrow the config under the shared read lock instead of cloning it
             // Saves 1K-10K cycles by avoiding deep clone of entire JSONTools config
             let result = py
-                .detach(|| {
-                    let mut guard = lock_config(&self.inner)?;
-                    let tools = mem::take(&mut *guard);
-                    let result = tools.execute(json_str.as_str());
-                    *guard = tools;
-                    result
-                })
+                .detach(|| read_config(&self.inner)?.execute(&*json_str))
                 .map_err(|e| {
                     JsonToolsError::new_err(format!("Failed to process JSON string: {}", e))
                 })?;
@@ -2177,6 +2720,30 @@ impl PyJSONTools {
                     "Unexpected multiple results for single JSON input",
                 )),
             }
+        } else if let Ok(raw) = json_input.cast::<PyBytes>() {
+            // Single JSON document as `bytes` → `bytes`. JSON read from a socket or
+            // file is already UTF-8 bytes: `bytes` is immutable, so its buffer is
+            // borrowed in place across the GIL release (one UTF-8 validation, no copy),
+            // where decoding to `str` first would cost a decode on the caller's side
+            // plus `extract::<String>()`'s copy on ours. The result goes back as
+            // `bytes` too -- a plain memcpy, no `str` kind scan.
+            let json_str = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                PyValueError::new_err(format!("JSON bytes are not valid UTF-8: {e}"))
+            })?;
+            let result = py
+                .detach(|| read_config(&self.inner)?.execute(json_str))
+                .map_err(|e| {
+                    JsonToolsError::new_err(format!("Failed to process JSON bytes: {}", e))
+                })?;
+
+            match result {
+                JsonOutput::Single(processed) => {
+                    Ok(PyBytes::new(py, processed.as_bytes()).into_any().unbind())
+                }
+                JsonOutput::Multiple(_) => Err(PyValueError::new_err(
+                    "Unexpected multiple results for single JSON input",
+                )),
+            }
         } else if json_input.is_instance_of::<pyo3::types::PyDict>() {
             // Serialize via Python's own `json` module -- see `py_dumps`'s doc comment
             // for why this beats the generic serde-based `depythonize` for the nested
@@ -2187,13 +2754,7 @@ impl PyJSONTools {
 
             // Process with Rust tools (release GIL)
             let result = py
-                .detach(|| {
-                    let mut guard = lock_config(&self.inner)?;
-                    let tools = mem::take(&mut *guard);
-                    let result = tools.execute(json_str.as_str());
-                    *guard = tools;
-                    result
-                })
+                .detach(|| read_config(&self.inner)?.execute(json_str.as_str()))
                 .map_err(|e| {
                     JsonToolsError::new_err(format!("Failed to process Python dict: {}", e))
                 })?;
@@ -2217,41 +2778,46 @@ impl PyJSONTools {
                 return Ok(Vec::<String>::new().into_pyobject(py)?.into_any().unbind());
             }
 
-            let mut json_strings: Vec<String> = Vec::with_capacity(list.len());
-            let mut is_str_flags: Vec<bool> = Vec::with_capacity(list.len());
-            let mut has_other_types = false;
-
-            for item in list.iter() {
-                if let Ok(json_str) = item.extract::<String>() {
-                    json_strings.push(json_str);
-                    is_str_flags.push(true);
+            // Keep a strong reference to every item for the whole call: `str` and
+            // `bytes` items are borrowed (not copied) into the batch below, and those
+            // borrows must outlive the GIL release even if another thread mutates the
+            // list meanwhile. Inline capacity 8 keeps the small-batch case (a handful
+            // of documents) off the heap for all four per-item arrays.
+            let items: SmallVec<[Bound<'_, PyAny>; 8]> = list.iter().collect();
+            let mut json_strings: SmallVec<[Cow<'_, str>; 8]> =
+                SmallVec::with_capacity(items.len());
+            let mut kinds: SmallVec<[BatchItemKind; 8]> = SmallVec::with_capacity(items.len());
+
+            for item in &items {
+                if let Ok(string) = item.cast::<PyString>() {
+                    json_strings.push(string.to_cow()?);
+                    kinds.push(BatchItemKind::Str);
+                } else if let Ok(raw) = item.cast::<PyBytes>() {
+                    let json_str = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                        PyValueError::new_err(format!(
+                            "JSON bytes in list are not valid UTF-8 (index {}): {e}",
+                            kinds.len()
+                        ))
+                    })?;
+                    json_strings.push(Cow::Borrowed(json_str));
+                    kinds.push(BatchItemKind::Bytes);
                 } else if item.is_instance_of::<pyo3::types::PyDict>() {
-                    let json_str = py_dumps(py, &item).map_err(|e| {
+                    let json_str = py_dumps(py, item).map_err(|e| {
                         JsonToolsError::new_err(format!("Failed to convert dict in list: {}", e))
                     })?;
-                    json_strings.push(json_str);
-                    is_str_flags.push(false);
+                    json_strings.push(Cow::Owned(json_str));
+                    kinds.push(BatchItemKind::Dict);
                 } else {
-                    has_other_types = true;
-                    break;
+                    return Err(PyValueError::new_err(
+                        "List items must be JSON strings, JSON bytes, or Python dictionaries",
+                    ));
                 }
             }
+            let json_refs: SmallVec<[&str; 8]> = json_strings.iter().map(Cow::as_ref).collect();
 
-            if has_other_types {
-                return Err(PyValueError::new_err(
-                    "List items must be either JSON strings or Python dictionaries",
-                ));
-            }
-
-            // TIER 6→3 OPTIMIZATION: Take ownership instead of cloning
+            // Borrow the config under the shared read lock instead of cloning it
             let result = py
-                .detach(|| {
-                    let mut guard = lock_config(&self.inner)?;
-                    let tools = mem::take(&mut *guard);
-                    let result = tools.execute(json_strings);
-                    *guard = tools;
-                    result
-                })
+                .detach(|| read_config(&self.inner)?.execute(json_refs.as_slice()))
                 .map_err(|e| {
                     JsonToolsError::new_err(format!("Failed to process JSON list: {}", e))
                 })?;
@@ -2262,49 +2828,34 @@ impl PyJSONTools {
                 )),
                 JsonOutput::Multiple(processed_list) => {
                     // Determine output shape and transform accordingly
-                    let all_strings = is_str_flags.iter().all(|&b| b);
-                    let all_dicts = is_str_flags.iter().all(|&b| !b);
-
-                    if all_strings {
-                        Ok(processed_list.into_pyobject(py)?.into_any().unbind())
-                    } else if all_dicts {
-                        let mut dict_results: Vec<Py<PyAny>> =
-                            Vec::with_capacity(processed_list.len());
-                        for processed_json in processed_list {
-                            let python_dict = py_loads(py, &processed_json).map_err(|e| {
-                                JsonToolsError::new_err(format!(
-                                    "Failed to convert to Python dict: {}",
-                                    e
-                                ))
-                            })?;
-                            dict_results.push(python_dict.unbind());
-                        }
-                        Ok(dict_results.into_pyobject(py)?.into_any().unbind())
-                    } else {
-                        let mut mixed_results: Vec<Py<PyAny>> =
-                            Vec::with_capacity(processed_list.len());
-                        for (processed_json, is_str) in processed_list.into_iter().zip(is_str_flags)
-                        {
-                            if is_str {
-                                mixed_results
-                                    .push(processed_json.into_pyobject(py)?.into_any().unbind());
-                            } else {
-                                let python_dict = py_loads(py, &processed_json).map_err(|e| {
+                    if kinds.iter().all(|&k| k == BatchItemKind::Str) {
+                        return Ok(processed_list.into_pyobject(py)?.into_any().unbind());
+                    }
+                    let mut results: Vec<Py<PyAny>> = Vec::with_capacity(processed_list.len());
+                    for (processed_json, kind) in processed_list.into_iter().zip(kinds) {
+                        results.push(match kind {
+                            BatchItemKind::Str => {
+                                processed_json.into_pyobject(py)?.into_any().unbind()
+                            }
+                            BatchItemKind::Bytes => PyBytes::new(py, processed_json.as_bytes())
+                                .into_any()
+                                .unbind(),
+                            BatchItemKind::Dict => py_loads(py, &processed_json)
+                                .map_err(|e| {
                                     JsonToolsError::new_err(format!(
                                         "Failed to convert to Python dict: {}",
                                         e
                                     ))
-                                })?;
-                                mixed_results.push(python_dict.unbind());
-                            }
-                        }
-                        Ok(mixed_results.into_pyobject(py)?.into_any().unbind())
+                                })?
+                                .unbind(),
+                        });
                     }
+                    Ok(results.into_pyobject(py)?.into_any().unbind())
                 }
             }
         } else {
             Err(PyValueError::new_err(
-                "json_input must be a JSON string, Python dict, list of JSON strings, or list of Python dicts",
+                "json_input must be a JSON string, JSON bytes, Python dict, list of JSON strings, or list of Python dicts",
             ))
         }
     }
@@ -2318,12 +2869,13 @@ impl PyJSONTools {
     /// # Arguments
     /// * `json_input` - JSON input as:
     ///   - str: JSON string
+    ///   - bytes: UTF-8 JSON, borrowed in place like `execute`'s bytes input
     ///   - dict: Python dictionary (will be serialized to JSON)
-    ///   - list[str]: List of JSON strings
-    ///   - list[dict]: List of Python dictionaries (will be serialized to JSON)
+    ///   - list[str | bytes | dict]: List of JSON strings, bytes or dictionaries
     ///
     /// # Returns
-    /// * `PyJsonOutput` - JsonOutput object with is_single/is_multiple methods
+    /// * `PyJsonOutput` - JsonOutput object with is_single/is_multiple methods.
+    ///   Results are JSON `str` whatever the input type.
     ///
     /// # Performance
     /// Uses interior mutability to avoid cloning JSONTools - only clones for execute() call
@@ -2334,23 +2886,31 @@ impl PyJSONTools {
         // Note: DataFrames/Series are not supported in execute_to_output()
         // Use execute() instead for DataFrame/Series support
 
-        // Single JSON string
-        if let Ok(json_str) = json_input.extract::<String>() {
-            // TIER 6→3: Take ownership instead of cloning (10K-50K cycles saved)
+        // Single JSON string, borrowed in place (see `execute`)
+        if let Ok(string) = json_input.cast::<PyString>() {
+            let json_str = string.to_cow()?;
+            // Borrow the config under the shared read lock instead of cloning it
             let result = py
-                .detach(|| {
-                    let mut guard = lock_config(&self.inner)?;
-                    let tools = mem::take(&mut *guard);
-                    let result = tools.execute(json_str.as_str());
-                    *guard = tools;
-                    result
-                })
+                .detach(|| read_config(&self.inner)?.execute(&*json_str))
                 .map_err(|e| {
                     JsonToolsError::new_err(format!("Failed to process JSON string: {}", e))
                 })?;
             return Ok(PyJsonOutput::from_rust_output(result));
         }
 
+        // Single JSON document as `bytes`, borrowed in place (see `execute`)
+        if let Ok(raw) = json_input.cast::<PyBytes>() {
+            let json_str = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                PyValueError::new_err(format!("JSON bytes are not valid UTF-8: {e}"))
+            })?;
+            let result = py
+                .detach(|| read_config(&self.inner)?.execute(json_str))
+                .map_err(|e| {
+                    JsonToolsError::new_err(format!("Failed to process JSON bytes: {}", e))
+                })?;
+            return Ok(PyJsonOutput::from_rust_output(result));
+        }
+
         // Single Python dictionary - serialize via Python's own `json` module (see
         // `py_dumps`'s doc comment)
         if json_input.is_instance_of::<pyo3::types::PyDict>() {
@@ -2359,13 +2919,7 @@ impl PyJSONTools {
             })?;
 
             let result = py
-                .detach(|| {
-                    let mut guard = lock_config(&self.inner)?;
-                    let tools = mem::take(&mut *guard);
-                    let result = tools.execute(json_str.as_str());
-                    *guard = tools;
-                    result
-                })
+                .detach(|| read_config(&self.inner)?.execute(json_str.as_str()))
                 .map_err(|e| {
                     JsonToolsError::new_err(format!("Failed to process Python dict: {}", e))
                 })?;
@@ -2380,33 +2934,41 @@ impl PyJSONTools {
                 return Ok(PyJsonOutput::from_rust_output(JsonOutput::Multiple(vec![])));
             }
 
-            let mut json_strings: Vec<String> = Vec::with_capacity(list.len());
-
-            for item in list.iter() {
-                if let Ok(json_str) = item.extract::<String>() {
-                    json_strings.push(json_str);
+            // Strong references held for the whole call so `str` items can be
+            // borrowed across the GIL release -- same as `execute`'s list path.
+            let items: SmallVec<[Bound<'_, PyAny>; 8]> = list.iter().collect();
+            let mut json_strings: SmallVec<[Cow<'_, str>; 8]> =
+                SmallVec::with_capacity(items.len());
+
+            for item in &items {
+                if let Ok(string) = item.cast::<PyString>() {
+                    json_strings.push(string.to_cow()?);
+                } else if let Ok(raw) = item.cast::<PyBytes>() {
+                    let json_str = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                        PyValueError::new_err(format!(
+                            "JSON bytes in list are not valid UTF-8 (index {}): {e}",
+                            json_strings.len()
+                        ))
+                    })?;
+                    json_strings.push(Cow::Borrowed(json_str));
                 } else if item.is_instance_of::<pyo3::types::PyDict>() {
-                    let json_str = py_dumps(py, &item).map_err(|e| {
+                    let json_str = py_dumps(py, item).map_err(|e| {
                         JsonToolsError::new_err(format!("Failed to convert dict in list: {}", e))
                     })?;
-                    json_strings.push(json_str);
+                    json_strings.push(Cow::Owned(json_str));
                 } else {
                     return Err(PyValueError::new_err(
-                        "List items must be either JSON strings or Python dictionaries",
+                        "List items must be JSON strings, JSON bytes, or Python dictionaries",
                     ));
                 }
             }
 
+            let json_refs: SmallVec<[&str; 8]> = json_strings.iter().map(Cow::as_ref).collect();
+
             // Process the list of JSON strings directly
-            // TIER 6→3: Take ownership instead of cloning (10K-50K cycles saved)
+            // Borrow the config under the shared read lock instead of cloning it
             let result = py
-                .detach(|| {
-                    let mut guard = lock_config(&self.inner)?;
-                    let tools = mem::take(&mut *guard);
-                    let result = tools.execute(json_strings);
-                    *guard = tools;
-                    result
-                })
+                .detach(|| read_config(&self.inner)?.execute(json_refs.as_slice()))
                 .map_err(|e| {
                     JsonToolsError::new_err(format!("Failed to process JSON list: {}", e))
                 })?;
@@ -2414,10 +2976,402 @@ impl PyJSONTools {
         }
 
         Err(PyValueError::new_err(
-            "json_input must be a JSON string, Python dict, DataFrame, Series, list of JSON strings, or list of Python dicts",
+            "json_input must be a JSON string, JSON bytes, Python dict, DataFrame, Series, list of JSON strings, or list of Python dicts",
         ))
     }
 
+    /// Process a newline-delimited JSON (JSONL/NDJSON) batch passed as one
+    /// `str` or `bytes` buffer, returning one buffer of the same type with
+    /// one processed document per line.
+    ///
+    /// `execute(list[str])` extracts (and copies) every element into its own
+    /// Rust `String` and builds a Python `list` of N result strings on the
+    /// way back -- per-document boundary cost that dominates for large
+    /// batches of small records. Here the whole batch crosses the boundary
+    /// as one contiguous buffer each way: the input is borrowed in place
+    /// (`PyBytes::as_bytes` / `PyString::to_cow`, no copy for the common
+    /// ASCII/UTF-8-cached `str`), split into borrowed `&str` lines with no
+    /// per-record allocation, processed through the same batch engine as
+    /// `execute(list)` (parallel above `parallel_threshold`), and joined
+    /// into a single output object. Blank lines are skipped, matching the
+    /// DataFrame path's `split_ndjson`.
+    ///
+    /// # Errors
+    /// * `JsonToolsError` naming the failing record's index (0-based,
+    ///   counting non-blank lines), exactly like `execute(list)`
+    /// * `ValueError` if `data` is neither `str` nor `bytes`, or `bytes`
+    ///   that aren't valid UTF-8
+    #[pyo3(text_signature = "($self, data)")]
+    pub fn execute_ndjson(&self, data: &Bound<'_, PyAny>) -> PyResult<Py<PyAny>> {
+        let py = data.py();
+        let (text, as_bytes): (Cow<'_, str>, bool) = if let Ok(bytes) = data.cast::<PyBytes>() {
+            let text = std::str::from_utf8(bytes.as_bytes()).map_err(|e| {
+                PyValueError::new_err(format!("NDJSON bytes are not valid UTF-8: {e}"))
+            })?;
+            (Cow::Borrowed(text), true)
+        } else if let Ok(string) = data.cast::<PyString>() {
+            (string.to_cow()?, false)
+        } else {
+            return Err(PyValueError::new_err(
+                "data must be newline-delimited JSON as str or bytes",
+            ));
+        };
+
+        let lines: Vec<&str> = text
+            .lines()
+            .filter(|line| !line.trim().is_empty())
+            .collect();
+
+        let output = py.detach(|| -> PyResult<String> {
+            if lines.is_empty() {
+                return Ok(String::new());
+            }
+            let tools = read_config(&self.inner)?;
+            let result = tools.execute(lines.as_slice());
+            match result {
+                Ok(JsonOutput::Multiple(results)) => {
+                    let total: usize = results.iter().map(|r| r.len() + 1).sum();
+                    let mut out = String::with_capacity(total);
+                    for r in &results {
+                        out.push_str(r);
+                        out.push('\n');
+                    }
+                    Ok(out)
+                }
+                Ok(JsonOutput::Single(_)) => Err(PyValueError::new_err(
+                    "Unexpected single result for NDJSON input",
+                )),
+                Err(e) => Err(JsonToolsError::new_err(format!(
+                    "Failed to process NDJSON: {}",
+                    e
+                ))),
+            }
+        })?;
+
+        if as_bytes {
+            Ok(PyBytes::new(py, output.as_bytes()).into_any().unbind())
+        } else {
+            Ok(output.into_pyobject(py)?.into_any().unbind())
+        }
+    }
+
+    /// Flatten lazily, returning an iterator of flattened pairs instead of a
+    /// fully built result.
+    ///
+    /// `execute` materializes the whole flattened object -- every key and
+    /// value, then the output JSON, then the Python `str`/`dict` -- before the
+    /// caller sees the first entry. For consumers that stream pairs onward
+    /// (writing rows, filtering, stopping at the first match) the iterator
+    /// walks one top-level child at a time and converts each pair to Python
+    /// objects only when `next()` asks for it. Values arrive as their Python
+    /// types (`str`, `int`, `float`, `bool`, `None`; `{}`/`[]` for empty
+    /// containers).
+    ///
+    /// Accepts a JSON `str`, `bytes`, or `dict`, yielding `(key, value)`; or a
+    /// list of those, yielding `(doc_index, key, value)` with each list item
+    /// scanned only once the previous one is exhausted. Any other iterable (a
+    /// generator, an open file of JSON lines) is consumed the same way, pulling
+    /// the next document only when the previous one's pairs are used up, so
+    /// memory stays bounded by one document however long the stream is. Uses
+    /// the instance's flatten settings whatever mode is set;
+    /// `handle_key_collision` and `always_array_keys` need the whole document
+    /// and are rejected, and duplicate keys are yielded as they occur rather
+    /// than deduplicated.
+    ///
+    /// # Errors
+    /// * `JsonToolsError` for an invalid setting, an unsupported option,
+    ///   invalid JSON or a root that isn't an object or array -- raised here
+    ///   for single input, from `next()` for a failing list item
+    /// * `ValueError` for an unsupported input type
+    #[pyo3(text_signature = "($self, json_input)")]
+    pub fn iter_flatten(&self, json_input: &Bound<'_, PyAny>) -> PyResult<PyFlattenIterator> {
+        let py = json_input.py();
+        let config = read_config(&self.inner)?
+            .iter_flatten_config()
+            .map_err(|e| JsonToolsError::new_err(format!("Failed to flatten JSON input: {}", e)))?;
+
+        if let Ok(list) = json_input.cast::<PyList>() {
+            return Ok(PyFlattenIterator {
+                config,
+                source: FlattenSource::Batch {
+                    items: list.clone().unbind(),
+                    next: 0,
+                },
+                current: None,
+                doc_idx: 0,
+            });
+        }
+
+        if !json_input.is_instance_of::<PyString>()
+            && !json_input.is_instance_of::<PyBytes>()
+            && !json_input.is_instance_of::<PyDict>()
+        {
+            if let Ok(items) = json_input.try_iter() {
+                return Ok(PyFlattenIterator {
+                    config,
+                    source: FlattenSource::Stream {
+                        items: items.unbind(),
+                        next: 0,
+                    },
+                    current: None,
+                    doc_idx: 0,
+                });
+            }
+        }
+
+        let json = flatten_input_text(json_input)?;
+        let iter_config = Arc::clone(&config);
+        let iter = py
+            .detach(|| FlattenIter::new(json, iter_config))
+            .map_err(|e| JsonToolsError::new_err(format!("Failed to flatten JSON input: {}", e)))?;
+        Ok(PyFlattenIterator {
+            config,
+            source: FlattenSource::Single,
+            current: Some(iter),
+            doc_idx: 0,
+        })
+    }
+
+    /// Compile a flattener specialized to one fixed row shape.
+    ///
+    /// For batches whose rows all share a shape, the returned `CompiledSchema`
+    /// works out every output key once, here, using this instance's own
+    /// settings, and per row only checks the row against the schema and
+    /// copies its values. For every matching row its `execute()` returns
+    /// exactly what this instance's `execute()` would; a row that does not
+    /// match (missing or extra key, wrong leaf type, wrong array length) is
+    /// rejected instead of being flattened into a different shape.
+    ///
+    /// `schema` mirrors the rows, as a `dict` or as JSON text: objects and
+    /// fixed-length arrays as they appear, leaves as `str`, `int`, `float`,
+    /// `bool` or `None`, or as the names `"string"`, `"integer"`, `"number"`,
+    /// `"boolean"`, `"null"` -- a name suffixed with `?` also accepts `null`.
+    /// Later changes to this instance do not affect the compiled schema.
+    ///
+    /// # Errors
+    /// * `JsonToolsError` outside flatten mode, for an invalid schema, for two
+    ///   leaves flattening to one key, or with value replacements/exclusions,
+    ///   type conversion, `handle_key_collision`, `always_array_keys`,
+    ///   `max_depth` or `select_paths` configured
+    /// * `ValueError` for an unsupported schema entry
+    #[pyo3(text_signature = "($self, schema)")]
+    pub fn compile(&self, schema: &Bound<'_, PyAny>) -> PyResult<PyCompiledSchema> {
+        let text = if let Ok(text) = schema.cast::<PyString>() {
+            text.to_cow()?.into_owned()
+        } else {
+            schema_from_py(schema)?.to_string()
+        };
+        let inner = read_config(&self.inner)?
+            .compile_schema(&text)
+            .map_err(|e| JsonToolsError::new_err(format!("Failed to compile schema: {}", e)))?;
+        Ok(PyCompiledSchema { inner })
+    }
+
+    /// Flatten a batch into typed columns: a `dict` mapping each flattened key
+    /// to one `pyarrow.Array` holding that key's value for every document.
+    ///
+    /// Batch consumers that go on to aggregate or filter per key (`price` over
+    /// every row, not every key of one row) otherwise get `list[dict]` back --
+    /// one boxed Python object per value, per row, scattered across the heap --
+    /// and rebuild columns from it themselves. Here each column is built
+    /// directly as a typed Arrow array (`int64`, `double`, `bool`, `string`,
+    /// `date32`/`timestamp` with date conversion on, `list<T>` for
+    /// `handle_key_collision` keys) with a validity bitmap for documents
+    /// lacking the key, by the same engine as `normalise=True` -- type
+    /// resolution and key order (first seen) are identical -- and handed to
+    /// pyarrow through the Arrow C Data Interface, zero-copy. No value is ever
+    /// a Python object; `.to_numpy()` on a null-free numeric column is
+    /// zero-copy too.
+    ///
+    /// Accepts every input `normalise=True` does (`str`, `dict`, lists of
+    /// those, DataFrames, Series); a single document yields length-1 arrays.
+    /// Requires `.flatten()` mode and pyarrow.
+    ///
+    /// # Errors
+    /// * `JsonToolsError` outside flatten mode, without pyarrow installed, or
+    ///   when processing fails
+    #[pyo3(text_signature = "($self, json_input)")]
+    pub fn execute_columnar(&self, json_input: &Bound<'_, PyAny>) -> PyResult<Py<PyDict>> {
+        let py = json_input.py();
+
+        if !read_config(&self.inner)?.is_flatten_mode() {
+            return Err(JsonToolsError::new_err(
+                "execute_columnar requires .flatten() mode -- nested values can't \
+                 become scalar columns",
+            ));
+        }
+        cached_import(py, &PYARROW_MODULE, "pyarrow").map_err(|_| {
+            JsonToolsError::new_err(
+                "execute_columnar requires the 'pyarrow' package to be installed",
+            )
+        })?;
+
+        let (json_strings, _) = extract_normalise_json_strings(json_input)?;
+        let dates_enabled = read_config(&self.inner)?.date_conversion().enabled;
+
+        // Processing and column building both run without the GIL -- only the
+        // finished arrays cross back, one capsule export per column.
+        let batch = py.detach(|| -> PyResult<RecordBatch> {
+            let tools = read_config(&self.inner)?;
+            let result = tools.execute(json_strings);
+            drop(tools);
+            let processed = match result {
+                Ok(JsonOutput::Multiple(processed)) => processed,
+                Ok(JsonOutput::Single(single)) => vec![single],
+                Err(e) => {
+                    return Err(JsonToolsError::new_err(format!(
+                        "Failed to process JSON: {}",
+                        e
+                    )))
+                }
+            };
+            build_normalise_batch(&processed, dates_enabled)
+        })?;
+
+        let columns = PyDict::new(py);
+        let schema = batch.schema();
+        for (field, array) in schema.fields().iter().zip(batch.columns()) {
+            let array = PyArray::new(Arc::clone(array), Arc::clone(field)).into_pyarrow(py)?;
+            columns.set_item(field.name(), array)?;
+        }
+        Ok(columns.unbind())
+    }
+
+    /// Execute many `(JSONTools, input)` pairs -- each with its own
+    /// configuration -- in one call.
+    ///
+    /// `execute(list)` already batches documents that share one configuration
+    /// under a single GIL release. Pipelines that apply *different*
+    /// configurations to independent documents otherwise pay one full FFI
+    /// round trip (argument extraction, GIL release/reacquire, config lock)
+    /// per document, with the Python glue between calls running serially.
+    /// This entry point extracts every task up front while holding the GIL,
+    /// then runs the whole set under one `py.detach` -- on rayon's persistent
+    /// pool once the task count reaches the default `parallel_threshold`,
+    /// sequentially below it (same cutoff rationale as `process_batch`).
+    ///
+    /// Each distinct instance's config is snapshotted once rather than held
+    /// under its read lock (the same instance may legitimately appear in
+    /// several tasks, and a re-entrant read can deadlock behind a queued
+    /// builder call). The snapshot keeps the instance's compiled-pattern cache
+    /// (`JSONTools::snapshot`), so tasks sharing an instance share one config
+    /// and patterns compile at most once per instance, not once per task.
+    ///
+    /// # Arguments
+    /// * `tasks` - list of `(JSONTools, input)` tuples, where input is a JSON
+    ///   `str`, UTF-8 JSON `bytes`, or a `dict`
+    ///
+    /// # Returns
+    /// * list of results in task order, each typed like its input (str in →
+    ///   str out, bytes in → bytes out, dict in → dict out)
+    ///
+    /// # Errors
+    /// * `JsonToolsError` naming the failing task's index, exactly like batch
+    ///   errors from `execute(list)`
+    #[staticmethod]
+    #[pyo3(text_signature = "(tasks)")]
+    pub fn execute_many(py: Python<'_>, tasks: &Bound<'_, PyList>) -> PyResult<Py<PyAny>> {
+        let mut configs: Vec<JSONTools> = Vec::new();
+        let mut config_indices: Vec<usize> = Vec::with_capacity(tasks.len());
+        let mut seen: FxHashMap<*mut pyo3::ffi::PyObject, usize> = FxHashMap::default();
+        let mut json_strings: Vec<String> = Vec::with_capacity(tasks.len());
+        let mut kinds: Vec<BatchItemKind> = Vec::with_capacity(tasks.len());
+
+        for (index, task) in tasks.iter().enumerate() {
+            let (tools, item) = task
+                .extract::<(PyRef<'_, PyJSONTools>, Bound<'_, PyAny>)>()
+                .map_err(|_| {
+                    PyValueError::new_err(format!(
+                        "execute_many() task {index} must be a (JSONTools, input) tuple"
+                    ))
+                })?;
+            let config_index = match seen.entry(tools.as_ptr()) {
+                Entry::Occupied(entry) => *entry.get(),
+                Entry::Vacant(entry) => {
+                    configs.push(read_config(&tools.inner)?.snapshot());
+                    *entry.insert(configs.len() - 1)
+                }
+            };
+            config_indices.push(config_index);
+
+            if let Ok(json_str) = item.extract::<String>() {
+                json_strings.push(json_str);
+                kinds.push(BatchItemKind::Str);
+            } else if let Ok(raw) = item.cast::<PyBytes>() {
+                let json_str = std::str::from_utf8(raw.as_bytes()).map_err(|e| {
+                    PyValueError::new_err(format!(
+                        "execute_many() task {index} bytes are not valid UTF-8: {e}"
+                    ))
+                })?;
+                json_strings.push(json_str.to_owned());
+                kinds.push(BatchItemKind::Bytes);
+            } else if item.is_instance_of::<PyDict>() {
+                let json_str = py_dumps(py, &item).map_err(|e| {
+                    JsonToolsError::new_err(format!(
+                        "Failed to convert dict in task {index}: {}",
+                        e
+                    ))
+                })?;
+                json_strings.push(json_str);
+                kinds.push(BatchItemKind::Dict);
+            } else {
+                return Err(PyValueError::new_err(format!(
+                    "execute_many() task {index} input must be a JSON string, JSON bytes, or \
+                     Python dict"
+                )));
+            }
+        }
+
+        let run_task = |(index, (&config_index, json)): (usize, (&usize, &String))| {
+            let tools: &JSONTools = &configs[config_index];
+            match tools.execute(json.as_str()) {
+                Ok(JsonOutput::Single(processed)) => Ok(processed),
+                Ok(JsonOutput::Multiple(_)) => Err(crate::JsonToolsError::batch_processing_error(
+                    index,
+                    crate::JsonToolsError::input_validation_error(
+                        "Unexpected multiple results for single input",
+                    ),
+                )),
+                Err(e) => Err(crate::JsonToolsError::batch_processing_error(index, e)),
+            }
+        };
+
+        let processed: Vec<String> = py
+            .detach(|| {
+                if config_indices.len() >= *crate::config::DEFAULT_PARALLEL_THRESHOLD {
+                    config_indices
+                        .par_iter()
+                        .zip(json_strings.par_iter())
+                        .enumerate()
+                        .map(run_task)
+                        .collect::<Result<Vec<_>, _>>()
+                } else {
+                    config_indices
+                        .iter()
+                        .zip(json_strings.iter())
+                        .enumerate()
+                        .map(run_task)
+                        .collect::<Result<Vec<_>, _>>()
+                }
+            })
+            .map_err(|e| JsonToolsError::new_err(format!("Failed to execute tasks: {}", e)))?;
+
+        let out = PyList::empty(py);
+        for (processed_json, kind) in processed.into_iter().zip(kinds) {
+            match kind {
+                BatchItemKind::Str => out.append(processed_json)?,
+                BatchItemKind::Bytes => out.append(PyBytes::new(py, processed_json.as_bytes()))?,
+                BatchItemKind::Dict => {
+                    let python_dict = py_loads(py, &processed_json).map_err(|e| {
+                        JsonToolsError::new_err(format!("Failed to convert to Python dict: {}", e))
+                    })?;
+                    out.append(python_dict)?;
+                }
+            }
+        }
+        Ok(out.into_any().unbind())
+    }
+
     /// Serialize this instance's configuration to a JSON string, from which an
     /// equivalent, independent instance can be rebuilt via
     /// `JSONTools.from_config_json(...)`.
@@ -2430,7 +3384,7 @@ impl PyJSONTools {
     /// each partition.
     #[pyo3(text_signature = "($self)")]
     pub fn to_config_json(&self) -> PyResult<String> {
-        let guard = lock_config(&self.inner)?;
+        let guard = read_config(&self.inner)?;
         Ok(guard.to_config_json())
     }
 
@@ -2443,7 +3397,7 @@ impl PyJSONTools {
         let tools = crate::config_json::build_tools(config_json)
             .map_err(|e| JsonToolsError::new_err(format!("Invalid configuration: {e}")))?;
         Ok(Self {
-            inner: Mutex::new(tools),
+            inner: RwLock::new(tools),
         })
     }
 
@@ -2908,14 +3862,71 @@ fn require_active_spark_session(py: Python<'_>) -> PyResult<Bound<'_, PyAny>> {
 // (`NotImplementedError`/`ArrowNotImplementedError`) -- a confirmed dead end
 // for this ecosystem, not a laziness shortcut.
 
-/// Parse each processed (flattened) JSON string into `RawValue`-backed rows,
-/// union every row's keys in first-seen order, decide each column's real
-/// Arrow type, and build the corresponding `RecordBatch` -- all without ever
-/// boxing a scalar value into a Python object. Returns the built table and
-/// the Rust-native `Schema` it was built from (so `reconstruct_pyspark_
-/// normalise` can derive its PySpark schema directly from known Arrow
-/// `DataType`s instead of re-parsing a string type representation back out
-/// of Python).
+/// `serde` visitor collecting one flattened row's `(key, raw value)` entries, in
+/// document order, into a caller-owned buffer reused across rows -- see
+/// `build_normalise_table`.
+#[cfg(feature = "python")]
+struct NormaliseRow<'r, 'de>(&'r mut Vec<(Cow<'de, str>, &'de serde_json::value::RawValue)>);
+
+#[cfg(feature = "python")]
+impl<'de> serde::de::Visitor<'de> for NormaliseRow<'_, 'de> {
+    type Value = ();
+
+    fn expecting(&self, f: &mut std::fmt::Formatter) -> std::fmt::Result {
+        f.write_str("a JSON object")
+    }
+
+    fn visit_map<A: serde::de::MapAccess<'de>>(self, mut map: A) -> Result<(), A::Error> {
+        while let Some(NormaliseKey(key)) = map.next_key()? {
+            let raw: &'de serde_json::value::RawValue = map.next_value()?;
+            self.0.push((key, raw));
+        }
+        Ok(())
+    }
+}
+
+/// An object key borrowed from the input when it has no escapes, owned otherwise
+/// (serde's own `Cow<str>` impl always allocates).
+#[cfg(feature = "python")]
+struct NormaliseKey<'de>(Cow<'de, str>);
+
+#[cfg(feature = "python")]
+impl<'de> serde::Deserialize<'de> for NormaliseKey<'de> {
+    fn deserialize<D: serde::Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {
+        struct KeyVisitor;
+
+        impl<'de> serde::de::Visitor<'de> for KeyVisitor {
+            type Value = NormaliseKey<'de>;
+
+            fn expecting(&self, f: &mut std::fmt::Formatter) -> std::fmt::Result {
+                f.write_str("a string key")
+            }
+
+            fn visit_borrowed_str<E: serde::de::Error>(
+                self,
+                v: &'de str,
+            ) -> Result<Self::Value, E> {
+                Ok(NormaliseKey(Cow::Borrowed(v)))
+            }
+
+            fn visit_str<E: serde::de::Error>(self, v: &str) -> Result<Self::Value, E> {
+                Ok(NormaliseKey(Cow::Owned(v.to_owned())))
+            }
+
+            fn visit_string<E: serde::de::Error>(self, v: String) -> Result<Self::Value, E> {
+                Ok(NormaliseKey(Cow::Owned(v)))
+            }
+        }
+
+        deserializer.deserialize_str(KeyVisitor)
+    }
+}
+
+/// Build the normalise `RecordBatch` (see `build_normalise_batch`) and cross it
+/// into Python as one table. Returns the table and the Rust-native `Schema` it
+/// was built from (so `reconstruct_pyspark_normalise` can derive its PySpark
+/// schema directly from known Arrow `DataType`s instead of re-parsing a string
+/// type representation back out of Python).
 ///
 /// `via_pyarrow` controls how the table crosses into Python: `true` calls
 /// `PyTable::into_pyarrow` to materialize a genuine `pyarrow.Table`
@@ -2941,52 +3952,71 @@ fn build_normalise_table<'py>(
     via_pyarrow: bool,
     dates_enabled: bool,
 ) -> PyResult<(Bound<'py, PyAny>, Arc<Schema>)> {
+    let batch = build_normalise_batch(processed, dates_enabled)?;
+    let schema = batch.schema();
+    let table = PyTable::try_new(vec![batch], schema.clone())
+        .map_err(|e| JsonToolsError::new_err(format!("Failed to build Arrow table: {e}")))?;
+    Ok((table_to_python(table, py, via_pyarrow)?, schema))
+}
+
+/// Parse each processed (flattened) JSON string into `RawValue`-backed entries,
+/// union every row's keys in first-seen order, decide each column's real
+/// Arrow type, and build the corresponding `RecordBatch` -- all without ever
+/// boxing a scalar value into a Python object. Shared by `normalise=True`
+/// (one table) and `execute_columnar` (one array per column).
+///
+/// `dates_enabled` (the caller's own `.convert_dates()`/`.auto_convert_types()`
+/// setting) is described on `build_normalise_table`.
+#[cfg(feature = "python")]
+fn build_normalise_batch(processed: &[String], dates_enabled: bool) -> PyResult<RecordBatch> {
     let n_rows = processed.len();
-    let mut rows: Vec<IndexMap<std::borrow::Cow<'_, str>, &serde_json::value::RawValue>> =
-        Vec::with_capacity(n_rows);
+    // Every row's entries as two parallel flat arrays -- resolved column index and
+    // borrowed raw value -- with `row_ends[i]` marking where row `i` stops, instead
+    // of one `IndexMap` per row: no per-row map allocation, and no per-entry hashing
+    // for the common wide-DataFrame case of rows sharing one key order (see
+    // `NormaliseRow`'s positional guess below).
+    let mut entry_cols: Vec<usize> = Vec::new();
+    let mut entry_vals: Vec<&serde_json::value::RawValue> = Vec::new();
+    let mut row_ends: Vec<usize> = Vec::with_capacity(n_rows);
     let mut key_order: IndexSet<String> = IndexSet::new();
+    let mut row: Vec<(Cow<'_, str>, &serde_json::value::RawValue)> = Vec::new();
 
     for (idx, json_str) in processed.iter().enumerate() {
-        // Zero-copy borrowed-key parse first (correct whenever no key needs
-        // JSON-unescaping, the overwhelmingly common case for flattened
-        // dotted-path keys); falls back to owned keys, with the original
-        // detailed parse error, only when that fails. Real-world `normalise`
-        // input is typically many rows sharing (almost) the same column set
-        // (the whole point of a wide DataFrame), so `key_order` -- unlike
-        // each row's own field map -- still needs owned `String`s, but only
-        // the *first* row to introduce a given key should pay for one: the
-        // `contains` check below skips the allocation entirely for every
-        // row that repeats an already-seen key, rather than unconditionally
-        // cloning (and immediately discarding) a fresh String per key on
-        // every single row -- a real, measured cost at issue #31's own
-        // scale (754 rows x 4,042 columns is ~3M wasted clones otherwise).
-        let fields: IndexMap<std::borrow::Cow<'_, str>, &serde_json::value::RawValue> =
-            if let Ok(fields) =
-                serde_json::from_str::<IndexMap<&str, &serde_json::value::RawValue>>(json_str)
-            {
-                fields
-                    .into_iter()
-                    .map(|(k, v)| (std::borrow::Cow::Borrowed(k), v))
-                    .collect()
-            } else {
-                let owned: IndexMap<String, &serde_json::value::RawValue> =
-                    serde_json::from_str(json_str).map_err(|e| {
-                        JsonToolsError::new_err(format!(
-                            "normalise=True requires every flattened row to be a JSON object; \
-                             row {idx} failed to parse as one: {e}"
-                        ))
-                    })?;
-                owned
-                    .into_iter()
-                    .map(|(k, v)| (std::borrow::Cow::Owned(k), v))
-                    .collect()
+        // Keys borrow from the row text unless they need JSON-unescaping (rare for
+        // flattened dotted-path keys). Real-world `normalise` input is typically
+        // many rows sharing (almost) the same column set, so `key_order` -- unlike
+        // each row's own entries -- still needs owned `String`s, but only the
+        // *first* row to introduce a given key pays for one (issue #31's own scale,
+        // 754 rows x 4,042 columns, is ~3M wasted clones otherwise).
+        row.clear();
+        let mut de = serde_json::Deserializer::from_str(json_str);
+        serde::Deserializer::deserialize_map(&mut de, NormaliseRow(&mut row))
+            .and_then(|()| de.end())
+            .map_err(|e| {
+                JsonToolsError::new_err(format!(
+                    "normalise=True requires every flattened row to be a JSON object; \
+                     row {idx} failed to parse as one: {e}"
+                ))
+            })?;
+
+        // Rows usually repeat the previous row's key order, so the column right
+        // after the previous entry's is checked with one string compare before
+        // falling back to a hash lookup.
+        let mut prev_col = usize::MAX;
+        for (key, raw) in row.drain(..) {
+            let guess = prev_col.wrapping_add(1);
+            let col_idx = match key_order.get_index(guess) {
+                Some(k) if k.as_str() == key.as_ref() => guess,
+                _ => match key_order.get_index_of(key.as_ref()) {
+                    Some(i) => i,
+                    None => key_order.insert_full(key.into_owned()).0,
+                },
             };
-        for key in fields.keys() {
-            if !key_order.contains(key.as_ref()) {
-                key_order.insert(key.to_string());
-            }
+            entry_cols.push(col_idx);
+            entry_vals.push(raw);
+            prev_col = col_idx;
         }
-        rows.push(fields);
+        row_ends.push(entry_cols.len());
     }
 
     let n_keys = key_order.len();
@@ -2996,11 +4026,7 @@ fn build_normalise_table<'py>(
         // empty table. Arrow's own RecordBatch can't represent "N rows, 0
         // columns" (row count is derived from column lengths), the same
         // degenerate case the old PySpark-specific code special-cased.
-        let schema = Arc::new(Schema::empty());
-        let batch = RecordBatch::new_empty(schema.clone());
-        let table = PyTable::try_new(vec![batch], schema.clone())
-            .map_err(|e| JsonToolsError::new_err(format!("Failed to build empty table: {e}")))?;
-        return Ok((table_to_python(table, py, via_pyarrow)?, schema));
+        return Ok(RecordBatch::new_empty(Arc::new(Schema::empty())));
     }
 
     // Pass 1a: scatter each row's own entries into pre-sized per-column slots
@@ -3021,16 +4047,19 @@ fn build_normalise_table<'py>(
     let mut column_slots: Vec<Option<&serde_json::value::RawValue>> = vec![None; n_rows * n_keys];
     let mut any_list_per_col: Vec<bool> = vec![false; n_keys];
 
-    for (row_idx, row) in rows.iter().enumerate() {
-        for (key, raw) in row {
-            let Some(col_idx) = key_order.get_index_of(key.as_ref()) else {
-                continue; // unreachable: key_order was built from these same rows above
-            };
+    let mut row_start = 0;
+    for (row_idx, &row_end) in row_ends.iter().enumerate() {
+        for (&col_idx, &raw) in entry_cols[row_start..row_end]
+            .iter()
+            .zip(&entry_vals[row_start..row_end])
+        {
             if raw.get().as_bytes().first() == Some(&b'[') {
                 any_list_per_col[col_idx] = true;
             }
-            column_slots[col_idx * n_rows + row_idx] = Some(*raw);
+            // A key repeated within one row keeps its last value, as a map would.
+            column_slots[col_idx * n_rows + row_idx] = Some(raw);
         }
+        row_start = row_end;
     }
 
     // Pass 1b+2, per column: aggregate kind flags (scalar interpretation, or
@@ -3107,12 +4136,8 @@ fn build_normalise_table<'py>(
         }
     }
 
-    let schema = Arc::new(Schema::new(fields));
-    let batch = RecordBatch::try_new(schema.clone(), arrays)
-        .map_err(|e| JsonToolsError::new_err(format!("Failed to build record batch: {e}")))?;
-    let table = PyTable::try_new(vec![batch], schema.clone())
-        .map_err(|e| JsonToolsError::new_err(format!("Failed to build Arrow table: {e}")))?;
-    Ok((table_to_python(table, py, via_pyarrow)?, schema))
+    RecordBatch::try_new(Arc::new(Schema::new(fields)), arrays)
+        .map_err(|e| JsonToolsError::new_err(format!("Failed to build record batch: {e}")))
 }
 
 /// Cross a built `PyTable` into Python. See `build_normalise_table`'s
@@ -3272,7 +4297,7 @@ fn reconstruct_pyspark_normalise(
 //
 // This fast path reads column values directly, applies the exact same
 // per-cell value-transform logic (`convert_string_for_mode`/
-// `apply_replacement_patterns`, unchanged) directly in Rust, and writes
+// `ReplacementConfig::replace_value`, unchanged) directly in Rust, and writes
 // results back into columns/renames columns natively -- never touching
 // `to_json`/`py_loads`/`DataFrame(list_of_dicts)`. Scope: plain
 // `.flatten().execute(df)` only (not `normalise=True`, which already has its
@@ -3488,13 +4513,11 @@ fn check_arrow_fastpath_eligibility(
     let mut final_name_first_seen: IndexMap<String, usize> = IndexMap::new(); // final name -> output slot
     let mut groups: Vec<Vec<usize>> = Vec::new(); // output slot -> source column indices, in order added
     for (i, name) in column_names.iter().enumerate() {
-        if has_key_exclusions && matches_any_pattern(name, &config.replacements.key_exclusions) {
+        if has_key_exclusions && config.replacements.excludes_key(name) {
             continue;
         }
         let mut final_name = name.clone();
-        if let Some(replaced) =
-            apply_replacement_patterns(name, &config.replacements.key_replacements)
-        {
+        if let Some(replaced) = config.replacements.replace_key(name) {
             final_name = replaced;
         }
         if config.lowercase_keys {
@@ -3608,9 +4631,7 @@ fn transform_string_cell(raw: &str, config: &ProcessingConfig) -> Option<Compact
     let has_value_exclusions = config.replacements.has_value_exclusions();
 
     if has_replacements {
-        if let Some(replaced) =
-            apply_replacement_patterns(raw, &config.replacements.value_replacements)
-        {
+        if let Some(replaced) = config.replacements.replace_value(raw) {
             if config.filtering.remove_empty_strings && replaced.is_empty() {
                 return None;
             }
@@ -3623,17 +4644,13 @@ fn transform_string_cell(raw: &str, config: &ProcessingConfig) -> Option<Compact
                     if config.filtering.remove_nulls && converted == "null" {
                         return None;
                     }
-                    if has_value_exclusions
-                        && matches_any_pattern(&converted, &config.replacements.value_exclusions)
-                    {
+                    if has_value_exclusions && config.replacements.excludes_value(&converted) {
                         return None;
                     }
                     return Some(CompactString::from(converted));
                 }
             }
-            if has_value_exclusions
-                && matches_any_pattern(&replaced, &config.replacements.value_exclusions)
-            {
+            if has_value_exclusions && config.replacements.excludes_value(&replaced) {
                 return None;
             }
             return Some(quote_json_fragment(&replaced));
@@ -3647,16 +4664,14 @@ fn transform_string_cell(raw: &str, config: &ProcessingConfig) -> Option<Compact
             if config.filtering.remove_nulls && converted == "null" {
                 return None;
             }
-            if has_value_exclusions
-                && matches_any_pattern(&converted, &config.replacements.value_exclusions)
-            {
+            if has_value_exclusions && config.replacements.excludes_value(&converted) {
                 return None;
             }
             return Some(CompactString::from(converted));
         }
     }
 
-    if has_value_exclusions && matches_any_pattern(raw, &config.replacements.value_exclusions) {
+    if has_value_exclusions && config.replacements.excludes_value(raw) {
         return None;
     }
     Some(quote_json_fragment(raw))
@@ -4085,13 +5100,11 @@ fn check_pandas_fastpath_eligibility<'py>(
     let mut final_name_first_seen: IndexMap<String, usize> = IndexMap::new();
     let mut groups: Vec<Vec<usize>> = Vec::new();
     for (i, name) in column_names.iter().enumerate() {
-        if has_key_exclusions && matches_any_pattern(name, &config.replacements.key_exclusions) {
+        if has_key_exclusions && config.replacements.excludes_key(name) {
             continue;
         }
         let mut final_name = name.clone();
-        if let Some(replaced) =
-            apply_replacement_patterns(name, &config.replacements.key_replacements)
-        {
+        if let Some(replaced) = config.replacements.replace_key(name) {
             final_name = replaced;
         }
         if config.lowercase_keys {
@@ -4330,7 +5343,7 @@ impl PyJSONTools {
         df_type: DataFrameType,
     ) -> PyResult<Py<PyAny>> {
         let py = df.py();
-        let is_flatten_mode = lock_config(&self.inner)?.is_flatten_mode();
+        let is_flatten_mode = read_config(&self.inner)?.is_flatten_mode();
 
         // Populated below when the Arrow fast-path check disqualifies a
         // Polars/PyArrow DataFrame but had already extracted some string
@@ -4349,7 +5362,7 @@ impl PyJSONTools {
         if is_flatten_mode {
             match df_type {
                 DataFrameType::Polars | DataFrameType::PyArrow => {
-                    let config = ProcessingConfig::from_json_tools(&*lock_config(&self.inner)?);
+                    let config = ProcessingConfig::from_json_tools(&*read_config(&self.inner)?);
                     match check_arrow_fastpath_eligibility(df, df_type, &config)? {
                         ArrowFastpathCheck::Eligible(plan, chunked_arrays, string_values) => {
                             return execute_arrow_fastpath(
@@ -4367,7 +5380,7 @@ impl PyJSONTools {
                     }
                 }
                 DataFrameType::Pandas => {
-                    let config = ProcessingConfig::from_json_tools(&*lock_config(&self.inner)?);
+                    let config = ProcessingConfig::from_json_tools(&*read_config(&self.inner)?);
                     if let Some((plan, columns, string_values)) =
                         check_pandas_fastpath_eligibility(df, &config)?
                     {
@@ -4442,13 +5455,7 @@ impl PyJSONTools {
 
         // Step 2: Process through existing pipeline (releases GIL)
         let result = py
-            .detach(|| {
-                let mut guard = lock_config(&self.inner)?;
-                let tools = mem::take(&mut *guard);
-                let result = tools.execute(json_strings); // Batch processing
-                *guard = tools;
-                result
-            })
+            .detach(|| read_config(&self.inner)?.execute(json_strings))
             .map_err(|e| JsonToolsError::new_err(format!("Failed to process DataFrame: {}", e)))?;
 
         // Step 3: Reconstruct DataFrame from results
@@ -4460,7 +5467,7 @@ impl PyJSONTools {
                 // dict-list-then-fallback-to-list behavior.
                 DataFrameType::PySpark => {
                     let spark = require_active_spark_session(py)?;
-                    let dates_enabled = lock_config(&self.inner)?.date_conversion().enabled;
+                    let dates_enabled = read_config(&self.inner)?.date_conversion().enabled;
                     let (table, schema) =
                         build_normalise_table(py, &processed_list, true, dates_enabled)?;
                     reconstruct_pyspark_normalise(py, &spark, &table, &schema)
@@ -4526,13 +5533,7 @@ impl PyJSONTools {
 
         // Step 3: Process through existing pipeline (releases GIL)
         let result = py
-            .detach(|| {
-                let mut guard = lock_config(&self.inner)?;
-                let tools = mem::take(&mut *guard);
-                let result = tools.execute(json_strings);
-                *guard = tools;
-                result
-            })
+            .detach(|| read_config(&self.inner)?.execute(json_strings))
             .map_err(|e| JsonToolsError::new_err(format!("Failed to process Series: {}", e)))?;
 
         // Step 4: Reconstruct Series from results
@@ -4609,7 +5610,7 @@ impl PyJSONTools {
     ) -> PyResult<Py<PyAny>> {
         let py = json_input.py();
 
-        if !lock_config(&self.inner)?.is_flatten_mode() {
+        if !read_config(&self.inner)?.is_flatten_mode() {
             return Err(JsonToolsError::new_err(
                 "normalise=True requires .flatten() mode -- unflattened/nested JSON \
                  can't produce clean scalar columns for a wide DataFrame",
@@ -4630,16 +5631,10 @@ impl PyJSONTools {
             None
         };
 
-        // Process through the Rust engine (releases GIL) -- same mem::take/restore
-        // idiom `execute_dataframe`/`execute_series` above use to avoid cloning.
+        // Process through the Rust engine (releases GIL) -- same shared-lock borrow
+        // `execute_dataframe`/`execute_series` above use to avoid cloning.
         let result = py
-            .detach(|| {
-                let mut guard = lock_config(&self.inner)?;
-                let tools = mem::take(&mut *guard);
-                let result = tools.execute(json_strings);
-                *guard = tools;
-                result
-            })
+            .detach(|| read_config(&self.inner)?.execute(json_strings))
             .map_err(|e| JsonToolsError::new_err(format!("Failed to process JSON: {}", e)))?;
 
         let processed_list = match result {
@@ -4651,7 +5646,7 @@ impl PyJSONTools {
         // -- see `build_normalise_table`'s `via_pyarrow` doc comment); every
         // other target needs a genuine `pyarrow.Table` regardless.
         let via_pyarrow = resolved_target != NormaliseTarget::Polars;
-        let dates_enabled = lock_config(&self.inner)?.date_conversion().enabled;
+        let dates_enabled = read_config(&self.inner)?.date_conversion().enabled;
         let (table, schema) =
             build_normalise_table(py, &processed_list, via_pyarrow, dates_enabled)?;
 
@@ -4669,6 +5664,46 @@ impl PyJSONTools {
     }
 }
 
+/// Minify a JSON document (`str` or `bytes`), returning the compact form as the
+/// same type.
+///
+/// Replaces the `json.dumps(json.loads(s), separators=(",", ":"))` idiom: that
+/// builds a full Python object graph only to serialize it straight back, in two
+/// interpreter round trips. Here the input is borrowed in place (same as
+/// `execute_ndjson`) and minified by `crate::compact` -- one structural scan and
+/// one token-copying walk -- with the GIL released. Strings and numbers are
+/// copied through verbatim rather than re-escaped or reformatted.
+///
+/// # Errors
+/// * `JsonToolsError` for malformed JSON
+/// * `ValueError` if `data` is neither `str` nor `bytes`, or `bytes` that
+///   aren't valid UTF-8
+#[cfg(feature = "python")]
+#[pyfunction(name = "compact")]
+#[pyo3(text_signature = "(data)")]
+fn py_compact(data: &Bound<'_, PyAny>) -> PyResult<Py<PyAny>> {
+    let py = data.py();
+    let (text, as_bytes): (Cow<'_, str>, bool) = if let Ok(bytes) = data.cast::<PyBytes>() {
+        let text = std::str::from_utf8(bytes.as_bytes())
+            .map_err(|e| PyValueError::new_err(format!("JSON bytes are not valid UTF-8: {e}")))?;
+        (Cow::Borrowed(text), true)
+    } else if let Ok(string) = data.cast::<PyString>() {
+        (string.to_cow()?, false)
+    } else {
+        return Err(PyValueError::new_err("data must be a JSON str or bytes"));
+    };
+
+    let output = py
+        .detach(|| crate::compact(&text))
+        .map_err(|e| JsonToolsError::new_err(format!("Failed to compact JSON: {}", e)))?;
+
+    if as_bytes {
+        Ok(PyBytes::new(py, output.as_bytes()).into_any().unbind())
+    } else {
+        Ok(output.into_pyobject(py)?.into_any().unbind())
+    }
+}
+
 /// Python module definition
 #[cfg(feature = "python")]
 #[pymodule]
@@ -4679,6 +5714,15 @@ fn json_tools_rs(m: &Bound<'_, PyModule>) -> PyResult<()> {
     // Add the JsonOutput class for results
     m.add_class::<PyJsonOutput>()?;
 
+    // Add the iterator class returned by iter_flatten()
+    m.add_class::<PyFlattenIterator>()?;
+
+    // Add the schema-specialized flattener returned by compile()
+    m.add_class::<PyCompiledSchema>()?;
+
+    // Add standalone helpers
+    m.add_function(wrap_pyfunction!(py_compact, m)?)?;
+
     // Add the custom exception
     m.add("JsonToolsError", m.py().get_type::<JsonToolsError>())?;
 
@@ -0,0 +1,596 @@
+//! Schema-specialized flattening (`JSONTools::compile_schema`).
+//!
+//! A batch of records that all share one shape pays, on every row, for work
+//! whose answer never changes: building each key path segment by segment,
+//! lowercasing it, running it through the key replacements and exclusions,
+//! and (on the collecting path) resolving collisions. `CompiledSchema` does
+//! all of that once, at compile time, by running the real engine over a
+//! sample document built from the schema -- so every output key is exactly
+//! what `execute()` would produce, by construction rather than by a second
+//! implementation of the key rules. Per row, only a lockstep walk of the
+//! tape against the schema remains: match each member to its field, check
+//! each leaf's type, and copy `"key":` plus the raw value bytes.
+
+use crate::config::{ProcessingConfig, TypeConversionMode};
+use crate::error::JsonToolsError;
+use crate::flatten::{
+    escape_json_string, process_single_json, scan_and_fixup, tape_content_str, tape_entry,
+    tape_quoted_str, tape_scalar_bytes, trim_ascii, unescape_json_string, EntryKind, TapeEntry,
+};
+use crate::fxhash::FxHashMap;
+use crate::json_parser;
+use crate::types::{JsonInput, JsonOutput};
+use crate::JSONTools;
+use serde_json::Value;
+use smallvec::{smallvec, SmallVec};
+
+/// Leaf type names accepted in a schema, each optionally suffixed with `?` to
+/// also accept `null`.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum LeafKind {
+    String,
+    /// A number with no fraction or exponent.
+    Integer,
+    /// Any JSON number.
+    Number,
+    Boolean,
+    Null,
+}
+
+impl LeafKind {
+    fn parse(name: &str) -> Option<Self> {
+        match name {
+            "string" => Some(Self::String),
+            "integer" => Some(Self::Integer),
+            "number" => Some(Self::Number),
+            "boolean" => Some(Self::Boolean),
+            "null" => Some(Self::Null),
+            _ => None,
+        }
+    }
+
+    fn name(self) -> &'static str {
+        match self {
+            Self::String => "string",
+            Self::Integer => "integer",
+            Self::Number => "number",
+            Self::Boolean => "boolean",
+            Self::Null => "null",
+        }
+    }
+
+    /// Whether the (trimmed, scanner-validated) non-`null` scalar `bytes` is a
+    /// value of this kind.
+    #[inline]
+    fn accepts_scalar(self, bytes: &[u8]) -> bool {
+        match self {
+            Self::Integer => {
+                matches!(bytes.first(), Some(b'-' | b'0'..=b'9'))
+                    && !bytes.iter().any(|&b| matches!(b, b'.' | b'e' | b'E'))
+            }
+            Self::Number => matches!(bytes.first(), Some(b'-' | b'0'..=b'9')),
+            Self::Boolean => bytes == b"true" || bytes == b"false",
+            Self::String | Self::Null => false,
+        }
+    }
+}
+
+#[derive(Debug)]
+struct Field {
+    /// The member name as it reads once unescaped.
+    name: String,
+    /// The member name as `escape_json_string` spells it inside quotes -- what
+    /// a row almost always contains, so matching compares raw bytes first.
+    raw_name: String,
+    node: SchemaNode,
+}
+
+#[derive(Debug)]
+enum NodeKind {
+    Object(Vec<Field>),
+    /// Fixed-length: one schema per element position.
+    Array(Vec<SchemaNode>),
+    Leaf {
+        kind: LeafKind,
+        nullable: bool,
+        /// Index into `CompiledSchema::keys`.
+        slot: usize,
+    },
+}
+
+#[derive(Debug)]
+struct SchemaNode {
+    /// Unescaped path from the root, joined with the separator -- for error
+    /// messages only.
+    path: Box<str>,
+    kind: NodeKind,
+}
+
+/// A flattener specialized to one fixed document shape, built by
+/// [`JSONTools::compile_schema`].
+///
+/// `execute` accepts the same inputs as `JSONTools::execute` and, for every
+/// row that matches the schema, returns exactly what `execute()` on the
+/// originating `JSONTools` would. A row that does not match -- a missing or
+/// unexpected key, a repeated key, a leaf of the wrong type, an array of the
+/// wrong length -- is rejected with an `InputValidationError` naming the path,
+/// rather than being flattened into a differently-shaped result.
+#[derive(Debug)]
+pub struct CompiledSchema {
+    root: SchemaNode,
+    /// Per leaf slot, the output prefix `"key":` as `execute()` writes it, or
+    /// `None` for a leaf dropped by the key exclusions.
+    keys: Vec<Option<Box<str>>>,
+    config: ProcessingConfig,
+    /// True on the collecting path (lowercase keys, key replacements), where
+    /// `execute()` re-escapes every key; false on the direct path, where a key
+    /// is copied as the input spells it.
+    canonical_keys: bool,
+}
+
+impl CompiledSchema {
+    /// Compile `schema` against the flatten settings in `config`. The caller
+    /// (`JSONTools::compile_schema`) has already checked the mode and the
+    /// common settings.
+    pub(crate) fn new(config: ProcessingConfig, schema: &str) -> Result<Self, JsonToolsError> {
+        if config.replacements.has_value_replacements()
+            || config.replacements.has_value_exclusions()
+            || config.type_conversion_mode != TypeConversionMode::Disabled
+            || config.collision.has_collision_handling()
+            || config.collision.has_always_array_keys()
+            || config.max_depth.is_some()
+            || !config.selected_paths.is_empty()
+        {
+            return Err(JsonToolsError::configuration_error(
+                "compile_schema supports separator, lowercase_keys, key replacements, key \
+                 exclusions and the remove_* filters only: value replacements/exclusions, \
+                 type conversion, handle_key_collision, always_array_keys, max_depth and \
+                 select_paths are not supported. Use execute() instead",
+            ));
+        }
+
+        let value = json_parser::parse_json(schema).map_err(|e| {
+            JsonToolsError::configuration_error(format!("Schema is not valid JSON: {e}"))
+        })?;
+        if !value.is_object() && !value.is_array() {
+            return Err(JsonToolsError::configuration_error(
+                "Schema root must be an object or an array",
+            ));
+        }
+        let mut sample = String::with_capacity(schema.len());
+        let mut slots = 0;
+        let root = parse_node(
+            &value,
+            String::new(),
+            &config.separator,
+            &mut sample,
+            &mut slots,
+        )?;
+
+        // Every leaf's key, from the real engine with exclusions off -- so two
+        // leaves that flatten to the same key are caught even if one of them
+        // would later be excluded.
+        let mut unfiltered = config.clone();
+        unfiltered.replacements.key_exclusions.clear();
+        let mut keys = vec![None; slots];
+        let mut seen: FxHashMap<Box<str>, usize> = FxHashMap::default();
+        for (key, slot) in flattened_slots(&process_single_json(&sample, &unfiltered)?)? {
+            if let Some(&other) = seen.get(&key) {
+                return Err(leaf_collision(&root, other, &key));
+            }
+            seen.insert(key.clone(), slot);
+            keys[slot] = Some(format!("{key}:").into_boxed_str());
+        }
+        // A collecting-path collision keeps only the last leaf: the dropped one
+        // is simply absent from the output.
+        if let Some(missing) = keys.iter().position(Option::is_none) {
+            return Err(leaf_collision(&root, missing, "shared with a later leaf"));
+        }
+
+        if config.replacements.has_key_exclusions() {
+            let mut kept = vec![false; slots];
+            for (_, slot) in flattened_slots(&process_single_json(&sample, &config)?)? {
+                kept[slot] = true;
+            }
+            for (key, kept) in keys.iter_mut().zip(kept) {
+                if !kept {
+                    *key = None;
+                }
+            }
+        }
+
+        let canonical_keys = config.lowercase_keys || config.replacements.has_key_replacements();
+        Ok(Self {
+            root,
+            keys,
+            config,
+            canonical_keys,
+        })
+    }
+
+    /// Flatten `json_input` -- one document or a batch, exactly as
+    /// `JSONTools::execute` accepts it. A batch is processed in parallel above
+    /// the originating instance's `parallel_threshold`, and a failing row is
+    /// reported as a `BatchProcessingError` carrying its index.
+    ///
+    /// # Errors
+    /// * `InputValidationError` for a row that does not match the schema
+    /// * The usual parse errors for malformed JSON
+    pub fn execute<'a, T>(&self, json_input: T) -> Result<JsonOutput, JsonToolsError>
+    where
+        T: Into<JsonInput<'a>>,
+    {
+        JSONTools::execute_with_processor(json_input.into(), &self.config, |json, _| {
+            self.flatten_row(json)
+        })
+    }
+
+    /// Flatten one row against the schema.
+    fn flatten_row(&self, json: &str) -> Result<String, JsonToolsError> {
+        let input = json.as_bytes();
+        if input.len() > u32::MAX as usize {
+            return Err(JsonToolsError::input_validation_error(
+                "Input exceeds 4 GiB limit",
+            ));
+        }
+        let tape = scan_and_fixup(input)?;
+        if tape.is_empty() {
+            return Err(JsonToolsError::input_validation_error("Empty JSON input"));
+        }
+        let mut row = RowWalk {
+            input,
+            tape: &tape,
+            keys: &self.keys,
+            remove_nulls: self.config.filtering.remove_nulls,
+            remove_empty_strings: self.config.filtering.remove_empty_strings,
+            canonical_keys: self.canonical_keys,
+            respelled: false,
+            output: String::with_capacity(input.len() * 3 / 2),
+        };
+        row.output.push('{');
+        row.walk(&self.root, 0)?;
+        if row.respelled {
+            // The row matched, but spells a key with escapes the schema's sample
+            // does not use -- and on the direct path `execute()` copies keys as
+            // spelled. Let the engine produce that spelling.
+            return process_single_json(json, &self.config);
+        }
+        row.output.push('}');
+        Ok(row.output)
+    }
+}
+
+/// Per-row state for the lockstep walk of a row's tape against the schema.
+struct RowWalk<'a> {
+    input: &'a [u8],
+    tape: &'a [TapeEntry],
+    keys: &'a [Option<Box<str>>],
+    remove_nulls: bool,
+    remove_empty_strings: bool,
+    canonical_keys: bool,
+    /// Set when a member name matched only after unescaping.
+    respelled: bool,
+    output: String,
+}
+
+impl RowWalk<'_> {
+    /// Check (and emit) the value at tape index `idx` against `node`, returning
+    /// the index just past it.
+    fn walk(&mut self, node: &SchemaNode, idx: usize) -> Result<usize, JsonToolsError> {
+        let Some(&entry) = self.tape.get(idx) else {
+            return Err(mismatch(&node.path, "a value"));
+        };
+        match &node.kind {
+            NodeKind::Leaf {
+                kind,
+                nullable,
+                slot,
+            } => {
+                self.leaf(node, entry, *kind, *nullable, *slot)?;
+                Ok(idx + 1)
+            }
+            NodeKind::Object(fields) => {
+                if entry.kind() != EntryKind::ObjectStart {
+                    return Err(mismatch(&node.path, "an object"));
+                }
+                let end = entry.aux() as usize;
+                let mut seen: SmallVec<[bool; 32]> = smallvec![false; fields.len()];
+                let mut matched = 0;
+                let mut cursor = idx + 1;
+                while cursor < end {
+                    let key = tape_entry(self.tape, cursor);
+                    if key.kind() != EntryKind::StringStart {
+                        cursor += 1;
+                        continue;
+                    }
+                    let mut value_idx = cursor + 1;
+                    if value_idx < end
+                        && tape_entry(self.tape, value_idx).kind() == EntryKind::Colon
+                    {
+                        value_idx += 1;
+                    }
+                    // Rows usually list members in schema order: try that position
+                    // before scanning.
+                    let pos = self.find_field(node, fields, key, matched)?;
+                    if seen[pos] {
+                        return Err(JsonToolsError::input_validation_error(format!(
+                            "Input does not match the compiled schema: key {:?} repeated at {}",
+                            fields[pos].name,
+                            describe(&node.path)
+                        )));
+                    }
+                    seen[pos] = true;
+                    matched += 1;
+                    cursor = self.walk(&fields[pos].node, value_idx)?;
+                }
+                if matched != fields.len() {
+                    let missing = seen.iter().position(|&s| !s).unwrap_or(0);
+                    return Err(JsonToolsError::input_validation_error(format!(
+                        "Input does not match the compiled schema: key {:?} missing at {}",
+                        fields[missing].name,
+                        describe(&node.path)
+                    )));
+                }
+                Ok(end + 1)
+            }
+            NodeKind::Array(elements) => {
+                if entry.kind() != EntryKind::ArrayStart {
+                    return Err(mismatch(&node.path, "an array"));
+                }
+                let end = entry.aux() as usize;
+                let mut count = 0;
+                let mut cursor = idx + 1;
+                while cursor < end {
+                    if tape_entry(self.tape, cursor).kind() == EntryKind::Comma {
+                        cursor += 1;
+                        continue;
+                    }
+                    let Some(element) = elements.get(count) else {
+                        break;
+                    };
+                    cursor = self.walk(element, cursor)?;
+                    count += 1;
+                }
+                if cursor < end || count != elements.len() {
+                    return Err(JsonToolsError::input_validation_error(format!(
+                        "Input does not match the compiled schema: expected {} elements at {}",
+                        elements.len(),
+                        describe(&node.path)
+                    )));
+                }
+                Ok(end + 1)
+            }
+        }
+    }
+
+    /// Index in `fields` of the member whose key is `key`, trying `hint` first.
+    fn find_field(
+        &mut self,
+        node: &SchemaNode,
+        fields: &[Field],
+        key: TapeEntry,
+        hint: usize,
+    ) -> Result<usize, JsonToolsError> {
+        let raw = tape_content_str(self.input, key);
+        if fields.get(hint).is_some_and(|f| f.raw_name == raw) {
+            return Ok(hint);
+        }
+        if let Some(pos) = fields.iter().position(|f| f.raw_name == raw) {
+            return Ok(pos);
+        }
+        if key.string_has_escapes() {
+            let name = unescape_json_string(raw);
+            if let Some(pos) = fields.iter().position(|f| f.name == name) {
+                self.respelled |= !self.canonical_keys;
+                return Ok(pos);
+            }
+        }
+        Err(JsonToolsError::input_validation_error(format!(
+            "Input does not match the compiled schema: unexpected key {:?} at {}",
+            unescape_json_string(raw),
+            describe(&node.path)
+        )))
+    }
+
+    #[inline]
+    fn leaf(
+        &mut self,
+        node: &SchemaNode,
+        entry: TapeEntry,
+        kind: LeafKind,
+        nullable: bool,
+        slot: usize,
+    ) -> Result<(), JsonToolsError> {
+        let value = match entry.kind() {
+            EntryKind::StringStart if kind == LeafKind::String => {
+                if self.remove_empty_strings && entry.string_content_len() == 0 {
+                    return Ok(());
+                }
+                tape_quoted_str(self.input, entry).as_bytes()
+            }
+            EntryKind::ScalarStart => {
+                let bytes = trim_ascii(tape_scalar_bytes(self.input, entry));
+                if bytes == b"null" {
+                    if !nullable && kind != LeafKind::Null {
+                        return Err(leaf_mismatch(node, kind, nullable));
+                    }
+                    if self.remove_nulls {
+                        return Ok(());
+                    }
+                } else if !kind.accepts_scalar(bytes) {
+                    return Err(leaf_mismatch(node, kind, nullable));
+                }
+                bytes
+            }
+            _ => return Err(leaf_mismatch(node, kind, nullable)),
+        };
+        if let Some(key) = &self.keys[slot] {
+            if self.output.len() > 1 {
+                self.output.push(',');
+            }
+            self.output.push_str(key);
+            // SAFETY: JSON input is valid UTF-8
+            self.output
+                .push_str(unsafe { std::str::from_utf8_unchecked(value) });
+        }
+        Ok(())
+    }
+}
+
+/// Build the schema node for `value` at `path`, appending the matching sample
+/// document (each leaf replaced by its slot number) to `sample`.
+fn parse_node(
+    value: &Value,
+    path: String,
+    separator: &str,
+    sample: &mut String,
+    slots: &mut usize,
+) -> Result<SchemaNode, JsonToolsError> {
+    let child_path = |segment: &str| {
+        if path.is_empty() {
+            segment.to_string()
+        } else {
+            format!("{path}{separator}{segment}")
+        }
+    };
+    let kind = match value {
+        Value::String(name) => {
+            let (name, nullable) = match name.strip_suffix('?') {
+                Some(base) => (base, true),
+                None => (name.as_str(), false),
+            };
+            let kind = LeafKind::parse(name).ok_or_else(|| {
+                JsonToolsError::configuration_error(format!(
+                    "Unknown schema type {name:?} at {}: expected \"string\", \"integer\", \
+                     \"number\", \"boolean\" or \"null\", optionally suffixed with \"?\"",
+                    describe(&path)
+                ))
+            })?;
+            let slot = *slots;
+            *slots += 1;
+            sample.push_str(&slot.to_string());
+            NodeKind::Leaf {
+                kind,
+                nullable,
+                slot,
+            }
+        }
+        Value::Object(members) if !members.is_empty() => {
+            sample.push('{');
+            let mut fields = Vec::with_capacity(members.len());
+            for (i, (name, member)) in members.iter().enumerate() {
+                if i > 0 {
+                    sample.push(',');
+                }
+                let raw_name = escape_json_string(name).into_owned();
+                sample.push('"');
+                sample.push_str(&raw_name);
+                sample.push_str("\":");
+                fields.push(Field {
+                    name: name.clone(),
+                    raw_name,
+                    node: parse_node(member, child_path(name), separator, sample, slots)?,
+                });
+            }
+            sample.push('}');
+            NodeKind::Object(fields)
+        }
+        Value::Array(items) if !items.is_empty() => {
+            sample.push('[');
+            let mut elements = Vec::with_capacity(items.len());
+            for (i, item) in items.iter().enumerate() {
+                if i > 0 {
+                    sample.push(',');
+                }
+                elements.push(parse_node(
+                    item,
+                    child_path(&i.to_string()),
+                    separator,
+                    sample,
+                    slots,
+                )?);
+            }
+            sample.push(']');
+            NodeKind::Array(elements)
+        }
+        _ => {
+            return Err(JsonToolsError::configuration_error(format!(
+                "Invalid schema at {}: expected a type name, a non-empty object or a \
+                 non-empty array",
+                describe(&path)
+            )))
+        }
+    };
+    Ok(SchemaNode {
+        path: path.into_boxed_str(),
+        kind,
+    })
+}
+
+/// The `(quoted key, slot)` pairs of a flattened sample document.
+fn flattened_slots(flat: &str) -> Result<Vec<(Box<str>, usize)>, JsonToolsError> {
+    let input = flat.as_bytes();
+    let tape = scan_and_fixup(input)?;
+    let mut pairs = Vec::new();
+    let mut cursor = 1;
+    while cursor + 2 < tape.len() {
+        let key = tape_entry(&tape, cursor);
+        let value = tape_entry(&tape, cursor + 2);
+        if key.kind() == EntryKind::StringStart && value.kind() == EntryKind::ScalarStart {
+            let digits = trim_ascii(tape_scalar_bytes(input, value));
+            // SAFETY: scanner-validated scalars are ASCII
+            let slot = unsafe { std::str::from_utf8_unchecked(digits) }
+                .parse()
+                .map_err(|_| {
+                    JsonToolsError::configuration_error("Schema sample did not flatten to slots")
+                })?;
+            pairs.push((tape_quoted_str(input, key).into(), slot));
+        }
+        cursor += 4; // key, colon, value, comma
+    }
+    Ok(pairs)
+}
+
+/// The path of the leaf with `slot`, for collision errors.
+fn slot_path(node: &SchemaNode, slot: usize) -> Option<&str> {
+    match &node.kind {
+        NodeKind::Leaf { slot: s, .. } => (*s == slot).then_some(&*node.path),
+        NodeKind::Object(fields) => fields.iter().find_map(|f| slot_path(&f.node, slot)),
+        NodeKind::Array(elements) => elements.iter().find_map(|e| slot_path(e, slot)),
+    }
+}
+
+#[cold]
+fn leaf_collision(root: &SchemaNode, slot: usize, key: &str) -> JsonToolsError {
+    JsonToolsError::configuration_error(format!(
+        "Schema leaf {} flattens to the same key as another leaf ({key}); adjust the \
+         key replacements or the separator",
+        describe(slot_path(root, slot).unwrap_or_default())
+    ))
+}
+
+#[cold]
+fn mismatch(path: &str, expected: &str) -> JsonToolsError {
+    JsonToolsError::input_validation_error(format!(
+        "Input does not match the compiled schema: expected {expected} at {}",
+        describe(path)
+    ))
+}
+
+#[cold]
+fn leaf_mismatch(node: &SchemaNode, kind: LeafKind, nullable: bool) -> JsonToolsError {
+    let expected = if nullable {
+        format!("{} or null", kind.name())
+    } else {
+        kind.name().to_string()
+    };
+    mismatch(&node.path, &expected)
+}
+
+fn describe(path: &str) -> String {
+    if path.is_empty() {
+        "the root".to_string()
+    } else {
+        format!("{path:?}")
+    }
+}
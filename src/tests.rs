@@ -87,6 +87,328 @@ mod unit_tests {
         assert_eq!(parsed["user::age"], 30);
     }
 
+    #[test]
+    fn test_single_byte_and_multibyte_separators_join_keys_and_indices() {
+        // One-byte separators take the single-byte store in `SeparatorCache`;
+        // everything else (including a one-char but multi-byte separator) goes
+        // through `push_str`. Both must join object keys and array indices alike.
+        let json = r#"{"a": {"b": [10, {"c": true}]}}"#;
+        for (sep, expected) in [
+            (".", ["a.b.0", "a.b.1.c"]),
+            ("_", ["a_b_0", "a_b_1_c"]),
+            ("->", ["a->b->0", "a->b->1->c"]),
+            ("→", ["a→b→0", "a→b→1→c"]),
+        ] {
+            let result = JSONTools::new()
+                .flatten()
+                .separator(sep)
+                .execute(json)
+                .unwrap();
+            let parsed: Value = serde_json::from_str(&extract_single(result)).unwrap();
+            assert_eq!(parsed[expected[0]], 10, "separator {sep:?}");
+            assert_eq!(parsed[expected[1]], true, "separator {sep:?}");
+        }
+    }
+
+    #[test]
+    fn test_recycled_path_buffer_starts_clean_per_document() {
+        // The flatten path buffer is parked per thread between documents; a short
+        // document after a deep one (and a batch run sequentially on this thread)
+        // must never see the previous document's path bytes.
+        let deep = r#"{"a_very_long_segment_name": {"another_long_segment": {"leaf": 1}}}"#;
+        let short = r#"{"b": 2}"#;
+        let tools = JSONTools::new().flatten();
+        for _ in 0..3 {
+            let parsed: Value =
+                serde_json::from_str(&extract_single(tools.execute(deep).unwrap())).unwrap();
+            assert_eq!(
+                parsed["a_very_long_segment_name.another_long_segment.leaf"],
+                1
+            );
+            assert_eq!(extract_single(tools.execute(short).unwrap()), r#"{"b":2}"#);
+        }
+        let results = extract_multiple(
+            JSONTools::new()
+                .flatten()
+                .lowercase_keys(true)
+                .execute(vec![deep, short, short])
+                .unwrap(),
+        );
+        assert_eq!(results[1], r#"{"b":2}"#);
+        assert_eq!(results[2], r#"{"b":2}"#);
+    }
+
+    #[test]
+    fn test_recycled_tape_starts_clean_per_document() {
+        // The scanned tape is parked per thread between documents too, and shared by
+        // every mode's walker: a small document after a large one -- and after a
+        // document that failed to scan -- must only ever see its own entries.
+        let large = format!(
+            "{{{}}}",
+            (0..200)
+                .map(|i| format!(r#""k{i}": [{i}, "v{i}"]"#))
+                .collect::<Vec<_>>()
+                .join(",")
+        );
+        for _ in 0..3 {
+            let flat = extract_single(JSONTools::new().flatten().execute(large.as_str()).unwrap());
+            assert!(flat.contains(r#""k199.1":"v199""#));
+            assert!(JSONTools::new().flatten().execute(r#"{"a": [1, "#).is_err());
+            assert_eq!(
+                extract_single(JSONTools::new().flatten().execute(r#"{"a": [1]}"#).unwrap()),
+                r#"{"a.0":1}"#
+            );
+            assert_eq!(
+                extract_single(
+                    JSONTools::new()
+                        .unflatten()
+                        .execute(r#"{"a.b": 1}"#)
+                        .unwrap()
+                ),
+                r#"{"a":{"b":1}}"#
+            );
+            assert_eq!(
+                extract_single(JSONTools::new().normal().execute(r#"{"c": 3}"#).unwrap()),
+                r#"{"c":3}"#
+            );
+        }
+    }
+
+    #[test]
+    fn test_compiled_replacements_match_per_call_path() {
+        // `ReplacementConfig`'s once-per-config compiled patterns must agree with
+        // the per-call `apply_replacement_patterns` / `matches_any_pattern` for
+        // every kind: plain literal, lowerable regex, `$`-group regex (never
+        // lowered), real regex, `^`-anchored regex gated on its literal prefix,
+        // and an invalid regex (silently never matches).
+        use crate::config::ReplacementConfig;
+        use crate::transform::{apply_replacement_patterns, matches_any_pattern};
+
+        let mut config = ReplacementConfig::new();
+        for (find, replace) in [
+            ("user_", "u_"),
+            ("r'^(admin|root)_'", "sys_"),
+            ("r'(\\w+)@example\\.com'", "$1@test.org"),
+            ("r'\\d{3}-\\d{4}'", "<phone>"),
+            ("r'^acct_(\\d+)'", "id_$1"),
+            ("r'(unclosed'", "never"),
+        ] {
+            config
+                .key_replacements
+                .push((find.to_string(), replace.to_string()));
+            config
+                .value_replacements
+                .push((find.to_string(), replace.to_string()));
+        }
+        for pattern in ["tmp", "r'_id$'", "r'^\\d+$'", "r'^tmp_\\d'", "r'[bad'"] {
+            config.key_exclusions.push(pattern.to_string());
+            config.value_exclusions.push(pattern.to_string());
+        }
+
+        for s in [
+            "user_name",
+            "admin_user_",
+            "bob@example.com",
+            "call 555-1234",
+            "acct_42",
+            "tmp_9",
+            "order_id",
+            "12345",
+            "tmp_file",
+            "plain",
+            "",
+        ] {
+            assert_eq!(
+                config.replace_key(s),
+                apply_replacement_patterns(s, &config.key_replacements),
+                "key replacement mismatch on {s:?}"
+            );
+            assert_eq!(
+                config.replace_value(s),
+                apply_replacement_patterns(s, &config.value_replacements),
+                "value replacement mismatch on {s:?}"
+            );
+            assert_eq!(
+                config.excludes_key(s),
+                matches_any_pattern(s, &config.key_exclusions),
+                "key exclusion mismatch on {s:?}"
+            );
+            assert_eq!(
+                config.excludes_value(s),
+                matches_any_pattern(s, &config.value_exclusions),
+                "value exclusion mismatch on {s:?}"
+            );
+        }
+
+        // Editing the public lists after first use must not be masked by the
+        // stale compiled cache.
+        config.key_exclusions.push("plain".to_string());
+        assert!(config.excludes_key("plain"));
+
+        // ... nor can an in-place edit that keeps every list's length.
+        config.key_exclusions[0] = "r'^zzz'".to_string();
+        config.key_replacements[0].0 = "r'^acct_'".to_string();
+        config.value_replacements[0].1 = "[redacted]".to_string();
+        config.value_exclusions[0] = "nothing-matches-this".to_string();
+        for s in ["user_name", "zzz_1", "acct_9", "a@example.com", "plain"] {
+            assert_eq!(
+                config.replace_key(s),
+                apply_replacement_patterns(s, &config.key_replacements),
+                "edited key replacement mismatch on {s:?}"
+            );
+            assert_eq!(
+                config.replace_value(s),
+                apply_replacement_patterns(s, &config.value_replacements),
+                "edited value replacement mismatch on {s:?}"
+            );
+            assert_eq!(
+                config.excludes_key(s),
+                matches_any_pattern(s, &config.key_exclusions),
+                "edited key exclusion mismatch on {s:?}"
+            );
+            assert_eq!(
+                config.excludes_value(s),
+                matches_any_pattern(s, &config.value_exclusions),
+                "edited value exclusion mismatch on {s:?}"
+            );
+        }
+        assert!(config.excludes_key("zzz_1"));
+    }
+
+    #[test]
+    fn test_prefiltered_key_replacements_match_sequential_order() {
+        // A long key-replacement list is narrowed by one `RegexSet` scan, but rules
+        // must still apply in list order to the previous rule's output: a rewrite
+        // can create a match for a later rule ("acct_" -> "account_" feeds
+        // "account"), destroy one ("tmp_" is gone before "tmp_x" is tried), and
+        // an earlier rule never re-runs on a later rule's output ("sys" below).
+        use crate::config::ReplacementConfig;
+        use crate::transform::{apply_replacement_patterns, REPLACEMENT_PREFILTER_MIN_PATTERNS};
+
+        let rules = [
+            ("sys", "system"),
+            ("acct_", "account_"),
+            ("tmp_", "t_"),
+            ("tmp_x", "never"),
+            ("r'^(admin|root)_'", "sys_"),
+            ("account", "acc"),
+            ("r'(\\w+)@example\\.com'", "$1@test.org"),
+            ("r'\\d{3}-\\d{4}'", "<phone>"),
+            ("r'(?i)^USER_'", "u_"),
+        ];
+        assert!(rules.len() >= REPLACEMENT_PREFILTER_MIN_PATTERNS);
+        let mut config = ReplacementConfig::new();
+        for (find, replace) in rules {
+            config = config.add_key_replacement(find, replace);
+        }
+
+        for s in [
+            "acct_id",
+            "tmp_x_total",
+            "admin_name",
+            "bob@example.com",
+            "call 555-1234",
+            "User_Name",
+            "plain",
+            "",
+        ] {
+            assert_eq!(
+                config.replace_key(s),
+                apply_replacement_patterns(s, &config.key_replacements),
+                "prefiltered key replacement mismatch on {s:?}"
+            );
+        }
+        assert_eq!(config.replace_key("acct_id").as_deref(), Some("acc_id"));
+        assert_eq!(config.replace_key("admin_x").as_deref(), Some("sys_x"));
+        assert_eq!(config.replace_key("plain"), None);
+    }
+
+    #[test]
+    fn test_compiled_replacements_follow_instance_edits() {
+        // Compiled patterns are cached on the `JSONTools` instance and reused by
+        // every `execute()`; adding a pattern (on the instance or on a clone)
+        // must start a fresh cache rather than reuse the stale compilation.
+        let tools = JSONTools::new()
+            .flatten()
+            .key_replacement("r'^user_'", "u_")
+            .value_replacement("@example.com", "@test.org");
+        let input = r#"{"user_name": "bob@example.com", "user_id": 1}"#;
+        let expected = r#"{"u_name":"bob@test.org","u_id":1}"#;
+        for _ in 0..3 {
+            let result = extract_single(tools.execute(input).unwrap());
+            assert_eq!(
+                serde_json::from_str::<Value>(&result).unwrap(),
+                serde_json::from_str::<Value>(expected).unwrap()
+            );
+        }
+
+        let extended = tools.clone().key_replacement("u_id", "uid");
+        let result = extract_single(extended.execute(input).unwrap());
+        let parsed: Value = serde_json::from_str(&result).unwrap();
+        assert_eq!(parsed["uid"], 1);
+        assert_eq!(parsed["u_name"], "bob@test.org");
+
+        // The original instance still uses its own patterns.
+        let result = extract_single(tools.execute(input).unwrap());
+        let parsed: Value = serde_json::from_str(&result).unwrap();
+        assert_eq!(parsed["u_id"], 1);
+    }
+
+    #[test]
+    fn test_memoized_key_replacements_are_per_config() {
+        // Regex key replacements are memoized per thread, per config: repeated
+        // lookups must keep returning the computed answer, and configs used
+        // alternately on the same thread must never see each other's results.
+        use crate::config::ReplacementConfig;
+
+        let first = ReplacementConfig::new().add_key_replacement("r'^user_(\\w+)'", "u.$1");
+        let second = ReplacementConfig::new().add_key_replacement("r'^user_(\\w+)'", "member.$1");
+        for _ in 0..3 {
+            assert_eq!(first.replace_key("user_name").as_deref(), Some("u.name"));
+            assert_eq!(first.replace_key("id"), None);
+            assert_eq!(
+                second.replace_key("user_name").as_deref(),
+                Some("member.name")
+            );
+            assert_eq!(second.replace_key("id"), None);
+        }
+
+        // More configs than the memo keeps side by side, so the least recently
+        // used is evicted and refilled on each round; long keys bypass the memo.
+        let configs: Vec<ReplacementConfig> = (0..6)
+            .map(|i| {
+                ReplacementConfig::new().add_key_replacement("r'^user_(\\w+)'", format!("c{i}.$1"))
+            })
+            .collect();
+        let long_key = format!("user_{}", "x".repeat(400));
+        for _ in 0..3 {
+            for (i, config) in configs.iter().enumerate() {
+                assert_eq!(config.replace_key("user_name"), Some(format!("c{i}.name")));
+                assert_eq!(
+                    config.replace_key(&long_key),
+                    Some(format!("c{i}.{}", &long_key[5..]))
+                );
+            }
+        }
+
+        // Same-schema batch end to end: every document's keys come out replaced.
+        let doc = r#"{"user_name": "a", "user_age": 1, "id": 7}"#;
+        let results = extract_multiple(
+            JSONTools::new()
+                .flatten()
+                .key_replacement("r'^user_(\\w+)$'", "u_$1")
+                .execute(vec![doc; 50])
+                .unwrap(),
+        );
+        for result in results {
+            let parsed: Value = serde_json::from_str(&result).unwrap();
+            assert_eq!(
+                parsed,
+                serde_json::json!({"u_name": "a", "u_age": 1, "id": 7})
+            );
+        }
+    }
+
     #[test]
     fn test_default_and_explicit_dot_separator_match() {
         // Regression guard for the `separator: Cow<'static, str>` change --
@@ -130,6 +452,54 @@ mod unit_tests {
         assert_eq!(parsed["user.email"], "john@example.com");
     }
 
+    #[test]
+    fn test_lowercase_keys_folded_while_building_the_path() {
+        // Segments are folded as they're pushed onto the path, not per finished key:
+        // the separator folds too (as it always did), a key replacement still sees
+        // the lowercased key, selections and key exclusions still match the original
+        // spelling, and lowercase-created duplicates still resolve last-wins.
+        let json = r#"{"Outer": {"Mid": [{"Leaf": 1}, {"LEAF": 2}]}, "outer": {"x": 3}}"#;
+        let result = JSONTools::new()
+            .flatten()
+            .separator("_SEP_")
+            .lowercase_keys(true)
+            .key_replacement("mid", "m")
+            .execute(json)
+            .unwrap();
+        let parsed: Value = serde_json::from_str(&extract_single(result)).unwrap();
+        assert_eq!(
+            parsed,
+            serde_json::json!({
+                "outer_sep_m_sep_0_sep_leaf": 1,
+                "outer_sep_m_sep_1_sep_leaf": 2,
+                "outer_sep_x": 3
+            })
+        );
+
+        let selected = JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .select_paths(["Outer.Mid.1.LEAF"])
+            .execute(json)
+            .unwrap();
+        assert_eq!(extract_single(selected), r#"{"outer.mid.1.leaf":2}"#);
+
+        let excluded = JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .exclude_key("Outer.Mid")
+            .execute(json)
+            .unwrap();
+        assert_eq!(extract_single(excluded), r#"{"outer.x":3}"#);
+
+        let collided = JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .execute(r#"{"A": 1, "a": 2}"#)
+            .unwrap();
+        assert_eq!(extract_single(collided), r#"{"a":2}"#);
+    }
+
     #[test]
     fn test_key_replacement() {
         let json = r#"{"user_name": "John", "admin_role": "super"}"#;
@@ -522,6 +892,26 @@ mod unit_tests {
         assert_eq!(parsed["-a-b-"], 1);
     }
 
+    /// The literal length prefilter in `apply_replacement_patterns` must test
+    /// against the *current* (possibly already-replaced) string, not the
+    /// original: here "id" is shorter than the second needle until the first
+    /// replacement lengthens it.
+    #[test]
+    fn test_literal_replacement_length_prefilter_sees_chained_output() {
+        let json = r#"{"a": "id", "b": "x"}"#;
+        let result = JSONTools::new()
+            .flatten()
+            .value_replacement("id", "user_id")
+            .value_replacement("user_id", "uid")
+            .execute(json)
+            .unwrap();
+        let flattened = extract_single(result);
+        let parsed: Value = serde_json::from_str(&flattened).unwrap();
+
+        assert_eq!(parsed["a"], "uid");
+        assert_eq!(parsed["b"], "x");
+    }
+
     #[test]
     fn test_value_replacement() {
         let json = r#"{"email": "john@example.com", "role": "super"}"#;
@@ -715,6 +1105,46 @@ mod unit_tests {
         assert!(!keys.iter().any(|k| k.starts_with("user.tags")));
     }
 
+    #[test]
+    fn test_pruned_children_skipped_before_their_key_is_built() {
+        // Empty containers and `null`s dropped by the filter flags are skipped before
+        // their path segment is pushed. Array elements still consume their index,
+        // escaped keys and key transforms on the surviving siblings are unaffected,
+        // and a `null` spelled with surrounding whitespace is still a `null`.
+        let json = r#"{"A\"b": {"e": {}, "l": [], "n": null , "v": 1},
+                       "arr": [null, [], {}, 2, { }, [ ]], "keep": {"x": null, "y": 0}}"#;
+        let expected = r#"{"A\"b.v":1,"arr.3":2,"keep.y":0}"#;
+        let base = || {
+            JSONTools::new()
+                .flatten()
+                .remove_nulls(true)
+                .remove_empty_objects(true)
+                .remove_empty_arrays(true)
+        };
+        assert_eq!(extract_single(base().execute(json).unwrap()), expected);
+        assert_eq!(
+            extract_single(base().lowercase_keys(true).execute(json).unwrap()),
+            expected.to_lowercase()
+        );
+        assert_eq!(
+            extract_single(
+                base()
+                    .select_paths(["arr.1", "arr.3", "keep.x"])
+                    .execute(json)
+                    .unwrap()
+            ),
+            r#"{"arr.3":2}"#
+        );
+
+        // Only the flags that are set prune.
+        let nulls_only = JSONTools::new()
+            .flatten()
+            .remove_nulls(true)
+            .execute(r#"{"a": null, "b": [], "c": [null, 1]}"#)
+            .unwrap();
+        assert_eq!(extract_single(nulls_only), r#"{"b":[],"c.1":1}"#);
+    }
+
     // ===== ADVANCED TESTS =====
 
     #[test]
@@ -1857,6 +2287,25 @@ mod unit_tests {
         // Already lowercase stays unchanged
         assert_eq!(parsed["café"], 4);
     }
+
+    #[test]
+    fn test_normal_mode_ascii_lowercase_fast_path() {
+        // Pure-ASCII keys take the in-place byte fold; escaped keys arrive already owned
+        // and must fold the same way as borrowed ones.
+        let json = r#"{"UserID": 1, "\u0041PI_Key": 2, "snake_case": 3, "MIXED\tTab": 4}"#;
+        let result = JSONTools::new()
+            .normal()
+            .lowercase_keys(true)
+            .execute(json)
+            .unwrap();
+        let processed = extract_single(result);
+        let parsed: Value = serde_json::from_str(&processed).unwrap();
+
+        assert_eq!(parsed["userid"], 1);
+        assert_eq!(parsed["api_key"], 2);
+        assert_eq!(parsed["snake_case"], 3);
+        assert_eq!(parsed["mixed\ttab"], 4);
+    }
 }
 
 // ===== MEMORY PROFILING TESTS =====
@@ -3464,6 +3913,605 @@ mod json_output_tests {
     }
 }
 
+// ==========================================
+// max_depth (shallow flatten) tests
+// ==========================================
+
+#[cfg(test)]
+mod max_depth_tests {
+    use crate::tests::extract_single;
+    use crate::JSONTools;
+    use serde_json::{json, Value};
+
+    const DOC: &str =
+        r#"{"product": {"id": 7, "tags": ["a", "b"], "stock": {"eu": {"qty": 3}}}, "ok": true}"#;
+
+    fn flatten_to_depth(tools: JSONTools, depth: usize) -> Value {
+        let result = tools.flatten().max_depth(Some(depth)).execute(DOC).unwrap();
+        serde_json::from_str(&extract_single(result)).unwrap()
+    }
+
+    #[test]
+    fn test_max_depth_keeps_deeper_containers_whole() {
+        assert_eq!(
+            flatten_to_depth(JSONTools::new(), 1),
+            json!({
+                "product": {"id": 7, "tags": ["a", "b"], "stock": {"eu": {"qty": 3}}},
+                "ok": true
+            })
+        );
+        assert_eq!(
+            flatten_to_depth(JSONTools::new(), 2),
+            json!({
+                "product.id": 7,
+                "product.tags": ["a", "b"],
+                "product.stock": {"eu": {"qty": 3}},
+                "ok": true
+            })
+        );
+        // Deeper than the document: identical to an unlimited flatten.
+        let unlimited = JSONTools::new().flatten().execute(DOC).unwrap();
+        let unlimited: Value = serde_json::from_str(&extract_single(unlimited)).unwrap();
+        assert_eq!(flatten_to_depth(JSONTools::new(), 10), unlimited);
+    }
+
+    #[test]
+    fn test_max_depth_on_collecting_path() {
+        // Key transforms route through `CollectingWalker`; the cut-off must match.
+        assert_eq!(
+            flatten_to_depth(JSONTools::new().lowercase_keys(true), 2),
+            flatten_to_depth(JSONTools::new(), 2)
+        );
+        assert_eq!(
+            flatten_to_depth(JSONTools::new().key_replacement("product.", "p_"), 2),
+            json!({
+                "p_id": 7,
+                "p_tags": ["a", "b"],
+                "p_stock": {"eu": {"qty": 3}},
+                "ok": true
+            })
+        );
+    }
+
+    #[test]
+    fn test_max_depth_cut_off_is_minified() {
+        // A cut-off container is written compact, whatever the input's layout;
+        // whitespace inside its strings (escaped quotes included) is kept.
+        let pretty =
+            "{\n  \"a\": {\n    \"b\": [1, 2],\n    \"s\": \"x \\\" y\"\n  },\n  \"c\": 1\n}";
+        let expected = r#"{"a":{"b":[1,2],"s":"x \" y"},"c":1}"#;
+        for tools in [JSONTools::new(), JSONTools::new().lowercase_keys(true)] {
+            let result = tools.flatten().max_depth(Some(1)).execute(pretty).unwrap();
+            assert_eq!(extract_single(result), expected);
+        }
+        assert_eq!(
+            crate::flatten::minify_json_value(br#"{"a":[1,2]}"#),
+            std::borrow::Cow::Borrowed(r#"{"a":[1,2]}"#)
+        );
+    }
+
+    #[test]
+    fn test_max_depth_with_nested_parallel_chunks() {
+        // Enough top-level keys to take the parallel collecting path, where each
+        // chunk's walk starts one segment deep.
+        let doc: Value = (0..50)
+            .map(|i| (format!("k{i}"), json!({"inner": {"deep": i}})))
+            .collect::<serde_json::Map<_, _>>()
+            .into();
+        let result = JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .nested_parallel_threshold(10)
+            .max_depth(Some(2))
+            .execute(doc.to_string().as_str())
+            .unwrap();
+        let parsed: Value = serde_json::from_str(&extract_single(result)).unwrap();
+        assert_eq!(parsed["k7.inner"], json!({"deep": 7}));
+        assert_eq!(parsed.as_object().unwrap().len(), 50);
+    }
+
+    #[test]
+    fn test_max_depth_zero_is_rejected() {
+        let err = JSONTools::new()
+            .flatten()
+            .max_depth(Some(0))
+            .execute(DOC)
+            .unwrap_err();
+        assert!(err.to_string().contains("max_depth"));
+    }
+}
+
+// ==========================================
+// select_paths (direct field extraction) tests
+// ==========================================
+
+#[cfg(test)]
+mod select_paths_tests {
+    use crate::tests::extract_single;
+    use crate::JSONTools;
+    use serde_json::{json, Value};
+
+    const DOC: &str = r#"{"product": {"id": 7, "name": "x", "tags": ["a", "b"], "pricing": {"final_price": 9.5, "base": 10}}, "meta": {"v": 1}, "empty": {}}"#;
+
+    fn select(tools: JSONTools, paths: &[&str]) -> Value {
+        let result = tools
+            .flatten()
+            .select_paths(paths.iter().copied())
+            .execute(DOC)
+            .unwrap();
+        serde_json::from_str(&extract_single(result)).unwrap()
+    }
+
+    #[test]
+    fn test_select_paths_leaves_and_indices() {
+        assert_eq!(
+            select(
+                JSONTools::new(),
+                &[
+                    "product.id",
+                    "product.pricing.final_price",
+                    "product.tags.1"
+                ]
+            ),
+            json!({"product.id": 7, "product.pricing.final_price": 9.5, "product.tags.1": "b"})
+        );
+    }
+
+    #[test]
+    fn test_select_paths_container_is_returned_whole() {
+        assert_eq!(
+            select(
+                JSONTools::new(),
+                &["product.pricing", "product.pricing.base"]
+            ),
+            json!({"product.pricing": {"final_price": 9.5, "base": 10}})
+        );
+        assert_eq!(select(JSONTools::new(), &["empty"]), json!({"empty": {}}));
+    }
+
+    #[test]
+    fn test_select_paths_container_is_minified() {
+        let pretty = r#"{
+  "product": {
+    "pricing": {
+      "final_price": 9.5,
+      "tags": ["a b", 1]
+    }
+  }
+}"#;
+        for tools in [JSONTools::new(), JSONTools::new().lowercase_keys(true)] {
+            let result = tools
+                .flatten()
+                .select_paths(["product.pricing"])
+                .execute(pretty)
+                .unwrap();
+            assert_eq!(
+                extract_single(result),
+                r#"{"product.pricing":{"final_price":9.5,"tags":["a b",1]}}"#
+            );
+        }
+    }
+
+    #[test]
+    fn test_select_paths_missing_and_prefix_only_paths_are_absent() {
+        // "product.i" is a string prefix of "product.id" but not a path prefix;
+        // "product" is only on the way to a selected path, never emitted itself.
+        assert_eq!(
+            select(
+                JSONTools::new(),
+                &["product.i", "product.missing.deep", "nope"]
+            ),
+            json!({})
+        );
+        assert_eq!(select(JSONTools::new(), &["product.id.deeper"]), json!({}));
+    }
+
+    #[test]
+    fn test_select_paths_matches_before_key_transforms() {
+        assert_eq!(
+            select(
+                JSONTools::new()
+                    .lowercase_keys(true)
+                    .key_replacement("product.", "p_"),
+                &["product.id", "meta.v"]
+            ),
+            json!({"p_id": 7, "meta.v": 1})
+        );
+    }
+
+    #[test]
+    fn test_select_paths_with_nested_parallel_chunks() {
+        let doc: Value = (0..50)
+            .map(|i| (format!("k{i}"), json!({"keep": i, "drop": {"x": i}})))
+            .collect::<serde_json::Map<_, _>>()
+            .into();
+        let result = JSONTools::new()
+            .flatten()
+            .nested_parallel_threshold(10)
+            .select_paths(["k3.keep", "k42"])
+            .execute(doc.to_string().as_str())
+            .unwrap();
+        let parsed: Value = serde_json::from_str(&extract_single(result)).unwrap();
+        assert_eq!(
+            parsed,
+            json!({"k3.keep": 3, "k42": {"keep": 42, "drop": {"x": 42}}})
+        );
+    }
+}
+
+// ==========================================
+// compact (minifier) tests
+// ==========================================
+
+#[cfg(test)]
+mod compact_tests {
+    use crate::compact;
+
+    #[test]
+    fn test_compact_matches_serde_json_for_plain_documents() {
+        let pretty = "{\n  \"user\": {\"name\" : \"A b\", \"tags\": [ 1, true, null ]},\r\n\t\"empty\": {}, \"none\": [ ]\n}\n";
+        let expected =
+            serde_json::to_string(&serde_json::from_str::<serde_json::Value>(pretty).unwrap())
+                .unwrap();
+        assert_eq!(compact(pretty).unwrap(), expected);
+    }
+
+    #[test]
+    fn test_compact_copies_strings_and_numbers_verbatim() {
+        let input = r#"[ "tab\t and \u00e9 \"quoted\"", 2.50, 1e3, -0 ]"#;
+        assert_eq!(
+            compact(input).unwrap(),
+            r#"["tab\t and \u00e9 \"quoted\"",2.50,1e3,-0]"#
+        );
+        assert_eq!(compact("  42 ").unwrap(), "42");
+        assert_eq!(compact(r#" "a b" "#).unwrap(), r#""a b""#);
+    }
+
+    #[test]
+    fn test_compact_rejects_malformed_json() {
+        assert!(compact(r#"{"a": [1, 2"#).is_err());
+        assert!(compact(r#"{"a": 1}]"#).is_err());
+        assert!(compact(r#"{"a": "x"#).is_err());
+    }
+}
+
+// ==========================================
+// iter_flatten (streaming output) tests
+// ==========================================
+
+#[cfg(test)]
+mod iter_flatten_tests {
+    use crate::tests::extract_single;
+    use crate::JSONTools;
+
+    /// Re-assemble streamed pairs into the object `execute()` writes.
+    fn join_pairs(pairs: &[(String, String)]) -> String {
+        let body: Vec<String> = pairs.iter().map(|(k, v)| format!("\"{k}\":{v}")).collect();
+        format!("{{{}}}", body.join(","))
+    }
+
+    #[test]
+    fn test_iter_flatten_pairs_match_execute_output() {
+        let json = r#"{"User": {"Name": "Ann", "Tags": ["a", null, {}], "Age": 31}, "Ok": true, "Note": "x\ty"}"#;
+        let tools = JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .remove_nulls(true)
+            .key_replacement("user", "u");
+        let pairs: Vec<(String, String)> = tools.iter_flatten(json).unwrap().collect();
+        assert_eq!(pairs[0], ("u.name".to_string(), "\"Ann\"".to_string()));
+        assert_eq!(
+            join_pairs(&pairs),
+            extract_single(tools.execute(json).unwrap())
+        );
+    }
+
+    #[test]
+    fn test_iter_flatten_root_array_and_max_depth() {
+        let json = r#"[{"a": {"b":1}}, [], 3]"#;
+        let tools = JSONTools::new().flatten().max_depth(Some(2));
+        let pairs: Vec<(String, String)> = tools.iter_flatten(json).unwrap().collect();
+        assert_eq!(
+            pairs,
+            [
+                ("0.a".to_string(), r#"{"b":1}"#.to_string()),
+                ("1".to_string(), "[]".to_string()),
+                ("2".to_string(), "3".to_string()),
+            ]
+        );
+        assert_eq!(
+            join_pairs(&pairs),
+            extract_single(tools.execute(json).unwrap())
+        );
+    }
+
+    #[test]
+    fn test_iter_flatten_yields_duplicate_keys_in_order() {
+        let pairs: Vec<(String, String)> = JSONTools::new()
+            .flatten()
+            .iter_flatten(r#"{"a": 1, "a": 2}"#)
+            .unwrap()
+            .collect();
+        assert_eq!(
+            pairs,
+            [
+                ("a".to_string(), "1".to_string()),
+                ("a".to_string(), "2".to_string()),
+            ]
+        );
+    }
+
+    #[test]
+    fn test_iter_flatten_rejects_unsupported_settings_and_input() {
+        let tools = JSONTools::new().flatten();
+        assert!(tools.iter_flatten("42").is_err());
+        assert!(tools.iter_flatten("").is_err());
+        assert!(tools.iter_flatten(r#"{"a": [1"#).is_err());
+        assert!(tools
+            .clone()
+            .handle_key_collision(true)
+            .iter_flatten("{}")
+            .is_err());
+        assert!(tools
+            .clone()
+            .always_array_keys(["a"])
+            .iter_flatten("{}")
+            .is_err());
+        assert!(tools.separator("").iter_flatten("{}").is_err());
+    }
+
+    #[test]
+    fn test_top_level_key_exclusion_on_nested_parallel_path() {
+        // More top-level keys than the threshold, plus a collecting-path option, sends
+        // this through the nested-parallel walk, which must honour exclusions on the
+        // top-level keys themselves and not only below them.
+        let json = r#"{"a": 1, "secret": 2, "b": {"secret_id": 3, "c": 4}, "d": 5}"#;
+        let result = JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .exclude_key("secret")
+            .nested_parallel_threshold(2)
+            .execute(json)
+            .unwrap();
+        assert_eq!(extract_single(result), r#"{"a":1,"b.c":4,"d":5}"#);
+    }
+}
+
+// ==========================================
+// result_cache (whole-document memo) tests
+// ==========================================
+
+#[cfg(test)]
+mod result_cache_tests {
+    use crate::cache::ResultCache;
+    use crate::tests::{extract_multiple, extract_single};
+    use crate::JSONTools;
+
+    const DOC: &str = r#"{"Tenant": {"Id": 7, "Plan": "pro"}}"#;
+
+    #[test]
+    fn test_result_cache_hits_match_uncached_output() {
+        let cached = JSONTools::new().flatten().result_cache(8);
+        let uncached = JSONTools::new().flatten();
+        let expected = extract_single(uncached.execute(DOC).unwrap());
+        for _ in 0..3 {
+            assert_eq!(extract_single(cached.execute(DOC).unwrap()), expected);
+        }
+        // Batch items are memoized individually, hits and misses mixed.
+        let batch = extract_multiple(
+            cached
+                .execute(vec![DOC, r#"{"a": {"b": 1}}"#, DOC])
+                .unwrap(),
+        );
+        assert_eq!(
+            batch,
+            vec![expected.clone(), r#"{"a.b":1}"#.to_string(), expected]
+        );
+    }
+
+    #[test]
+    fn test_result_cache_is_keyed_on_settings() {
+        // A clone (or further builder call) shares the cache but must never be
+        // served a result produced under different settings.
+        let base = JSONTools::new().flatten().result_cache(8);
+        let plain = extract_single(base.execute(DOC).unwrap());
+        let lowered = base.clone().lowercase_keys(true);
+        assert_eq!(
+            extract_single(lowered.execute(DOC).unwrap()),
+            r#"{"tenant.id":7,"tenant.plan":"pro"}"#
+        );
+        let unflatten = base.clone().unflatten();
+        assert_eq!(
+            extract_single(unflatten.execute(r#"{"a.b": 1}"#).unwrap()),
+            r#"{"a":{"b":1}}"#
+        );
+        assert_eq!(extract_single(base.execute(DOC).unwrap()), plain);
+    }
+
+    #[test]
+    fn test_result_cache_never_caches_errors_and_zero_disables() {
+        let tools = JSONTools::new().flatten().result_cache(8);
+        assert!(tools.execute(r#"{"a": "#).is_err());
+        assert!(tools.execute(r#"{"a": "#).is_err());
+        let disabled = JSONTools::new().flatten().result_cache(8).result_cache(0);
+        assert_eq!(
+            extract_single(disabled.execute(DOC).unwrap()),
+            r#"{"Tenant.Id":7,"Tenant.Plan":"pro"}"#
+        );
+    }
+
+    #[test]
+    fn test_result_cache_exact_match_and_eviction() {
+        let cache = ResultCache::new(4);
+        cache.insert(1, "doc", "out");
+        assert_eq!(cache.get(1, "doc").as_deref(), Some("out"));
+        assert_eq!(cache.get(2, "doc"), None);
+        assert_eq!(cache.get(1, "doc "), None);
+
+        // Filling past capacity evicts the least recently used entries, never
+        // the one just touched.
+        for i in 0..4 {
+            cache.insert(1, &format!("d{i}"), "x");
+            assert!(cache.get(1, "doc").is_some());
+        }
+        assert_eq!(cache.get(1, "doc").as_deref(), Some("out"));
+        assert_eq!(cache.get(1, "d3").as_deref(), Some("x"));
+        let kept = (0..4)
+            .filter(|i| cache.get(1, &format!("d{i}")).is_some())
+            .count();
+        assert!(kept < 4);
+    }
+}
+
+// ==========================================
+// compile_schema (schema-specialized flatten) tests
+// ==========================================
+
+#[cfg(test)]
+mod compiled_schema_tests {
+    use crate::tests::{extract_multiple, extract_single};
+    use crate::{JSONTools, JsonToolsError};
+
+    const SCHEMA: &str = r#"{
+        "id": "integer",
+        "User": {"Name": "string", "score": "number?", "active": "boolean"},
+        "tags": ["string", "string"],
+        "note": "null?"
+    }"#;
+
+    fn rows(n: usize) -> Vec<String> {
+        (0..n)
+            .map(|i| {
+                let score = if i % 3 == 0 {
+                    "null".to_string()
+                } else {
+                    format!("{}.5", i)
+                };
+                let name = if i % 5 == 0 { String::new() } else { format!("u\"{i}") };
+                // Member order varies row to row: output follows each row's order.
+                if i % 2 == 0 {
+                    format!(
+                        r#"{{"id": {i}, "User": {{"Name": {name:?}, "score": {score}, "active": true}}, "tags": ["a", "b"], "note": null}}"#
+                    )
+                } else {
+                    format!(
+                        r#"{{"note": null, "tags": ["x", "y"], "User": {{"active": false, "score": {score}, "Name": {name:?}}}, "id": -{i}}}"#
+                    )
+                }
+            })
+            .collect()
+    }
+
+    fn assert_matches_execute(tools: JSONTools) {
+        let compiled = tools.compile_schema(SCHEMA).unwrap();
+        let rows = rows(250);
+        let refs: Vec<&str> = rows.iter().map(String::as_str).collect();
+        assert_eq!(
+            extract_multiple(compiled.execute(refs.as_slice()).unwrap()),
+            extract_multiple(tools.execute(refs.as_slice()).unwrap())
+        );
+        assert_eq!(
+            extract_single(compiled.execute(rows[1].as_str()).unwrap()),
+            extract_single(tools.execute(rows[1].as_str()).unwrap())
+        );
+    }
+
+    #[test]
+    fn test_compiled_schema_matches_execute() {
+        assert_matches_execute(JSONTools::new().flatten());
+        assert_matches_execute(JSONTools::new().flatten().separator("::"));
+        assert_matches_execute(JSONTools::new().flatten().remove_nulls(true));
+        assert_matches_execute(JSONTools::new().flatten().remove_empty_strings(true));
+        assert_matches_execute(JSONTools::new().flatten().exclude_key("tags"));
+        assert_matches_execute(
+            JSONTools::new()
+                .flatten()
+                .lowercase_keys(true)
+                .key_replacement("r'^user\\.'", "u_"),
+        );
+    }
+
+    #[test]
+    fn test_compiled_schema_respelled_keys_match_execute() {
+        let tools = JSONTools::new().flatten();
+        let compiled = tools
+            .compile_schema(r#"{"a": "integer", "é": "string"}"#)
+            .unwrap();
+        for row in [r#"{"a": 1, "é": "x"}"#, r#"{"\u0061": 1, "\u00e9": "x"}"#] {
+            assert_eq!(
+                extract_single(compiled.execute(row).unwrap()),
+                extract_single(tools.execute(row).unwrap())
+            );
+        }
+    }
+
+    #[test]
+    fn test_compiled_schema_rejects_off_schema_rows() {
+        let compiled = JSONTools::new().flatten().compile_schema(SCHEMA).unwrap();
+        let good = r#"{"id": 1, "User": {"Name": "a", "score": 1, "active": true}, "tags": ["a", "b"], "note": null}"#;
+        assert!(compiled.execute(good).is_ok());
+        for bad in [
+            // wrong leaf types
+            r#"{"id": 1.5, "User": {"Name": "a", "score": 1, "active": true}, "tags": ["a", "b"], "note": null}"#,
+            r#"{"id": 1, "User": {"Name": null, "score": 1, "active": true}, "tags": ["a", "b"], "note": null}"#,
+            r#"{"id": 1, "User": {"Name": "a", "score": "1", "active": true}, "tags": ["a", "b"], "note": null}"#,
+            r#"{"id": 1, "User": {"Name": "a", "score": 1, "active": 1}, "tags": ["a", "b"], "note": null}"#,
+            r#"{"id": 1, "User": "a", "tags": ["a", "b"], "note": null}"#,
+            // missing, unexpected and repeated keys
+            r#"{"id": 1, "User": {"Name": "a", "score": 1}, "tags": ["a", "b"], "note": null}"#,
+            r#"{"id": 1, "User": {"Name": "a", "score": 1, "active": true, "x": 1}, "tags": ["a", "b"], "note": null}"#,
+            r#"{"id": 1, "id": 2, "User": {"Name": "a", "score": 1, "active": true}, "tags": ["a", "b"]}"#,
+            // wrong array lengths, wrong root
+            r#"{"id": 1, "User": {"Name": "a", "score": 1, "active": true}, "tags": ["a"], "note": null}"#,
+            r#"{"id": 1, "User": {"Name": "a", "score": 1, "active": true}, "tags": ["a", "b", "c"], "note": null}"#,
+            r#"[1]"#,
+            r#"{}"#,
+        ] {
+            let err = compiled.execute(bad).unwrap_err();
+            assert!(
+                matches!(err, JsonToolsError::InputValidationError { .. }),
+                "{bad}: {err}"
+            );
+        }
+        let batch = compiled.execute(vec![good, good, "{}"]).unwrap_err();
+        assert!(matches!(
+            batch,
+            JsonToolsError::BatchProcessingError { index: 2, .. }
+        ));
+    }
+
+    #[test]
+    fn test_compile_schema_rejects_bad_schemas_and_settings() {
+        let flatten = JSONTools::new().flatten();
+        for schema in [
+            r#""integer""#,
+            r#"{"a": "int"}"#,
+            r#"{"a": {}}"#,
+            r#"{"a": []}"#,
+            r#"{"a": 1}"#,
+            r#"{"a": "#,
+            // both leaves flatten to "a.b"
+            r#"{"a.b": "integer", "a": {"b": "integer"}}"#,
+        ] {
+            assert!(flatten.compile_schema(schema).is_err(), "{schema}");
+        }
+        assert!(JSONTools::new()
+            .flatten()
+            .lowercase_keys(true)
+            .compile_schema(r#"{"A": "integer", "a": "integer"}"#)
+            .is_err());
+        for tools in [
+            JSONTools::new().unflatten(),
+            JSONTools::new().flatten().handle_key_collision(true),
+            JSONTools::new().flatten().auto_convert_types(true),
+            JSONTools::new().flatten().value_replacement("a", "b"),
+            JSONTools::new().flatten().max_depth(Some(1)),
+        ] {
+            assert!(tools.compile_schema(r#"{"a": "integer"}"#).is_err());
+        }
+    }
+}
+
 // ==========================================
 // max_array_index DoS protection tests
 // ==========================================
@@ -3681,6 +4729,36 @@ mod validation_and_edge_case_tests {
         assert_eq!(parsed["café \"nested\"_日本語_🎉 city"], "v");
     }
 
+    #[test]
+    fn test_word_at_a_time_escape_scan_matches_serde_json() {
+        // escape_json_string finds special bytes 8 at a time; put each special byte
+        // at every offset across two words plus a tail (including right after a
+        // 0x20 byte, and next to bytes >= 0x80, where a SWAR borrow could misfire)
+        // and compare with serde_json's own escaping.
+        use crate::flatten::{escape_json_string, write_json_escaped_key};
+
+        for special in ['"', '\\', '\n', '\t', '\u{0}', '\u{1f}', '\u{7f}'] {
+            for len in 0..20 {
+                for at in 0..=len {
+                    let mut s: String = "a ¢".chars().cycle().take(len).collect();
+                    s.insert(
+                        s.char_indices().nth(at).map_or(s.len(), |(i, _)| i),
+                        special,
+                    );
+                    let expected = serde_json::to_string(&s).unwrap();
+                    assert_eq!(format!("\"{}\"", escape_json_string(&s)), expected, "{s:?}");
+                    let mut key = String::new();
+                    write_json_escaped_key(&mut key, &s);
+                    assert_eq!(format!("\"{key}\""), expected, "{s:?}");
+                }
+            }
+        }
+        assert!(matches!(
+            escape_json_string("clean ascii text, café 😀 spans words"),
+            std::borrow::Cow::Borrowed(_)
+        ));
+    }
+
     /// Builds a deeply-nested (5 levels) JSON object with `width` keys at each level,
     /// so flattened leaf paths are long enough (>24 bytes) to exceed CompactString's
     /// inline cap and exercise the sequential slow path's bump-arena key storage
@@ -3702,6 +4780,37 @@ mod validation_and_edge_case_tests {
         serde_json::to_string(&value).unwrap()
     }
 
+    #[test]
+    fn test_flatten_very_deep_nesting_is_iterative() {
+        // `walk_tape` keeps open containers on an explicit stack rather than the native
+        // one, so nesting depth is bounded by memory, not by the test thread's stack.
+        // Covers both the direct walker and (via lowercase_keys) the collecting walker.
+        const DEPTH: usize = 5_000;
+        let json = format!(
+            "{}{}{}",
+            "{\"A\":[".repeat(DEPTH),
+            "true",
+            "]}".repeat(DEPTH)
+        );
+        let expected_key = vec!["A.0"; DEPTH].join(".");
+
+        for lowercase in [false, true] {
+            let result = JSONTools::new()
+                .flatten()
+                .lowercase_keys(lowercase)
+                .execute(json.as_str())
+                .unwrap();
+            let parsed: Value = serde_json::from_str(&extract_single(result)).unwrap();
+            let key = if lowercase {
+                expected_key.to_lowercase()
+            } else {
+                expected_key.clone()
+            };
+            assert_eq!(parsed.as_object().unwrap().len(), 1);
+            assert_eq!(parsed[&key], true, "lowercase_keys({lowercase})");
+        }
+    }
+
     #[test]
     fn test_bump_arena_deep_nesting_lowercase() {
         let json = deeply_nested_json(10);
@@ -3911,6 +5020,60 @@ mod validation_and_edge_case_tests {
         assert_eq!(parsed["Name"], "Kaffee");
     }
 
+    #[test]
+    fn test_scanner_string_boundaries_around_backslash_runs() {
+        // The scanner finds each string's end with one memchr2 pass over quote *and*
+        // backslash, consuming every escape pair as it goes. These are the cases that
+        // pass (escaped quotes, even and odd backslash runs right before the closing
+        // quote, a backslash escaping a backslash escaping a quote) would get wrong if it
+        // mis-paired a backslash -- each must round-trip to exactly what serde_json reads.
+        let json =
+            r#"{"a\"b": "x\\", "c": "\\\"", "d\\": "\"q\"", "e": "\\\\", "f": {"g\\\"h": ""}}"#;
+        let expected: Value = serde_json::from_str(json).unwrap();
+        let flat: Value = serde_json::from_str(&extract_single(
+            JSONTools::new().flatten().execute(json).unwrap(),
+        ))
+        .unwrap();
+        assert_eq!(flat["a\"b"], expected["a\"b"]);
+        assert_eq!(flat["c"], expected["c"]);
+        assert_eq!(flat["d\\"], expected["d\\"]);
+        assert_eq!(flat["e"], expected["e"]);
+        assert_eq!(flat["f.g\\\"h"], expected["f"]["g\\\"h"]);
+        assert_eq!(flat.as_object().unwrap().len(), 5);
+
+        // A lone trailing backslash can never close the string.
+        assert!(JSONTools::new().flatten().execute(r#"{"a": "x\"#).is_err());
+        assert!(JSONTools::new()
+            .flatten()
+            .execute(r#"{"a": "x\"}"#)
+            .is_err());
+    }
+
+    #[test]
+    fn test_tape_leaf_count_matches_flattened_entry_count() {
+        // The collecting walker reserves exactly this many entries up front, so it
+        // must never undercount what an unfiltered flatten emits: keys are not
+        // leaves, empty containers are, and escaped quotes must not split strings.
+        use crate::flatten::{count_tape_leaves, scan_and_fixup};
+        for json in [
+            r#"{"a": {"b": 1, "c": [1, 2, 3]}, "d": "x"}"#,
+            r#"[1, [2, [3, []]], {}, {"k": null}]"#,
+            r#"{"e": {}, "f": [], "g"": "":"}"#,
+            r#"{"a": [{"b": [true, false]}, {"c": {"d": 1.5}}]}"#,
+        ] {
+            let tape = scan_and_fixup(json.as_bytes()).unwrap();
+            let flat: Value = serde_json::from_str(&extract_single(
+                JSONTools::new().flatten().execute(json).unwrap(),
+            ))
+            .unwrap();
+            assert_eq!(
+                count_tape_leaves(&tape),
+                flat.as_object().unwrap().len(),
+                "{json}"
+            );
+        }
+    }
+
     #[test]
     fn test_normal_mode_lowercase_keys() {
         let json = r#"{"UserName": "John", "UserAge": 30, "nested": {"InnerKey": true}}"#;
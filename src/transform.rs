@@ -7,7 +7,9 @@
 //! `scan_and_fixup`, then walk the tape writing directly to output with inline
 //! value transforms, key transforms, and rollback-based filtering.
 
-use crate::cache::{get_cached_regex, parse_pattern, ParsedPattern};
+use crate::cache::{
+    get_cached_regex, get_literal_pattern, parse_pattern, CompiledPattern, ParsedPattern,
+};
 use crate::config::{ProcessingConfig, TypeConversionMode};
 use crate::convert::convert_string_for_mode;
 use crate::error::JsonToolsError;
@@ -18,6 +20,7 @@ use crate::flatten::{
 };
 use crate::fxhash::FxHashMap;
 use memchr::memmem;
+use regex::RegexSet;
 use smallvec::SmallVec;
 use std::borrow::Cow;
 
@@ -92,6 +95,10 @@ fn memmem_replace_all(s: &str, from: &str, to: &str) -> Option<String> {
 /// than propagating a compile error through this hot path -- there's no
 /// config-time validation point for replacement patterns today.
 ///
+/// Regexes that only match literal text are lowered once per thread and
+/// matched with `memmem`/`starts_with`/`ends_with` instead of the regex
+/// engine -- see `crate::cache::LiteralPattern`.
+///
 /// Regex lookup itself is cheap even though this runs once per key/value
 /// across a whole batch: see `get_cached_regex`'s doc comment for the
 /// thread-local "sticky" fast path that avoids re-hashing the pattern string
@@ -105,6 +112,18 @@ pub(crate) fn apply_replacement_patterns(s: &str, patterns: &[(String, String)])
     for (pattern, replacement) in patterns {
         match parse_pattern(pattern) {
             ParsedPattern::Regex(inner) => {
+                // Literal-only regexes (`^(user|admin)_`, `@example\.com`, ...)
+                // skip the regex engine -- see `LiteralPattern`. `$` in the
+                // replacement is a group reference only the engine can expand.
+                if !replacement.contains('$') {
+                    if let Some(lowered) = get_literal_pattern(inner) {
+                        if let Some(replaced) = lowered.replace_all(&current, replacement) {
+                            current = Cow::Owned(replaced);
+                            changed = true;
+                        }
+                        continue;
+                    }
+                }
                 if let Ok(regex) = get_cached_regex(inner) {
                     // Use replace_all's Cow return to detect matches without a separate
                     // is_match() scan -- Owned means replacement happened, Borrowed means not.
@@ -115,13 +134,7 @@ pub(crate) fn apply_replacement_patterns(s: &str, patterns: &[(String, String)])
                 }
             }
             ParsedPattern::Literal(lit) => {
-                if lit.is_empty() {
-                    // Empty pattern: matches at every zero-width position (std's
-                    // defined, if unusual, `str::replace` behavior) -- fall back
-                    // directly rather than special-casing the SIMD path for it.
-                    current = Cow::Owned(current.replace(lit, replacement));
-                    changed = true;
-                } else if let Some(replaced) = memmem_replace_all(&current, lit, replacement) {
+                if let Some(replaced) = replace_literal(&current, lit, replacement) {
                     current = Cow::Owned(replaced);
                     changed = true;
                 }
@@ -136,6 +149,161 @@ pub(crate) fn apply_replacement_patterns(s: &str, patterns: &[(String, String)])
     }
 }
 
+/// `apply_replacement_patterns` over patterns already resolved by
+/// `CompiledPattern::compile` (`compiled[i]` belongs to `patterns[i]`) -- the
+/// per-leaf path for every configured call site, via
+/// `ReplacementConfig::replace_key`/`replace_value`. Same semantics, minus the
+/// per-call pattern parsing and cache lookups.
+#[inline(always)]
+pub(crate) fn apply_compiled_replacements(
+    s: &str,
+    patterns: &[(String, String)],
+    compiled: &[CompiledPattern],
+) -> Option<String> {
+    let mut current = Cow::Borrowed(s);
+    let mut changed = false;
+
+    for ((pattern, replacement), compiled) in patterns.iter().zip(compiled) {
+        if let Some(replaced) = apply_compiled_pattern(&current, pattern, replacement, compiled) {
+            current = Cow::Owned(replaced);
+            changed = true;
+        }
+    }
+
+    if changed {
+        Some(current.into_owned())
+    } else {
+        None
+    }
+}
+
+/// One step of `apply_compiled_replacements`: `pattern` -> `replacement` over
+/// `current`, `None` when nothing matched.
+#[inline(always)]
+fn apply_compiled_pattern(
+    current: &str,
+    pattern: &str,
+    replacement: &str,
+    compiled: &CompiledPattern,
+) -> Option<String> {
+    match compiled {
+        CompiledPattern::Literal => replace_literal(current, pattern, replacement),
+        CompiledPattern::Lowered(lowered) => lowered.replace_all(current, replacement),
+        CompiledPattern::Regex(regex) => match regex.replace_all(current, replacement) {
+            Cow::Owned(s) => Some(s),
+            Cow::Borrowed(_) => None,
+        },
+        CompiledPattern::GatedRegex(regex, prefixes) => {
+            if !prefixes.admits(current) {
+                return None;
+            }
+            match regex.replace_all(current, replacement) {
+                Cow::Owned(s) => Some(s),
+                Cow::Borrowed(_) => None,
+            }
+        }
+        CompiledPattern::Invalid => None,
+    }
+}
+
+/// Replacement lists at least this long get a `RegexSet` prefilter (see
+/// `build_replacement_prefilter`). Below it, the sequential per-pattern scans --
+/// mostly a `memmem` search or a lowered anchor compare each -- cost about what
+/// one set scan does, so the set would only add its build time.
+pub(crate) const REPLACEMENT_PREFILTER_MIN_PATTERNS: usize = 4;
+
+/// One `RegexSet` over every pattern of a replacement list (literals escaped,
+/// `r'...'` patterns as written), so a single pass over the input reports which
+/// patterns can match at all. With dozens of rewrite rules, most keys match none
+/// or one of them; `apply_compiled_replacements` would still run every pattern's
+/// search over every key, where `apply_prefiltered_replacements` scans the key
+/// once and runs only the matching patterns. The set compiles the literals into
+/// the regex crate's multi-literal prefilter (Teddy / Aho-Corasick), so a large
+/// list of plain substrings costs roughly one scan however many there are.
+///
+/// `None` -- keep the sequential path -- for short lists, a list with a pattern
+/// that failed to compile (its index would have no slot in the set), or a set
+/// the regex crate refuses to build (size limits).
+pub(crate) fn build_replacement_prefilter(
+    patterns: &[(String, String)],
+    compiled: &[CompiledPattern],
+) -> Option<RegexSet> {
+    if patterns.len() < REPLACEMENT_PREFILTER_MIN_PATTERNS
+        || compiled
+            .iter()
+            .any(|p| matches!(p, CompiledPattern::Invalid))
+    {
+        return None;
+    }
+    let sources = patterns
+        .iter()
+        .map(|(pattern, _)| match parse_pattern(pattern) {
+            ParsedPattern::Regex(inner) => Cow::Borrowed(inner),
+            ParsedPattern::Literal(lit) => Cow::Owned(regex::escape(lit)),
+        });
+    RegexSet::new(sources).ok()
+}
+
+/// `apply_compiled_replacements` with a `build_replacement_prefilter` set for
+/// the same list. Patterns still apply in list order, each to the previous one's
+/// output: the set says which patterns match the current text, the first of them
+/// at or after the current position is applied, and the set is re-run only when
+/// that changed the text (a rewrite can create or destroy a later pattern's
+/// match). A key no pattern matches -- the common case -- costs one set scan.
+#[inline]
+pub(crate) fn apply_prefiltered_replacements(
+    s: &str,
+    patterns: &[(String, String)],
+    compiled: &[CompiledPattern],
+    prefilter: &RegexSet,
+) -> Option<String> {
+    let mut matches = prefilter.matches(s);
+    if !matches.matched_any() {
+        return None;
+    }
+    let mut current = Cow::Borrowed(s);
+    let mut changed = false;
+    let mut next = 0;
+
+    while let Some(i) = matches.iter().find(|&i| i >= next) {
+        let (pattern, replacement) = &patterns[i];
+        if let Some(replaced) = apply_compiled_pattern(&current, pattern, replacement, &compiled[i])
+        {
+            current = Cow::Owned(replaced);
+            changed = true;
+            matches = prefilter.matches(&current);
+        }
+        next = i + 1;
+    }
+
+    if changed {
+        Some(current.into_owned())
+    } else {
+        None
+    }
+}
+
+/// Literal (non-`r'...'`) replacement shared by both replacement paths. `None`
+/// when nothing matched.
+#[inline(always)]
+fn replace_literal(current: &str, lit: &str, replacement: &str) -> Option<String> {
+    if lit.is_empty() {
+        // Empty pattern: matches at every zero-width position (std's
+        // defined, if unusual, `str::replace` behavior) -- fall back
+        // directly rather than special-casing the SIMD path for it.
+        Some(current.replace(lit, replacement))
+    } else if lit.len() > current.len() {
+        // Length prefilter: a needle longer than the haystack can't
+        // occur in it. Short values ("true", ids, flags) checked
+        // against a longer literal like "@example.com" are the
+        // common case on the value side, and this skips even the
+        // `memmem::find` call setup for all of them.
+        None
+    } else {
+        memmem_replace_all(current, lit, replacement)
+    }
+}
+
 /// Check whether `s` matches any exclusion pattern -- literal substring by default,
 /// regex via `r'...'` wrapping, same convention as `apply_replacement_patterns`. Used
 /// by `exclude_key` to decide whether a key (and its entire subtree) should be
@@ -144,15 +312,41 @@ pub(crate) fn apply_replacement_patterns(s: &str, patterns: &[(String, String)])
 #[inline]
 pub(crate) fn matches_any_pattern(s: &str, patterns: &[String]) -> bool {
     patterns.iter().any(|pattern| match parse_pattern(pattern) {
-        ParsedPattern::Regex(inner) => get_cached_regex(inner)
-            .map(|re| re.is_match(s))
-            .unwrap_or(false),
-        ParsedPattern::Literal(lit) => {
-            lit.is_empty() || memmem::find(s.as_bytes(), lit.as_bytes()).is_some()
-        }
+        ParsedPattern::Regex(inner) => match get_literal_pattern(inner) {
+            Some(lowered) => lowered.is_match(s),
+            None => get_cached_regex(inner)
+                .map(|re| re.is_match(s))
+                .unwrap_or(false),
+        },
+        ParsedPattern::Literal(lit) => literal_matches(s, lit),
     })
 }
 
+/// `matches_any_pattern` over patterns already resolved by
+/// `CompiledPattern::compile` -- see `apply_compiled_replacements`.
+#[inline]
+pub(crate) fn matches_any_compiled(
+    s: &str,
+    patterns: &[String],
+    compiled: &[CompiledPattern],
+) -> bool {
+    patterns
+        .iter()
+        .zip(compiled)
+        .any(|(pattern, compiled)| match compiled {
+            CompiledPattern::Literal => literal_matches(s, pattern),
+            CompiledPattern::Lowered(lowered) => lowered.is_match(s),
+            CompiledPattern::Regex(regex) => regex.is_match(s),
+            CompiledPattern::GatedRegex(regex, prefixes) => prefixes.admits(s) && regex.is_match(s),
+            CompiledPattern::Invalid => false,
+        })
+}
+
+#[inline(always)]
+fn literal_matches(s: &str, lit: &str) -> bool {
+    lit.is_empty() || (lit.len() <= s.len() && memmem::find(s.as_bytes(), lit.as_bytes()).is_some())
+}
+
 // ================================================================================================
 // Normal Mode Processing — Tape-Based Streaming
 // ================================================================================================
@@ -199,6 +393,30 @@ pub(crate) fn process_single_json_normal(
     }
 }
 
+/// Minify a JSON document: drop all insignificant whitespace and return the
+/// canonical compact form (`{"a":[1,2]}`), with every string and number
+/// copied through byte-for-byte.
+///
+/// This is normal mode with no transforms configured, so it goes straight to
+/// the zero-copy fast walker: one structural scan of the input, one walk of the
+/// tape writing each token into an output buffer pre-sized to the input. The
+/// usual alternative -- a full parse into a DOM followed by a compact
+/// re-serialize (`json.dumps(json.loads(s), separators=(",", ":"))` in Python)
+/// -- allocates every key and value only to write it straight back out, and
+/// re-escapes strings and reformats numbers along the way. Malformed input
+/// (unbalanced brackets, an unterminated string) fails with the same errors
+/// `execute()` reports.
+///
+/// # Examples
+///
+/// ```rust
+/// let compacted = json_tools_rs::compact("{\n  \"a\": [1, 2.50],\n  \"b\": \"x y\"\n}").unwrap();
+/// assert_eq!(compacted, r#"{"a":[1,2.50],"b":"x y"}"#);
+/// ```
+pub fn compact(json: &str) -> Result<String, JsonToolsError> {
+    process_single_json_normal(json, &ProcessingConfig::default())
+}
+
 /// Handle root-level primitives (strings, numbers, booleans, null)
 fn handle_root_primitive(
     trimmed: &[u8],
@@ -222,10 +440,7 @@ fn handle_root_primitive(
 
             // Value replacement
             if has_value_replacements {
-                if let Some(replaced) = apply_replacement_patterns(
-                    unescaped.as_ref(),
-                    &config.replacements.value_replacements,
-                ) {
+                if let Some(replaced) = config.replacements.replace_value(unescaped.as_ref()) {
                     // Also try type-converting the replaced value, so a replacement
                     // that produces a recognized token (e.g. a null/number/date
                     // sentinel) is still converted -- matches
@@ -300,9 +515,7 @@ fn emit_string_value_shared(
 
     // Value replacement
     if has_replacements {
-        if let Some(replaced) =
-            apply_replacement_patterns(unescaped.as_ref(), &config.replacements.value_replacements)
-        {
+        if let Some(replaced) = config.replacements.replace_value(unescaped.as_ref()) {
             if config.filtering.remove_empty_strings && replaced.is_empty() {
                 return (true, true);
             }
@@ -316,18 +529,14 @@ fn emit_string_value_shared(
                     if config.filtering.remove_nulls && converted == "null" {
                         return (true, true);
                     }
-                    if has_value_exclusions
-                        && matches_any_pattern(&converted, &config.replacements.value_exclusions)
-                    {
+                    if has_value_exclusions && config.replacements.excludes_value(&converted) {
                         return (true, true);
                     }
                     output.push_str(&converted);
                     return (false, true);
                 }
             }
-            if has_value_exclusions
-                && matches_any_pattern(&replaced, &config.replacements.value_exclusions)
-            {
+            if has_value_exclusions && config.replacements.excludes_value(&replaced) {
                 return (true, true);
             }
             let escaped = escape_json_string(&replaced);
@@ -348,9 +557,7 @@ fn emit_string_value_shared(
             if config.filtering.remove_nulls && converted == "null" {
                 return (true, true);
             }
-            if has_value_exclusions
-                && matches_any_pattern(&converted, &config.replacements.value_exclusions)
-            {
+            if has_value_exclusions && config.replacements.excludes_value(&converted) {
                 return (true, true);
             }
             output.push_str(&converted);
@@ -359,9 +566,7 @@ fn emit_string_value_shared(
     }
 
     // Neither replacement nor conversion applied -- check the raw (unescaped) value.
-    if has_value_exclusions
-        && matches_any_pattern(unescaped.as_ref(), &config.replacements.value_exclusions)
-    {
+    if has_value_exclusions && config.replacements.excludes_value(unescaped.as_ref()) {
         return (true, true);
     }
 
@@ -440,10 +645,9 @@ impl<'a> NormalFastWalker<'a> {
                     } else {
                         Cow::Borrowed(key_content)
                     };
-                    matches_any_pattern(
-                        key_for_match.as_ref(),
-                        &self.config.replacements.key_exclusions,
-                    )
+                    self.config
+                        .replacements
+                        .excludes_key(key_for_match.as_ref())
                 };
 
                 if is_excluded {
@@ -588,7 +792,7 @@ impl<'a> NormalFastWalker<'a> {
         // SAFETY: JSON scalars (numbers/true/false/null) are always ASCII/UTF-8.
         let s = unsafe { std::str::from_utf8_unchecked(trimmed) };
         if self.config.replacements.has_value_exclusions()
-            && matches_any_pattern(s, &self.config.replacements.value_exclusions)
+            && self.config.replacements.excludes_value(s)
         {
             return (idx + 1, true);
         }
@@ -619,15 +823,24 @@ struct SlowObjectEntry<'a> {
 /// pure ASCII, so the scan itself uses a byte-level `is_ascii_uppercase` check (cheaper
 /// than decoding UTF-8 codepoints) when the whole string is ASCII, falling back to the
 /// full Unicode-aware scan otherwise for correctness on non-ASCII uppercase (e.g. 'Ñ').
+///
+/// The ASCII case also folds with `make_ascii_lowercase` (a branch-free `| 0x20` per
+/// uppercase byte the compiler auto-vectorizes) on the owned buffer instead of calling
+/// `to_lowercase()`, which decodes every codepoint and pushes one `char` at a time into a
+/// fresh String. An already-owned key (e.g. an unescaped one) is folded in place with no
+/// allocation at all; a borrowed one costs exactly one `to_owned` copy.
 #[inline]
 fn lowercase_if_needed(s: Cow<'_, str>) -> Cow<'_, str> {
     let bytes = s.as_bytes();
-    let has_uppercase = if bytes.is_ascii() {
-        bytes.iter().any(u8::is_ascii_uppercase)
-    } else {
-        s.chars().any(char::is_uppercase)
-    };
-    if has_uppercase {
+    if bytes.is_ascii() {
+        if !bytes.iter().any(u8::is_ascii_uppercase) {
+            return s;
+        }
+        let mut owned = s.into_owned();
+        owned.make_ascii_lowercase();
+        return Cow::Owned(owned);
+    }
+    if s.chars().any(char::is_uppercase) {
         Cow::Owned(s.to_lowercase())
     } else {
         s
@@ -705,10 +918,7 @@ impl<'a> NormalSlowWalker<'a> {
                 // Apply key replacement patterns. Stays `Cow::Borrowed` (zero-alloc)
                 // whenever nothing actually changed the key -- the common case.
                 let mut transformed_key = if self.config.replacements.has_key_replacements() {
-                    match apply_replacement_patterns(
-                        key_unescaped.as_ref(),
-                        &self.config.replacements.key_replacements,
-                    ) {
+                    match self.config.replacements.replace_key(key_unescaped.as_ref()) {
                         Some(replaced) => Cow::Owned(replaced),
                         None => key_unescaped,
                     }
@@ -736,10 +946,7 @@ impl<'a> NormalSlowWalker<'a> {
                 // end-index), so dropping this entry is just a matter of not
                 // pushing it -- no extra bookkeeping needed.
                 if self.config.replacements.has_key_exclusions()
-                    && matches_any_pattern(
-                        &transformed_key,
-                        &self.config.replacements.key_exclusions,
-                    )
+                    && self.config.replacements.excludes_key(&transformed_key)
                 {
                     continue;
                 }
@@ -983,7 +1190,7 @@ impl<'a> NormalSlowWalker<'a> {
         // SAFETY: JSON scalars (numbers/true/false/null) are always ASCII/UTF-8.
         let s = unsafe { std::str::from_utf8_unchecked(trimmed) };
         if self.config.replacements.has_value_exclusions()
-            && matches_any_pattern(s, &self.config.replacements.value_exclusions)
+            && self.config.replacements.excludes_value(s)
         {
             return (idx + 1, true);
         }
@@ -14,7 +14,7 @@ use compact_str::CompactString;
 use memchr::{memchr, memmem};
 use smallvec::SmallVec;
 
-use crate::config::{FilteringConfig, ProcessingConfig, TypeConversionMode};
+use crate::config::{FilteringConfig, ProcessingConfig, ReplacementConfig, TypeConversionMode};
 use crate::convert::convert_string_for_mode;
 use crate::error::JsonToolsError;
 use crate::flatten::{
@@ -23,7 +23,6 @@ use crate::flatten::{
     TapeEntry, ValueRef,
 };
 use crate::json_parser;
-use crate::transform::{apply_replacement_patterns, matches_any_pattern};
 
 // ================================================================================================
 // UnflatNode — Lightweight Tree with Zero-Copy Leaves
@@ -105,9 +104,7 @@ pub(crate) fn process_single_json_for_unflatten(
 
             // Value replacement
             if has_value_replacements {
-                if let Some(replaced) =
-                    apply_replacement_patterns(&s, &config.replacements.value_replacements)
-                {
+                if let Some(replaced) = config.replacements.replace_value(&s) {
                     // Also try type-converting the replaced value, so a replacement
                     // producing a recognized token (null/number/date/etc.) is still
                     // converted -- matches extract_value's composable order.
@@ -191,7 +188,7 @@ pub(crate) fn process_single_json_for_unflatten(
     Ok(serialize_unflatten_tree(
         &tree,
         &config.filtering,
-        &config.replacements.value_exclusions,
+        &config.replacements,
         input.len(),
     ))
 }
@@ -218,7 +215,14 @@ fn extract_flat_entries<'a>(
     }
 
     let end_idx = tape[0].aux() as usize;
-    let mut entries = Vec::with_capacity(end_idx / 4); // heuristic
+    // One entry per top-level key. Every key is followed by a colon, so the colon
+    // count is exact for the usual flat input and an upper bound otherwise -- unlike
+    // the old `end_idx / 4` guess, it never undersizes and regrows the Vec.
+    let key_count = tape[1..end_idx]
+        .iter()
+        .filter(|entry| entry.kind() == EntryKind::Colon)
+        .count();
+    let mut entries = Vec::with_capacity(key_count);
     let mut cursor = 1; // skip root ObjectStart
 
     while cursor < end_idx {
@@ -245,9 +249,7 @@ fn extract_flat_entries<'a>(
 
         // Apply key replacements
         if config.replacements.has_key_replacements() {
-            if let Some(new_key) =
-                apply_replacement_patterns(&key, &config.replacements.key_replacements)
-            {
+            if let Some(new_key) = config.replacements.replace_key(&key) {
                 key = CompactString::from(new_key);
             }
         }
@@ -266,9 +268,7 @@ fn extract_flat_entries<'a>(
         // Key exclusion: drop this entry (and its value/subtree) entirely, without
         // extracting the value at all -- advance_past_value is O(1) via the tape's
         // precomputed container end-index.
-        if config.replacements.has_key_exclusions()
-            && matches_any_pattern(&key, &config.replacements.key_exclusions)
-        {
+        if config.replacements.has_key_exclusions() && config.replacements.excludes_key(&key) {
             cursor = advance_past_value(tape, cursor);
             continue;
         }
@@ -311,10 +311,7 @@ fn extract_value<'a>(
                 // engines and could let a replacement's output bypass conversion,
                 // and therefore remove_nulls, entirely).
                 if has_value_replacements {
-                    if let Some(replaced) = apply_replacement_patterns(
-                        unescaped.as_ref(),
-                        &config.replacements.value_replacements,
-                    ) {
+                    if let Some(replaced) = config.replacements.replace_value(unescaped.as_ref()) {
                         // Also try type-converting the replaced value, so a
                         // replacement producing a recognized token (null/number/
                         // date/etc.) is still converted.
@@ -1014,40 +1011,38 @@ fn set_nested_array_value<'a>(
 fn serialize_unflatten_tree(
     root: &UnflatNode<'_>,
     filtering: &FilteringConfig,
-    value_exclusions: &[String],
+    replacements: &ReplacementConfig,
     capacity_hint: usize,
 ) -> String {
     let mut output = String::with_capacity(capacity_hint);
     // Precomputed once per call rather than re-checked in serialize_node's
     // Null arm on every array-gap Null node visited -- "null" and
-    // value_exclusions are both invariant for the whole tree walk.
+    // the value exclusions are both invariant for the whole tree walk.
     let null_is_excluded =
-        !value_exclusions.is_empty() && matches_any_pattern("null", value_exclusions);
-    serialize_node(
-        root,
-        &mut output,
-        filtering,
-        value_exclusions,
-        null_is_excluded,
-    );
+        replacements.has_value_exclusions() && replacements.excludes_value("null");
+    serialize_node(root, &mut output, filtering, replacements, null_is_excluded);
     output
 }
 
 /// Check if a leaf value should be filtered out based on filtering config.
 ///
 /// `s` is the leaf's already-JSON-serialized text (quotes included for strings, e.g.
-/// `"\"hello\""`, not the unescaped logical content) -- `value_exclusions` patterns are
+/// `"\"hello\""`, not the unescaped logical content) -- value exclusion patterns are
 /// matched against this same serialized form for consistency with the other checks
 /// here (`remove_empty_strings` already compares against the literal 2-quote `"\"\""`).
 /// A literal pattern is unaffected by this; a regex with anchors needs to account for
 /// the surrounding quotes on string values (e.g. `r'^"admin"$'`, not `r'^admin$'`).
 #[inline]
-fn should_filter_leaf(s: &str, filtering: &FilteringConfig, value_exclusions: &[String]) -> bool {
+fn should_filter_leaf(
+    s: &str,
+    filtering: &FilteringConfig,
+    replacements: &ReplacementConfig,
+) -> bool {
     (filtering.remove_nulls && s == "null")
         || (filtering.remove_empty_strings && s == "\"\"")
         || (filtering.remove_empty_objects && s == "{}")
         || (filtering.remove_empty_arrays && s == "[]")
-        || (!value_exclusions.is_empty() && matches_any_pattern(s, value_exclusions))
+        || (replacements.has_value_exclusions() && replacements.excludes_value(s))
 }
 
 /// Recursive serialization. Returns true if the node produced output (not filtered).
@@ -1055,13 +1050,13 @@ fn serialize_node(
     node: &UnflatNode<'_>,
     output: &mut String,
     filtering: &FilteringConfig,
-    value_exclusions: &[String],
+    replacements: &ReplacementConfig,
     null_is_excluded: bool,
 ) -> bool {
     match node {
         UnflatNode::Leaf(vr) => {
             let s = vr.as_str();
-            if should_filter_leaf(s, filtering, value_exclusions) {
+            if should_filter_leaf(s, filtering, replacements) {
                 return false;
             }
             output.push_str(s);
@@ -1100,7 +1095,7 @@ fn serialize_node(
                 write_json_escaped_key(output, key);
                 output.push_str("\":");
 
-                if !serialize_node(child, output, filtering, value_exclusions, null_is_excluded) {
+                if !serialize_node(child, output, filtering, replacements, null_is_excluded) {
                     output.truncate(child_saved);
                 } else {
                     first = false;
@@ -1141,7 +1136,7 @@ fn serialize_node(
                     output.push(',');
                 }
 
-                if !serialize_node(child, output, filtering, value_exclusions, null_is_excluded) {
+                if !serialize_node(child, output, filtering, replacements, null_is_excluded) {
                     output.truncate(child_saved);
                 } else {
                     first = false;